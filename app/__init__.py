@@ -1,12 +1,14 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_login import LoginManager
+import click
 import os
 
+from app.database import database_url, init_database
+from app.passwords import init_password_hasher
+
 # Initialize extensions (will be initialized in create_app)
 db = SQLAlchemy()
-migrate = Migrate()
 login_manager = LoginManager()
 
 
@@ -27,23 +29,53 @@ def create_app(config_class=None):
         # Default configuration
         app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
         app.config['API_KEY'] = os.environ.get('')
-        # Database configuration
-        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///site.db')
+        # Database configuration (SQLite by default, PostgreSQL via DATABASE_URL)
+        app.config['SQLALCHEMY_DATABASE_URI'] = database_url()
         app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    
+        # Stream results to the browser over SSE instead of blocking /submit
+        # (opt-in: needs the pending_streams table, `flask db upgrade`)
+        app.config['STREAM_RESULTS'] = os.environ.get('STREAM_RESULTS', 'false').lower() == 'true'
+        # Run the async job dispatcher in this process (off for web-only or probe processes)
+        app.config['JOBS_ENABLED'] = os.environ.get('JOBS_ENABLED', 'true').lower() == 'true'
+        # Resume upload (PDF/DOCX extraction and skill matching) to pre-fill the form
+        app.config['RESUME_UPLOADS_ENABLED'] = os.environ.get('RESUME_UPLOADS_ENABLED', 'true').lower() == 'true'
+        # One structured call for careers, colleges and roadmap instead of three
+        app.config['AI_COMBINED_MODE'] = os.environ.get('AI_COMBINED_MODE', 'false').lower() == 'true'
+        # Werkzeug method string, e.g. 'scrypt', 'scrypt:65536:8:1' or 'pbkdf2:sha256:600000'
+        app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+        # Client-side OpenRouter budgets for the account's plan (unset = no fixed budget)
+        for key in ('AI_REQUESTS_PER_MINUTE', 'AI_TOKENS_PER_MINUTE'):
+            if os.environ.get(key):
+                app.config[key] = float(os.environ[key])
+
     # Initialize extensions
-    db.init_app(app)
-    migrate.init_app(app, db)
+    init_database(app, db)
+    init_password_hasher(app)
+    # Flask-Migrate pulls in Alembic, which only the `flask db` commands need, so web
+    # workers skip it; the flask CLI builds the app inside an active click context
+    if click.get_current_context(silent=True) is not None or app.config.get('MIGRATIONS_ENABLED', False):
+        from flask_migrate import Migrate
+        Migrate(app, db)
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Please log in to access this page.'
     login_manager.login_message_category = 'info'
     
-    # User loader callback
-    @login_manager.user_loader
-    def load_user(user_id):
-        from app.models import User
-        return User.query.get(int(user_id))
+    # User loader callback (cached, optionally served from the signed session)
+    from app.identity import init_identity
+    init_identity(app, login_manager)
+    
+    # Compression runs as the last after_request hook, so register it first
+    from app.responses import init_compression
+    init_compression(app)
+    
+    # Bytecode cache for compiled templates and the rendered-card cache
+    from app.rendering import init_rendering
+    init_rendering(app)
+    
+    # Fingerprinted, precompressed static assets behind asset_url()
+    from app.assets import init_assets
+    init_assets(app)
     
     # Import models to ensure they are registered with SQLAlchemy
     from app.models import User, Roadmap
@@ -58,4 +90,19 @@ def create_app(config_class=None):
     from app.blueprints.auth import bp as auth_bp
     app.register_blueprint(auth_bp)
     
+    # Build the skill matcher at startup rather than on the first upload
+    if app.config.get('RESUME_UPLOADS_ENABLED', True):
+        from core.skill_matcher import get_resume_matcher
+        get_resume_matcher()
+    
+    # Local worker pool for the async job API (no external broker)
+    if app.config.get('JOBS_ENABLED', True) and not app.testing:
+        from app.jobs import init_job_runner
+        init_job_runner(app)
+    
+    # Background writer for saved recommendations (synchronous writes under testing)
+    if not app.testing:
+        from app.saved import init_save_writer
+        init_save_writer(app)
+    
     return app
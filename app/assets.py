@@ -0,0 +1,138 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import abort, current_app, request, send_file, url_for
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip variants are built
+    brotli = None
+
+# Text formats worth compressing; images and fonts are already compressed
+COMPRESSIBLE = ('.css', '.js', '.mjs', '.json', '.map', '.svg', '.txt', '.html', '.xml')
+
+
+def _write_once(path: str, data: bytes):
+    # Names carry the content hash, so an existing file is already correct;
+    # write-then-rename keeps workers building at the same time from clashing
+    if os.path.exists(path):
+        return
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class AssetManifest:
+    """
+    Fingerprints every file under the static folder by content hash
+    (style.css -> style.3f2a9c1b7d4e.css) and pre-builds gzip and, when
+    the brotli package is installed, brotli variants of text assets into
+    `output_dir`. Fingerprinted names never change content, so they can be
+    cached by browsers for good.
+    """
+
+    def __init__(self, static_folder: str, output_dir: str, min_size: int = 512):
+        self.static_folder = static_folder
+        self.output_dir = output_dir
+        self.min_size = min_size
+        self.urls = {}       # logical name -> fingerprinted name
+        self.files = {}      # fingerprinted name -> (source path, {encoding: variant path})
+
+    def build(self) -> 'AssetManifest':
+        os.makedirs(self.output_dir, exist_ok=True)
+        for root, _, names in os.walk(self.static_folder):
+            for name in names:
+                path = os.path.join(root, name)
+                logical = os.path.relpath(path, self.static_folder).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    data = f.read()
+                digest = hashlib.sha256(data).hexdigest()[:12]
+                stem, ext = os.path.splitext(logical)
+                fingerprinted = f'{stem}.{digest}{ext}'
+                self.urls[logical] = fingerprinted
+                self.files[fingerprinted] = (path, self._compress(data, digest, ext))
+        return self
+
+    def _compress(self, data: bytes, digest: str, ext: str) -> dict:
+        if ext.lower() not in COMPRESSIBLE or len(data) < self.min_size:
+            return {}
+        variants = {}
+        encoders = [('gzip', '.gz', lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            encoders.insert(0, ('br', '.br', lambda d: brotli.compress(d, quality=11)))
+        for encoding, suffix, encode in encoders:
+            path = os.path.join(self.output_dir, f'{digest}{ext}{suffix}')
+            if not os.path.exists(path):
+                compressed = encode(data)
+                # Keep a variant only when it actually saves bytes
+                if len(compressed) >= len(data):
+                    continue
+                _write_once(path, compressed)
+            variants[encoding] = path
+        return variants
+
+
+def _negotiate(variants: dict):
+    """Best pre-built encoding the client accepts (brotli first), or None for identity."""
+    for encoding in ('br', 'gzip'):
+        if encoding in variants and request.accept_encodings[encoding] > 0:
+            return encoding
+    return None
+
+
+def serve_asset(filename: str):
+    manifest = current_app.extensions.get('assets')
+    entry = manifest.files.get(filename) if manifest else None
+    if entry is None:
+        abort(404)
+    source, variants = entry
+    encoding = _negotiate(variants)
+    mimetype = mimetypes.guess_type(source)[0] or 'application/octet-stream'
+    response = send_file(variants[encoding] if encoding else source, mimetype=mimetype,
+                         max_age=current_app.config.get('ASSETS_MAX_AGE', 365 * 24 * 3600),
+                         conditional=True)
+    # send_file names the variant file here; the asset is not a download
+    response.headers.pop('Content-Disposition', None)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if variants:
+        response.vary.add('Accept-Encoding')
+    response.cache_control.immutable = True
+    return response
+
+
+def asset_url(filename: str) -> str:
+    """
+    Template helper: URL of the fingerprinted asset. Falls back to the
+    plain static URL in debug mode (so edits show without a restart) and
+    for files added since startup.
+    """
+    manifest = current_app.extensions.get('assets')
+    if manifest is not None and not current_app.debug:
+        fingerprinted = manifest.urls.get(filename)
+        if fingerprinted is not None:
+            return url_for('asset', filename=fingerprinted)
+    return url_for('static', filename=filename)
+
+
+def init_assets(app):
+    """
+    Builds the asset manifest at startup. ASSETS_ENABLED=False serves
+    plain static files only; ASSETS_OUTPUT_DIR (default instance/assets)
+    holds the compressed variants, ASSETS_MAX_AGE the cache lifetime and
+    ASSETS_MIN_SIZE the smallest file worth compressing.
+    """
+    app.add_template_global(asset_url)
+    if not app.config.get('ASSETS_ENABLED', True) or not app.static_folder:
+        return None
+    manifest = AssetManifest(
+        app.static_folder,
+        app.config.get('ASSETS_OUTPUT_DIR', os.path.join(app.instance_path, 'assets')),
+        min_size=app.config.get('ASSETS_MIN_SIZE', 512),
+    ).build()
+    app.extensions['assets'] = manifest
+    app.add_url_rule(app.config.get('ASSETS_URL_PATH', '/assets') + '/<path:filename>', 'asset', serve_asset)
+    return manifest
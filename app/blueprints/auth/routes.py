@@ -3,6 +3,7 @@ from flask_login import login_user, logout_user, login_required, current_user
 from app.blueprints.auth import bp
 from app import db
 from app.models import User
+from app.passwords import HasherBusy
 
 
 @bp.route('/register', methods=['GET', 'POST'])
@@ -47,7 +48,11 @@ def register():
                 name=name,
                 username=username
             )
-            user.set_password(password)
+            try:
+                user.set_password(password)
+            except HasherBusy:
+                flash('The server is busy right now. Please try again in a moment.', 'error')
+                return render_template('register.html'), 503
             
             db.session.add(user)
             db.session.commit()
@@ -95,7 +100,21 @@ def login():
         user = User.query.filter_by(username=username).first()
         
         # Check if user exists and password is correct
-        if user and user.check_password(password):
+        try:
+            valid = user is not None and user.check_password(password)
+        except HasherBusy:
+            flash('The server is busy right now. Please try again in a moment.', 'error')
+            return render_template('login.html'), 503
+        
+        if valid:
+            # Upgrade hashes made with older algorithm/cost settings while we have the password
+            if user.password_needs_rehash():
+                try:
+                    user.set_password(password)
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Could not upgrade password hash for {user.username}: {e}")
             login_user(user)
             flash(f'Welcome back, {user.name}!', 'success')
             
@@ -1,4 +1,4 @@
-from flask import render_template
+from flask import render_template, request, jsonify, current_app
 from app.blueprints.main import bp
 
 
@@ -6,3 +6,31 @@ from app.blueprints.main import bp
 def index():
     """Landing page - displays the user profile form."""
     return render_template('index.html')
+
+
+@bp.route('/upload_resume', methods=['POST'])
+def upload_resume():
+    """Extracts skills and education from an uploaded PDF/DOCX resume to pre-fill the form."""
+    # Imported on first upload so workers that never see one skip the parser stack
+    from core.utils import parse_resume
+
+    if not current_app.config.get('RESUME_UPLOADS_ENABLED', True):
+        return jsonify({'error': 'Resume upload is disabled'}), 404
+
+    if 'resume' not in request.files:
+        return jsonify({'error': 'No file part'}), 400
+    
+    file = request.files['resume']
+    
+    if file.filename == '':
+        return jsonify({'error': 'No selected file'}), 400
+    
+    try:
+        data = parse_resume(file, file.filename)
+        if data is None:
+            return jsonify({'error': 'Unsupported file type'}), 400
+        
+        return jsonify(data)
+    except Exception as e:
+        print(f"Resume Parsing Error: {e}")
+        return jsonify({'error': str(e)}), 500
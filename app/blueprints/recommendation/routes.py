@@ -1,8 +1,75 @@
-from flask import render_template, request, current_app
+from flask import render_template, request, current_app, url_for, jsonify, Response, stream_with_context
 from app.blueprints.recommendation import bp
+from app import db
+from app.models import GenerationJob, PendingStream, Roadmap
+from app.jobs import job_to_dict, DONE, FAILED
+from app.saved import save_results, roadmap_summary, roadmap_detail
+from app.responses import content_etag, not_modified, with_etag
 from core.user_input import create_user_profile
+from core.batch import iter_profile_rows, detect_format, run_batch, _to_form_value
 from core.recommendation_system import CareerRecommendationSystem
-from core.utils import save_recommendations
+from core.models import to_json
+from core.cache import ResponseCache
+from flask_login import current_user, login_required
+from sqlalchemy import or_, and_
+from datetime import datetime, timedelta
+import io
+import json
+import os
+import time
+import uuid
+
+
+def get_recommendation_system():
+    """
+    Returns the app-wide recommendation system, creating it on first use
+    so its pooled HTTP client is reused across requests.
+    """
+    system = current_app.extensions.get('recommendation_system')
+    if system is None:
+        # The HTTP stack is imported on first use rather than at worker start
+        from core.http_client import AIClient
+        from core.rate_limit import RateLimiter, AIMDConcurrency
+
+        config = current_app.config
+        limiter = RateLimiter(
+            requests_per_minute=config.get('AI_REQUESTS_PER_MINUTE'),
+            tokens_per_minute=config.get('AI_TOKENS_PER_MINUTE'),
+            concurrency=AIMDConcurrency(
+                initial=config.get('AI_INITIAL_CONCURRENCY', 4),
+                minimum=config.get('AI_MIN_CONCURRENCY', 1),
+                maximum=config.get('AI_MAX_CONCURRENCY', 16),
+            ),
+            acquire_timeout=config.get('AI_RATE_LIMIT_TIMEOUT', 120.0),
+        )
+        client = AIClient(
+            pool_maxsize=config.get('AI_POOL_MAXSIZE', 16),
+            max_retries=config.get('AI_MAX_RETRIES', 3),
+            connect_timeout=config.get('AI_CONNECT_TIMEOUT', 5.0),
+            read_timeout=config.get('AI_READ_TIMEOUT', 60.0),
+            limiter=limiter,
+        )
+        cache = None
+        if config.get('LLM_CACHE_ENABLED', True):
+            cache = ResponseCache(
+                path=config.get('LLM_CACHE_PATH', os.path.join(current_app.instance_path, 'llm_cache.db')),
+                memory_size=config.get('LLM_CACHE_MEMORY_SIZE', 256),
+                max_entries=config.get('LLM_CACHE_MAX_ENTRIES', 10000),
+                ttl=config.get('LLM_CACHE_TTL', 7 * 24 * 3600),
+            )
+        system = CareerRecommendationSystem(config.get('API_KEY', 'Your API Key'), client=client, cache=cache,
+                                            combined=config.get('AI_COMBINED_MODE', False))
+        current_app.extensions['recommendation_system'] = system
+    return system
+
+
+def _current_user_id():
+    return current_user.id if current_user.is_authenticated else None
+
+
+def _pending_stream_cutoff() -> datetime:
+    # Forms older than this were never picked up (e.g. the tab was closed)
+    return datetime.utcnow() - timedelta(seconds=current_app.config.get('STREAM_MAX_AGE', 600))
 
 
 @bp.route('/submit', methods=['POST'])
@@ -10,24 +77,270 @@ def submit():
     """
     Handles form submission and generates career/college recommendations.
     """
-    # Get API key from app config
-    api_key = current_app.config.get('API_KEY', 'Your API Key')
-    system = CareerRecommendationSystem(api_key)
+    system = get_recommendation_system()
     
     # Create user profile from form data
-    user_profile = create_user_profile(request.form)
+    try:
+        user_profile = create_user_profile(request.form)
+    except ValueError as e:
+        return render_template('index.html', error=str(e))
+    
+    # Streaming mode: render the page shell now and fill it in over SSE
+    if current_app.config.get('STREAM_RESULTS', False):
+        # The form (with the student's details) stays in the database; the page only gets an opaque id
+        PendingStream.query.filter(PendingStream.created_at < _pending_stream_cutoff()).delete(
+            synchronize_session=False)
+        pending = PendingStream(id=uuid.uuid4().hex, form_data=json.dumps(request.form.to_dict()))
+        db.session.add(pending)
+        db.session.commit()
+        return render_template('results.html',
+                             user_profile=user_profile,
+                             career_recommendations=[],
+                             college_recommendations=[],
+                             roadmap=[],
+                             stream_url=url_for('recommendation.stream', id=pending.id))
     
-    # Generate recommendations
-    career_recommendations = system.generate_career_recommendations(user_profile)
-    college_recommendations = system.generate_college_recommendations(user_profile, career_recommendations)
-    roadmap = system.generate_roadmap(user_profile, career_recommendations)
+    # Generate recommendations (colleges and roadmap run in parallel)
+    results = system.generate_all(user_profile)
+    career_recommendations = results['careers']
+    college_recommendations = results['colleges']
+    roadmap = results['roadmap']
     
     # Save recommendations if requested
     if request.form.get('save'):
-        save_recommendations(user_profile, career_recommendations, college_recommendations, roadmap)
+        save_results(user_profile, results, user_id=_current_user_id())
     
     return render_template('results.html', 
                          user_profile=user_profile, 
                          career_recommendations=career_recommendations, 
                          college_recommendations=college_recommendations, 
                          roadmap=roadmap)
+
+
+@bp.route('/stream')
+def stream():
+    """
+    Server-Sent Events endpoint that pushes each career, college and
+    roadmap phase to the results page as soon as it has been parsed,
+    as card HTML rendered by the same macros as the full page.
+    """
+    stream_id = request.args.get('id', '')
+    pending = PendingStream.query.filter(PendingStream.id == stream_id,
+                                         PendingStream.created_at >= _pending_stream_cutoff()).first()
+    form_data = pending.form_data if pending is not None else None
+    # Consumed on first use; the delete also settles two concurrent requests for the same id
+    claimed = form_data is not None and PendingStream.query.filter_by(id=stream_id).delete(synchronize_session=False)
+    db.session.commit()
+    if not claimed:
+        return jsonify({'error': 'Invalid or expired stream'}), 400
+    form_data = json.loads(form_data)
+
+    user_profile = create_user_profile(form_data)
+    system = get_recommendation_system()
+    user_id = _current_user_id()
+
+    render_card = current_app.extensions['render_card']
+    app = current_app._get_current_object()
+
+    def save(results):
+        # Runs on the generating thread, so the save happens even if the page is closed mid-stream
+        with app.app_context():
+            save_results(user_profile, results, user_id=user_id)
+
+    def events():
+        for event, item in system.stream_all(user_profile, on_done=save if form_data.get('save') else None):
+            if event == 'done':
+                data = {'errors': item['errors']}
+            else:
+                # Cards come pre-rendered (and fragment-cached) from the same macros as the page
+                data = {'html': str(render_card(event, item))}
+            yield f"event: {event}\ndata: {to_json(data)}\n\n"
+
+    return Response(stream_with_context(events()),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@bp.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Async job mode: validates the profile, queues it and returns a job id
+    straight away instead of holding the request open for the generation.
+    """
+    runner = current_app.extensions.get('job_runner')
+    if runner is None:
+        return jsonify({'error': 'Async jobs are disabled'}), 503
+
+    form_data = request.form.to_dict()
+    if not form_data:
+        body = request.get_json(silent=True) or {}
+        if not isinstance(body, dict):
+            return jsonify({'error': 'Invalid profile: the JSON body must be an object'}), 400
+        # JSON bodies may use real lists/dicts, as /batch rows do
+        form_data = {k: _to_form_value(v) for k, v in body.items()}
+    try:
+        create_user_profile(form_data)
+    except (ValueError, KeyError) as e:
+        return jsonify({'error': f'Invalid profile: {e}'}), 400
+
+    job = runner.submit(form_data, user_id=_current_user_id())
+    response = jsonify({
+        'id': job.id,
+        'status': job.status,
+        'status_url': url_for('recommendation.job_status', job_id=job.id),
+        'events_url': url_for('recommendation.job_events', job_id=job.id),
+    })
+    response.status_code = 202
+    response.headers['Location'] = url_for('recommendation.job_status', job_id=job.id)
+    return response
+
+
+@bp.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Poll endpoint: current job status, plus the results once it is done."""
+    job = db.get_or_404(GenerationJob, job_id)
+    return jsonify(job_to_dict(job))
+
+
+@bp.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """
+    Subscribe endpoint: Server-Sent Events on every status change until the
+    job finishes. Each subscriber holds a worker, so the stream ends with a
+    'timeout' event after JOB_EVENTS_MAX_SECONDS; clients then poll or
+    subscribe again.
+    """
+    db.get_or_404(GenerationJob, job_id)
+    poll_interval = current_app.config.get('JOB_EVENTS_POLL_INTERVAL', 1.0)
+    deadline = time.monotonic() + current_app.config.get('JOB_EVENTS_MAX_SECONDS', 300)
+    status_url = url_for('recommendation.job_status', job_id=job_id)
+    app = current_app._get_current_object()
+
+    def events():
+        last_status = None
+        while True:
+            with app.app_context():
+                job = db.session.get(GenerationJob, job_id)
+                data = job_to_dict(job) if job is not None else None
+            if data is None:
+                yield f"event: error\ndata: {json.dumps({'error': 'Job not found'})}\n\n"
+                return
+            if data['status'] != last_status:
+                last_status = data['status']
+                yield f"event: status\ndata: {json.dumps(data)}\n\n"
+            if last_status in (DONE, FAILED):
+                return
+            if time.monotonic() >= deadline:
+                yield f"event: timeout\ndata: {json.dumps({'status_url': status_url})}\n\n"
+                return
+            time.sleep(poll_interval)
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@bp.route('/batch', methods=['POST'])
+def batch():
+    """
+    Cohort batch API: accepts a CSV or JSONL file of profiles (as the
+    'file' upload or as the raw request body) and streams one JSON line
+    per student back as each one finishes. Bad rows produce error lines
+    instead of aborting the batch.
+    """
+    upload = request.files.get('file')
+    if upload is not None:
+        fmt = detect_format(upload.filename, upload.mimetype)
+        raw = upload.stream
+    else:
+        fmt = detect_format(content_type=request.content_type)
+        raw = request.stream
+    text_stream = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+
+    system = get_recommendation_system()
+    concurrency = request.args.get('concurrency', type=int) or current_app.config.get('BATCH_CONCURRENCY', 4)
+    concurrency = max(1, min(concurrency, current_app.config.get('BATCH_MAX_CONCURRENCY', 16)))
+
+    def lines():
+        for record in run_batch(system, iter_profile_rows(text_stream, fmt), concurrency):
+            yield json.dumps(record) + "\n"
+
+    return Response(stream_with_context(lines()), mimetype='application/x-ndjson',
+                    headers={'X-Accel-Buffering': 'no'})
+
+
+def _encode_cursor(roadmap) -> str:
+    return f"{roadmap.created_at.isoformat()}_{roadmap.id}"
+
+
+def _decode_cursor(cursor: str):
+    created_at, _, roadmap_id = cursor.rpartition('_')
+    return datetime.fromisoformat(created_at), int(roadmap_id)
+
+
+@bp.route('/history')
+@login_required
+def history():
+    """
+    The current user's roadmaps, newest first, as summary rows.
+    Keyset-paginated: pass the returned next_cursor as ?cursor= to get
+    the following page, so deep pages cost the same as the first.
+    """
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    query = Roadmap.query.filter(Roadmap.user_id == current_user.id)
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            created_at, roadmap_id = _decode_cursor(cursor)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        query = query.filter(or_(Roadmap.created_at < created_at,
+                                 and_(Roadmap.created_at == created_at, Roadmap.id < roadmap_id)))
+    rows = query.order_by(Roadmap.created_at.desc(), Roadmap.id.desc()).limit(limit + 1).all()
+    page = rows[:limit]
+    return jsonify({
+        'items': [roadmap_summary(r) for r in page],
+        'next_cursor': _encode_cursor(page[-1]) if len(rows) > limit else None,
+    })
+
+
+def _saved_etag(roadmap, *parts) -> str:
+    saved = roadmap.saved
+    return content_etag(*parts, roadmap.id, roadmap.content, saved.payload if saved is not None else b'')
+
+
+@bp.route('/history/<int:roadmap_id>')
+@login_required
+def history_detail(roadmap_id):
+    """
+    One roadmap with its full content; the only place the content is loaded.
+    Sends a strong ETag of the stored content and answers a matching
+    If-None-Match with 304.
+    """
+    roadmap = Roadmap.query.filter_by(id=roadmap_id, user_id=current_user.id).first_or_404()
+    etag = _saved_etag(roadmap, 'json')
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    return with_etag(jsonify(roadmap_detail(roadmap)), etag)
+
+
+@bp.route('/history/<int:roadmap_id>/view')
+@login_required
+def history_view(roadmap_id):
+    """
+    A saved roadmap as the results page, with the careers and colleges
+    saved alongside it. Conditional like history_detail.
+    """
+    roadmap = Roadmap.query.filter_by(id=roadmap_id, user_id=current_user.id).first_or_404()
+    # The page also depends on the templates, so a redeploy invalidates it
+    etag = _saved_etag(roadmap, 'html', current_app.extensions.get('templates_version', ''))
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    data = roadmap_detail(roadmap)
+    saved = data.get('saved', {})
+    html = render_template('results.html',
+                           career_recommendations=saved.get('careers', []),
+                           college_recommendations=saved.get('colleges', []),
+                           roadmap=data['roadmap'])
+    return with_etag(current_app.make_response(html), etag)
@@ -0,0 +1,67 @@
+import os
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+DEFAULT_DATABASE_URL = 'sqlite:///site.db'
+
+
+def database_url(url: str = None) -> str:
+    """DATABASE_URL (or the given URL) with the legacy postgres:// scheme some hosts hand out fixed up."""
+    url = url or os.environ.get('DATABASE_URL', DEFAULT_DATABASE_URL)
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def engine_options(url: str, config) -> dict:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for the given database. SQLite waits on a
+    locked database (DB_BUSY_TIMEOUT seconds) instead of failing straight
+    away; server databases get a sized, recycled and pre-pinged pool.
+    """
+    if make_url(url).get_backend_name() == 'sqlite':
+        return {'connect_args': {'timeout': config.get('DB_BUSY_TIMEOUT', 15.0)}}
+    return {
+        'pool_size': config.get('DB_POOL_SIZE', 10),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 20),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 30),
+    }
+
+
+def configure_sqlite(engine, busy_timeout: float = 15.0, synchronous: str = 'NORMAL'):
+    """
+    Sets WAL, the sync level and the busy timeout on every new SQLite
+    connection. WAL lets readers run alongside the single writer, and
+    synchronous=NORMAL is still crash-safe in WAL mode while skipping
+    an fsync per commit. Does nothing for other databases.
+    """
+    if engine.dialect.name != 'sqlite' or engine.url.database in (None, '', ':memory:'):
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        if not isinstance(dbapi_connection, sqlite3.Connection):
+            return
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute(f'PRAGMA synchronous={synchronous}')
+        cursor.execute(f'PRAGMA busy_timeout={int(busy_timeout * 1000)}')
+        cursor.close()
+
+
+def init_database(app, db):
+    """Applies the engine options, binds db to the app and tunes SQLite connections."""
+    url = app.config.setdefault('SQLALCHEMY_DATABASE_URI', database_url())
+    app.config['SQLALCHEMY_DATABASE_URI'] = url = database_url(url)
+    options = engine_options(url, app.config)
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    db.init_app(app)
+    if app.config.get('SQLITE_TUNING', True):
+        with app.app_context():
+            configure_sqlite(db.engine, busy_timeout=app.config.get('DB_BUSY_TIMEOUT', 15.0),
+                             synchronous=app.config.get('SQLITE_SYNCHRONOUS', 'NORMAL'))
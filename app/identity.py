@@ -0,0 +1,159 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Optional
+
+from flask import session
+from flask_login import UserMixin
+
+# Key in the signed session cookie holding the logged-in user's display fields
+SESSION_FIELDS_KEY = '_user_fields'
+
+
+class SessionUser(UserMixin):
+    """
+    Lightweight stand-in for the logged-in User: just the fields requests
+    and templates read (id, username, name). It is what load_user returns,
+    so it can be cached and rebuilt from the session without an ORM session.
+    Load the User model explicitly when a request needs to change the user.
+    """
+
+    def __init__(self, id: int, username: str, name: str):
+        self.id = id
+        self.username = username
+        self.name = name
+
+    @classmethod
+    def from_user(cls, user) -> 'SessionUser':
+        return cls(user.id, user.username, user.name)
+
+    def to_dict(self) -> dict:
+        return {'id': self.id, 'username': self.username, 'name': self.name}
+
+    def __repr__(self):
+        return f'<SessionUser {self.username}>'
+
+
+class UserCache:
+    """
+    Per-process TTL + LRU cache of SessionUser by id. Entries expire after
+    `ttl` seconds so changes made by other processes show up eventually.
+    Changes made here are dropped at once through invalidate().
+    """
+
+    def __init__(self, ttl: float = 60.0, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[SessionUser]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user: SessionUser):
+        with self._lock:
+            self._entries[user.id] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def load_session_user(user_id: str, cache: Optional[UserCache], use_session_fields: bool) -> Optional[SessionUser]:
+    """
+    Flask-Login user_loader body. Tries the signed session fields (when
+    enabled), then the cache, and only then the database.
+    """
+    from app import db
+    from app.models import User
+
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    if use_session_fields:
+        fields = session.get(SESSION_FIELDS_KEY)
+        if fields and fields.get('id') == user_id:
+            return SessionUser(**fields)
+
+    if cache is not None:
+        user = cache.get(user_id)
+        if user is not None:
+            return user
+
+    record = db.session.get(User, user_id)
+    if record is None:
+        return None
+    user = SessionUser.from_user(record)
+    if cache is not None:
+        cache.set(user)
+    if use_session_fields:
+        session[SESSION_FIELDS_KEY] = user.to_dict()
+    return user
+
+
+# Caches of every app in the process; the User listeners are registered once for all of them
+_caches = weakref.WeakSet()
+
+
+def _invalidate_user(mapper, connection, target):
+    for cache in list(_caches):
+        cache.invalidate(target.id)
+
+
+def init_identity(app, login_manager):
+    """
+    Installs the cached user_loader. USER_CACHE_TTL (seconds, 0 disables
+    the cache) and USER_CACHE_SIZE size the per-process cache.
+    USER_SESSION_FIELDS keeps id/username/name in the signed session so
+    most requests skip the lookup entirely. Those fields are written at
+    login, so a renamed user shows the old name in other sessions until
+    they log in again, and a deleted user stays logged in on sessions
+    that already carry the fields until they log out or the session
+    cookie expires.
+    """
+    from flask_login import user_logged_in, user_logged_out
+    from sqlalchemy import event
+    from app.models import User
+
+    ttl = app.config.get('USER_CACHE_TTL', 60)
+    cache = UserCache(ttl=ttl, max_size=app.config.get('USER_CACHE_SIZE', 1024)) if ttl else None
+    use_session_fields = app.config.get('USER_SESSION_FIELDS', False)
+    app.extensions['user_cache'] = cache
+
+    @login_manager.user_loader
+    def load_user(user_id):
+        return load_session_user(user_id, cache, use_session_fields)
+
+    @user_logged_in.connect_via(app)
+    def remember_fields(sender, user):
+        if use_session_fields:
+            session[SESSION_FIELDS_KEY] = SessionUser.from_user(user).to_dict()
+
+    @user_logged_out.connect_via(app)
+    def forget_fields(sender, user):
+        session.pop(SESSION_FIELDS_KEY, None)
+
+    if cache is not None:
+        _caches.add(cache)
+        for name in ('after_update', 'after_delete'):
+            if not event.contains(User, name, _invalidate_user):
+                event.listen(User, name, _invalidate_user)
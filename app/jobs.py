@@ -0,0 +1,204 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, and_
+
+from app import db
+from app.models import GenerationJob
+from core.models import to_json
+from core.utils import results_to_dict
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def results_to_json(results: dict) -> str:
+    return to_json(results_to_dict(results))
+
+
+def job_to_dict(job: GenerationJob) -> dict:
+    data = {
+        "id": job.id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+    }
+    if job.error:
+        data["error"] = job.error
+    if job.status == DONE and job.result:
+        data["result"] = json.loads(job.result)
+    return data
+
+
+class JobRunner:
+    """
+    Runs queued generation jobs on a local thread pool, with job state kept
+    in the database instead of an external broker. A dispatcher thread
+    claims queued jobs (and running jobs whose lease expired because their
+    worker died) with a conditional UPDATE, so several processes can share
+    the same table without running a job twice at the same time. While a
+    job runs, the dispatcher keeps renewing its lease, so only a dead
+    process loses its jobs. A job is attempted at most max_attempts times,
+    lost leases included.
+    """
+
+    def __init__(self, app, workers: int = 2, poll_interval: float = 2.0,
+                 lease_seconds: float = 300, max_attempts: int = 3):
+        self.app = app
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._active = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._renewed_at = 0.0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._dispatch_loop, name="job-dispatcher", daemon=True)
+            self._thread.start()
+
+    def submit(self, form_data: dict, user_id=None) -> GenerationJob:
+        """Persists a new job and wakes the dispatcher. Must run inside an app context."""
+        job = GenerationJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            status=QUEUED,
+            form_data=json.dumps(form_data),
+            attempts=0,
+        )
+        db.session.add(job)
+        db.session.commit()
+        self._wake.set()
+        return job
+
+    def _dispatch_loop(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    self._renew_leases()
+                    for job_id in self._claim(self._free_slots()):
+                        with self._lock:
+                            self._active.add(job_id)
+                        self._executor.submit(self._run, job_id)
+            except Exception as e:
+                # e.g. the table does not exist yet before migrations have run
+                self.app.logger.warning("Job dispatcher error: %s", e)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _free_slots(self) -> int:
+        with self._lock:
+            return self.workers - len(self._active)
+
+    def _renew_leases(self):
+        # Every third of a lease, so a long generation is never taken for abandoned
+        if time.monotonic() - self._renewed_at < self.lease_seconds / 3:
+            return
+        self._renewed_at = time.monotonic()
+        with self._lock:
+            active = list(self._active)
+        if not active:
+            return
+        (GenerationJob.query
+         .filter(GenerationJob.id.in_(active), GenerationJob.status == RUNNING)
+         .update({GenerationJob.lease_expires_at: datetime.utcnow() + timedelta(seconds=self.lease_seconds)},
+                 synchronize_session=False))
+        db.session.commit()
+
+    def _claim(self, limit: int) -> list:
+        if limit <= 0:
+            return []
+        now = datetime.utcnow()
+        abandoned = and_(GenerationJob.status == RUNNING, GenerationJob.lease_expires_at < now)
+        # A job that keeps killing or hanging its worker is failed instead of re-run forever
+        (GenerationJob.query
+         .filter(abandoned, GenerationJob.attempts >= self.max_attempts)
+         .update({
+             GenerationJob.status: FAILED,
+             GenerationJob.error: "Worker lost while running the job too many times",
+             GenerationJob.lease_expires_at: None,
+         }, synchronize_session=False))
+        db.session.commit()
+        claimable = or_(
+            GenerationJob.status == QUEUED,
+            and_(abandoned, GenerationJob.attempts < self.max_attempts),
+        )
+        with self._lock:
+            active = list(self._active)
+        candidates = (GenerationJob.query.with_entities(GenerationJob.id)
+                      .filter(claimable)
+                      # Never this process's own running jobs, even if a renewal was missed
+                      .filter(GenerationJob.id.notin_(active))
+                      .order_by(GenerationJob.created_at)
+                      .limit(limit).all())
+        claimed = []
+        for (job_id,) in candidates:
+            updated = (GenerationJob.query
+                       .filter(GenerationJob.id == job_id, claimable)
+                       .update({
+                           GenerationJob.status: RUNNING,
+                           GenerationJob.attempts: GenerationJob.attempts + 1,
+                           GenerationJob.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                       }, synchronize_session=False))
+            db.session.commit()
+            if updated:
+                claimed.append(job_id)
+        return claimed
+
+    def _run(self, job_id: str):
+        from app.blueprints.recommendation.routes import get_recommendation_system
+        from core.user_input import create_user_profile
+        from app.saved import save_results
+
+        try:
+            with self.app.app_context():
+                job = db.session.get(GenerationJob, job_id)
+                try:
+                    form_data = json.loads(job.form_data)
+                    user_profile = create_user_profile(form_data)
+                    results = get_recommendation_system().generate_all(user_profile)
+                    if form_data.get('save'):
+                        save_results(user_profile, results, user_id=job.user_id)
+                    job.result = results_to_json(results)
+                    job.status = DONE
+                    job.error = None
+                except (ValueError, KeyError) as e:
+                    # Bad form data will not get better on retry
+                    job.status = FAILED
+                    job.error = f"Invalid profile: {e}"
+                except Exception as e:
+                    job.status = QUEUED if job.attempts < self.max_attempts else FAILED
+                    job.error = str(e)
+                job.lease_expires_at = None
+                db.session.commit()
+        except Exception as e:
+            self.app.logger.error("Job %s could not be updated: %s", job_id, e)
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
+            self._wake.set()
+
+
+def init_job_runner(app) -> JobRunner:
+    runner = JobRunner(
+        app,
+        workers=app.config.get('JOB_WORKERS', 2),
+        poll_interval=app.config.get('JOB_POLL_INTERVAL', 2.0),
+        lease_seconds=app.config.get('JOB_LEASE_SECONDS', 300),
+        max_attempts=app.config.get('JOB_MAX_ATTEMPTS', 3),
+    )
+    app.extensions['job_runner'] = runner
+    runner.start()
+    return runner
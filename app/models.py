@@ -1,10 +1,8 @@
-from dataclasses import dataclass
-from typing import Dict, List, Optional
 from app import db
 from flask_login import UserMixin
 from datetime import datetime
 from sqlalchemy.sql import func
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.passwords import get_password_hasher
 
 # SQLAlchemy Database Models
 
@@ -25,12 +23,16 @@ class User(UserMixin, db.Model):
     roadmaps = db.relationship('Roadmap', backref='user', lazy=True, cascade='all, delete-orphan')
     
     def set_password(self, password):
-        """Hash and set the password"""
-        self.password_hash = generate_password_hash(password)
+        """Hash and set the password (on the bounded password hashing pool)"""
+        self.password_hash = get_password_hasher().hash(password)
     
     def check_password(self, password):
         """Check if the provided password matches the hash"""
-        return check_password_hash(self.password_hash, password)
+        return get_password_hasher().verify(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        """True if the stored hash was made with other parameters than the configured ones"""
+        return get_password_hasher().needs_rehash(self.password_hash)
     
     def __repr__(self):
         return f'<User {self.username}>'
@@ -42,47 +44,83 @@ class Roadmap(db.Model):
     """
     __tablename__ = 'roadmaps'
     
+    __table_args__ = (
+        # History is listed per user, newest first, with keyset pagination
+        db.Index('ix_roadmaps_user_id_created_at', 'user_id', 'created_at'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    content = db.Column(db.Text, nullable=False)  
+    # Loaded only when a single roadmap is opened, not for history listings
+    content = db.deferred(db.Column(db.Text, nullable=False))
     created_at = db.Column(db.DateTime, default=func.now(), nullable=False)
+    # Summary for history listings, computed when the roadmap is written
+    career_titles = db.Column(db.Text, nullable=True)  # JSON list of the top career titles
+    phase_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    # The full saved report this roadmap came from
+    saved = db.relationship('SavedRecommendation', backref='roadmap', uselist=False, cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Roadmap {self.id} for User {self.user_id}>'
 
-# Dataclasses for application logic (kept for backward compatibility)
 
-@dataclass
+class SavedRecommendation(db.Model):
+    """
+    A saved set of recommendations (profile, careers, colleges, roadmap)
+    stored as zlib-compressed JSON. Logged-in users' saves are also
+    linked to a Roadmap row so they show up in their history.
+    """
+    __tablename__ = 'saved_recommendations'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
+    roadmap_id = db.Column(db.Integer, db.ForeignKey('roadmaps.id'), nullable=True, unique=True)
+    student_name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f'<SavedRecommendation {self.id} for {self.student_name}>'
 
-class UserProfile:
-    name: str
-    age: int
-    current_grade: str
-    academic_subjects: List[str]
-    grades: Dict[str, str]
-    interests: List[str]
-    hobbies: List[str]
-    preferred_work_environment: str
-    career_goals: Optional[str] = None
-    location_preference: str = "Any"
-    budget_range: str = "Medium"
 
-@dataclass
-class CareerRecommendation:
-    career_title: str
-    description: str
-    required_skills: List[str]
-    education_path: str
-    job_prospects: str
-    salary_range: str
-    growth_potential: str
+class GenerationJob(db.Model):
+    """
+    A queued /submit run for the async job API.
+    Holds the submitted form and, once finished, the generated results as JSON.
+    """
+    __tablename__ = 'generation_jobs'
+    
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
+    status = db.Column(db.String(16), nullable=False, default='queued', index=True)
+    form_data = db.Column(db.Text, nullable=False)
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    # A running job whose lease has expired was abandoned by a dead worker
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=func.now(), nullable=False)
+    updated_at = db.Column(db.DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f'<GenerationJob {self.id} {self.status}>'
+
+
+class PendingStream(db.Model):
+    """
+    A submitted form waiting for its results stream. The results page
+    only gets the opaque id, so the profile never travels in a URL; the
+    stream endpoint consumes the row once.
+    """
+    __tablename__ = 'pending_streams'
+    
+    id = db.Column(db.String(32), primary_key=True)
+    form_data = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=func.now(), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<PendingStream {self.id}>'
 
-@dataclass
-class CollegeRecommendation:
-    college_name: str
-    location: str
-    programs: List[str]
-    ranking: str
-    admission_requirements: str
-    fees_range: str
-    notable_features: str
+# Result models live in core.models; re-exported for existing imports
+from core.models import UserProfile, CareerRecommendation, CollegeRecommendation  # noqa: E402,F401
@@ -0,0 +1,97 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, has_app_context
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+
+
+class HasherBusy(RuntimeError):
+    """Raised when too many password hashes are already queued."""
+
+
+def method_id(method: str) -> str:
+    """
+    The prefix Werkzeug stores for `method`, with its defaults filled in
+    ('scrypt' -> 'scrypt:32768:8:1'), worked out without running the KDF.
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        if not args:
+            args = ['32768', '8', '1']
+        elif len(args) != 3:
+            raise ValueError("'scrypt' takes 3 arguments.")
+        return ':'.join([name, *(str(int(arg)) for arg in args)])
+    if name == 'pbkdf2':
+        if len(args) > 2:
+            raise ValueError("'pbkdf2' takes 2 arguments.")
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f'{name}:{hash_name}:{iterations}'
+    raise ValueError(f"Invalid hash method '{method}'.")
+
+
+class PasswordHasher:
+    """
+    Runs Werkzeug's password KDF on a small dedicated thread pool.
+    hashlib releases the GIL while it runs scrypt/PBKDF2, so the pool is
+    what caps how many hashes burn CPU at once. Beyond `max_pending`
+    queued hashes callers get HasherBusy instead of piling up. `method`
+    is any Werkzeug method string ('scrypt', 'scrypt:65536:8:1',
+    'pbkdf2:sha256:600000', ...). Hashes made with other parameters still
+    verify, and needs_rehash() tells the caller to upgrade them.
+    """
+
+    def __init__(self, method: str = 'scrypt', workers: int = 2, max_pending: int = 64, timeout: float = 10.0):
+        self.method = method
+        self.timeout = timeout
+        # Compared with the prefix of stored hashes
+        self.method_id = method_id(method)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='passwords')
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HasherBusy('Too many password checks in progress')
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return password_hash.split('$', 1)[0] != self.method_id
+
+
+def init_password_hasher(app) -> PasswordHasher:
+    hasher = PasswordHasher(
+        method=app.config.get('PASSWORD_HASH_METHOD', 'scrypt'),
+        workers=app.config.get('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)),
+        max_pending=app.config.get('PASSWORD_HASH_MAX_PENDING', 64),
+        timeout=app.config.get('PASSWORD_HASH_TIMEOUT', 10.0),
+    )
+    app.extensions['password_hasher'] = hasher
+    return hasher
+
+
+_default_hasher = None
+_default_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    """The current app's hasher, or a process-wide default outside an app."""
+    global _default_hasher
+    if has_app_context():
+        hasher = current_app.extensions.get('password_hasher')
+        if hasher is not None:
+            return hasher
+    if _default_hasher is None:
+        with _default_hasher_lock:
+            if _default_hasher is None:
+                _default_hasher = PasswordHasher()
+    return _default_hasher
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup
+
+from core.models import Model
+
+# Macros in this template render one card each: career, college and (roadmap) phase
+CARDS_TEMPLATE = '_cards.html'
+
+
+def fragment_key(kind: str, item) -> str:
+    """Content hash of one card's data; equal content renders to equal HTML."""
+    data = item.to_dict() if isinstance(item, Model) else item
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(f'{kind}:{canonical}'.encode('utf-8')).hexdigest()
+
+
+class FragmentCache:
+    """
+    Per-process LRU of rendered card HTML keyed by content hash. Cached
+    recommendations and reopened saved reports hand the same content
+    back, so their cards are rendered once and then only looked up.
+    """
+
+    def __init__(self, max_size: int = 2048):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Markup]:
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+            return html
+
+    def set(self, key: str, html: Markup):
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def init_rendering(app):
+    """
+    Template speedups. JINJA_BYTECODE_CACHE_DIR (default
+    instance/jinja_cache, JINJA_BYTECODE_CACHE=False to disable) keeps
+    compiled templates on disk, so every worker on the host skips
+    compiling them after the first. FRAGMENT_CACHE_SIZE (0 disables)
+    bounds the rendered-card cache behind the render_card() template
+    global.
+    """
+    if app.config.get('JINJA_BYTECODE_CACHE', True):
+        directory = app.config.get('JINJA_BYTECODE_CACHE_DIR', os.path.join(app.instance_path, 'jinja_cache'))
+        os.makedirs(directory, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+    # Fingerprint of the template sources, for validators of rendered pages
+    digest = hashlib.sha256()
+    folder = os.path.join(app.root_path, app.template_folder)
+    for name in sorted(app.jinja_env.list_templates()):
+        digest.update(name.encode('utf-8'))
+        with open(os.path.join(folder, name), 'rb') as f:
+            digest.update(f.read())
+    app.extensions['templates_version'] = digest.hexdigest()[:16]
+
+    size = app.config.get('FRAGMENT_CACHE_SIZE', 2048)
+    cache = FragmentCache(max_size=size) if size else None
+    app.extensions['fragment_cache'] = cache
+
+    loaded = [None]
+
+    def render_card(kind: str, item) -> Markup:
+        template = app.jinja_env.get_template(CARDS_TEMPLATE)
+        macro = getattr(template.module, kind)
+        if cache is None:
+            return macro(item)
+        if template is not loaded[0]:
+            # First use, or the template was edited and auto-reloaded
+            cache.clear()
+            loaded[0] = template
+        key = fragment_key(kind, item)
+        html = cache.get(key)
+        if html is None:
+            html = macro(item)
+            cache.set(key, html)
+        return html
+
+    app.jinja_env.globals['render_card'] = render_card
+    # For card HTML sent outside a page render, e.g. in streamed events
+    app.extensions['render_card'] = render_card
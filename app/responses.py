@@ -0,0 +1,83 @@
+import gzip
+import hashlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it responses are gzip-compressed
+    brotli = None
+
+# Dynamic responses worth compressing; streams (SSE, NDJSON) and files are left alone
+COMPRESS_MIMETYPES = ('text/html', 'application/json', 'text/plain', 'text/css', 'application/javascript')
+
+
+def _encode(encoding: str, data: bytes, config) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=config.get('COMPRESS_BR_QUALITY', 5))
+    return gzip.compress(data, compresslevel=config.get('COMPRESS_LEVEL', 6))
+
+
+def compress_response(response):
+    """
+    after_request hook: gzip (or brotli, when installed) for buffered
+    HTML/JSON bodies of at least COMPRESS_MIN_SIZE bytes that the client
+    accepts. A strong ETag gets the encoding appended, since the
+    compressed bytes are a different representation.
+    """
+    config = current_app.config
+    if (response.status_code < 200 or response.status_code in (204, 304)
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in config.get('COMPRESS_MIMETYPES', COMPRESS_MIMETYPES)):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    accepted = request.accept_encodings
+    encoding = 'br' if brotli is not None and accepted['br'] > 0 else 'gzip' if accepted['gzip'] > 0 else None
+    data = response.get_data()
+    if encoding is None or len(data) < config.get('COMPRESS_MIN_SIZE', 500):
+        return response
+
+    response.set_data(_encode(encoding, data, config))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f'{etag}-{encoding}')
+    return response
+
+
+def content_etag(*parts) -> str:
+    """Strong ETag value hashed from stored content (bytes or str parts)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:32]
+
+
+def not_modified(etag: str):
+    """
+    A 304 response if the request's If-None-Match already holds `etag`
+    in any encoding compress_response may have sent, else None. Checked
+    before rendering, so repeat views skip the work entirely.
+    """
+    for candidate in (etag, f'{etag}-gzip', f'{etag}-br'):
+        if request.if_none_match.contains(candidate):
+            response = current_app.response_class(status=304)
+            return with_etag(response, candidate)
+    return None
+
+
+def with_etag(response, etag: str):
+    # Private per-user content: browsers keep it but revalidate every time
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def init_compression(app):
+    """COMPRESS_ENABLED=False turns response compression off (e.g. behind a compressing proxy)."""
+    if app.config.get('COMPRESS_ENABLED', True):
+        app.after_request(compress_response)
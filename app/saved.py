@@ -0,0 +1,178 @@
+import atexit
+import json
+import queue
+import threading
+import zlib
+from datetime import datetime
+
+from flask import current_app
+
+from app import db
+from app.models import Roadmap, SavedRecommendation
+from core.models import to_json, from_json
+from core.utils import results_to_dict
+
+# Stored in every payload so readers can tell layouts apart if it ever changes
+PAYLOAD_VERSION = 1
+
+# Queued after the last save to stop the writer thread
+_STOP = object()
+
+
+def encode_payload(user_profile, results: dict) -> bytes:
+    data = {"v": PAYLOAD_VERSION, "profile": user_profile.to_dict()}
+    data.update(results_to_dict(results))
+    return zlib.compress(to_json(data).encode('utf-8'), 6)
+
+
+def decode_payload(payload: bytes) -> dict:
+    return from_json(zlib.decompress(payload))
+
+
+def roadmap_summary(roadmap: Roadmap) -> dict:
+    return {
+        "id": roadmap.id,
+        "created_at": roadmap.created_at.isoformat() if roadmap.created_at else None,
+        "career_titles": json.loads(roadmap.career_titles) if roadmap.career_titles else [],
+        "phase_count": roadmap.phase_count,
+    }
+
+
+def roadmap_detail(roadmap: Roadmap) -> dict:
+    """Summary plus the full content, and the saved report it came from if any."""
+    data = roadmap_summary(roadmap)
+    data["roadmap"] = json.loads(roadmap.content)
+    if roadmap.saved is not None:
+        data["saved"] = saved_to_dict(roadmap.saved, full=True)
+    return data
+
+
+def saved_to_dict(saved: SavedRecommendation, full: bool = False) -> dict:
+    data = {
+        "id": saved.id,
+        "student_name": saved.student_name,
+        "roadmap_id": saved.roadmap_id,
+        "created_at": saved.created_at.isoformat() if saved.created_at else None,
+    }
+    if full:
+        data.update(decode_payload(saved.payload))
+    return data
+
+
+class SaveWriter:
+    """
+    Writes saved recommendations to the database from a background thread.
+    Requests only enqueue the results; the writer drains whatever has
+    queued up (up to batch_size) and inserts it with one commit, so saving never
+    adds database latency to a response and bursts cost few transactions.
+    close() (run at interpreter exit) writes whatever is still queued.
+    """
+
+    def __init__(self, app, batch_size: int = 50, queue_size: int = 1000):
+        self.app = app
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._closed = False
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._write_loop, name="save-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def submit(self, user_profile, results: dict, user_id=None):
+        """Queues one save; blocks only if the writer is far behind. Writes directly once closed."""
+        entry = (user_profile, results, user_id, datetime.utcnow())
+        if self._closed:
+            write_saved([entry])
+            return
+        self._queue.put(entry)
+
+    def close(self, timeout: float = 10.0):
+        """Writes the saves still queued, waiting at most `timeout` seconds for the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                print(f"Save writer did not finish within {timeout}s; about {self._queue.qsize()} saves were not written")
+
+    def _write_loop(self):
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stopping = True
+                batch = [entry for entry in batch if entry is not _STOP]
+            if not batch:
+                continue
+            try:
+                with self.app.app_context():
+                    write_saved(batch)
+            except Exception as e:
+                print(f"Save writer error: {e}")
+
+
+def _build(user_profile, results: dict, user_id, created_at) -> SavedRecommendation:
+    saved = SavedRecommendation(
+        user_id=user_id,
+        student_name=user_profile.name[:100],
+        payload=encode_payload(user_profile, results),
+        created_at=created_at,
+    )
+    if user_id is not None:
+        roadmap = results["roadmap"]
+        saved.roadmap = Roadmap(
+            user_id=user_id,
+            content=json.dumps(roadmap),
+            created_at=created_at,
+            # Summary columns so history listings never touch the content
+            career_titles=json.dumps([career.career_title for career in results["careers"][:3]]),
+            phase_count=len(roadmap) if isinstance(roadmap, list) else 0,
+        )
+    return saved
+
+
+def write_saved(batch: list):
+    """Inserts (user_profile, results, user_id, created_at) entries with a single commit."""
+    try:
+        db.session.add_all([_build(*entry) for entry in batch])
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        if len(batch) == 1:
+            print(f"Could not save recommendations for {batch[0][0].name}: {e}")
+            return
+        # Find the bad row instead of losing the whole batch
+        for entry in batch:
+            write_saved([entry])
+
+
+def init_save_writer(app) -> SaveWriter:
+    writer = SaveWriter(
+        app,
+        batch_size=app.config.get('SAVE_BATCH_SIZE', 50),
+    )
+    app.extensions['save_writer'] = writer
+    writer.start()
+    return writer
+
+
+def save_results(user_profile, results: dict, user_id=None):
+    """
+    Saves results through the app's background writer, or synchronously
+    when none is running (e.g. under testing). Needs an app context.
+    """
+    writer = current_app.extensions.get('save_writer')
+    if writer is not None:
+        writer.submit(user_profile, results, user_id)
+    else:
+        write_saved([(user_profile, results, user_id, datetime.utcnow())])
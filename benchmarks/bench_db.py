@@ -0,0 +1,151 @@
+"""
+Concurrency benchmark for the database layer: register, login and save
+from many threads at once, reporting throughput, latency percentiles and
+"database is locked" style failures per backend.
+
+    python benchmarks/bench_db.py                                   # temp SQLite file, tuned vs untuned
+    python benchmarks/bench_db.py --url postgresql://user:pw@localhost/bench --threads 32
+
+Each URL gets fresh tables (drop_all/create_all), so never point it at a real database.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.models import User, CareerRecommendation  # noqa: E402
+from app.saved import write_saved  # noqa: E402
+from core.user_input import create_user_profile  # noqa: E402
+
+PROFILE = create_user_profile({
+    'name': 'Bench Student', 'age': '16', 'current_grade': '11',
+    'academic_subjects': 'Math, Physics', 'grades': 'Math: A, Physics: B',
+    'interests': 'robotics', 'hobbies': 'chess', 'preferred_work_environment': 'Office',
+})
+RESULTS = {
+    'careers': [CareerRecommendation(f'Career {i}', 'Description', ['a', 'b'], 'BSc', 'Good', '1-2', 'High')
+                for i in range(5)],
+    'colleges': [],
+    'roadmap': [{'title': 'Phase 1', 'period': '6 months', 'objective': 'o', 'action_items': [], 'milestones': []}],
+    'errors': {},
+}
+
+
+def make_config(url: str, tuning: bool):
+    class BenchConfig:
+        SQLALCHEMY_DATABASE_URI = url
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        SECRET_KEY = 'bench'
+        TESTING = True
+        SQLITE_TUNING = tuning
+        # Untuned runs keep Python's default 5s sqlite3 timeout
+        DB_BUSY_TIMEOUT = 15.0 if tuning else 5.0
+    return BenchConfig
+
+
+def run(url: str, threads: int, ops: int, tuning: bool) -> dict:
+    app = create_app(make_config(url, tuning))
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+    timings = {'register': [], 'login': [], 'save': []}
+    failures = {'register': 0, 'login': 0, 'save': 0}
+    lock = threading.Lock()
+
+    def timed(kind, fn):
+        started = time.perf_counter()
+        try:
+            with app.app_context():
+                fn()
+        except OperationalError as e:
+            with lock:
+                failures[kind] += 1
+            if failures[kind] == 1:
+                print(f"  {kind} failed: {str(e.orig) if e.orig else e}", file=sys.stderr)
+            return
+        with lock:
+            timings[kind].append(time.perf_counter() - started)
+
+    def worker():
+        for _ in range(ops):
+            username = uuid.uuid4().hex[:16]
+
+            def register():
+                user = User(username=username, name='Bench')
+                user.set_password('password123')
+                db.session.add(user)
+                db.session.commit()
+
+            def login():
+                user = User.query.filter_by(username=username).first()
+                if user is not None:
+                    user.check_password('password123')
+
+            def save():
+                user = User.query.filter_by(username=username).with_entities(User.id).first()
+                write_saved([(PROFILE, RESULTS, user.id if user else None, datetime.utcnow())])
+
+            timed('register', register)
+            timed('login', login)
+            timed('save', save)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    return {'elapsed': elapsed, 'timings': timings, 'failures': failures}
+
+
+def report(label: str, outcome: dict):
+    print(f"\n{label}  ({outcome['elapsed']:.1f}s)")
+    for kind, samples in outcome['timings'].items():
+        if samples:
+            samples.sort()
+            p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+            print(f"  {kind:<9} {len(samples) / outcome['elapsed']:8.1f} ops/s   "
+                  f"p50 {statistics.median(samples) * 1000:7.1f} ms   p99 {p99 * 1000:7.1f} ms   "
+                  f"failed {outcome['failures'][kind]}")
+        else:
+            print(f"  {kind:<9} no successful operations, failed {outcome['failures'][kind]}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Register/login/save concurrency benchmark.')
+    parser.add_argument('--url', action='append', help='database URL (repeatable); default: a temp SQLite file')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--ops', type=int, default=20, help='register/login/save rounds per thread')
+    args = parser.parse_args(argv)
+
+    if args.url:
+        for url in args.url:
+            report(url, run(url, args.threads, args.ops, tuning=True))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for tuning in (False, True):
+            path = os.path.join(tmp, f"bench-{'tuned' if tuning else 'default'}.db")
+            label = 'SQLite, WAL + busy timeout' if tuning else 'SQLite, rollback journal (no tuning)'
+            report(label, run(f'sqlite:///{path}', args.threads, args.ops, tuning))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Serialization and memory benchmark for the result models: the slotted
+core.models classes and their binary/JSON forms against plain
+(unslotted) dataclasses stored with pickle or asdict + json, as before.
+
+    python benchmarks/bench_models.py [--careers 5] [--colleges 10] [--rounds 2000]
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, astuple, dataclass
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import models  # noqa: E402
+from core.models import CareerRecommendation, CollegeRecommendation  # noqa: E402
+
+
+@dataclass
+class PlainCareer:
+    career_title: str
+    description: str
+    required_skills: List[str]
+    education_path: str
+    job_prospects: str
+    salary_range: str
+    growth_potential: str
+
+
+@dataclass
+class PlainCollege:
+    college_name: str
+    location: str
+    programs: List[str]
+    ranking: str
+    admission_requirements: str
+    fees_range: str
+    notable_features: str
+
+
+def sample(careers: int, colleges: int):
+    return (
+        [CareerRecommendation(f'Career {i}', 'A realistic description of the work. ' * 4,
+                              ['Python', 'Statistics', 'Communication', 'SQL'], 'B.Tech then M.Tech',
+                              'Strong demand across industries', '8-25 LPA', 'High') for i in range(careers)],
+        [CollegeRecommendation(f'College {i}', 'Bengaluru, Karnataka', ['B.Tech CSE', 'B.Sc Data Science'],
+                               'NIRF top 50', 'JEE Main percentile above 95', '2-4 lakh per year',
+                               'Active placement cell and research labs') for i in range(colleges)],
+    )
+
+
+def timed(rounds: int, fn) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+def memory_per_object(factory, count: int = 10000) -> float:
+    tracemalloc.start()
+    objects = [factory() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Result model serialization benchmark.')
+    parser.add_argument('--careers', type=int, default=5)
+    parser.add_argument('--colleges', type=int, default=10)
+    parser.add_argument('--rounds', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    careers, colleges = sample(args.careers, args.colleges)
+    plain_careers = [PlainCareer(*astuple(c)) for c in careers]
+    plain_colleges = [PlainCollege(*astuple(c)) for c in colleges]
+
+    def legacy_json():
+        raw = json.dumps([asdict(c) for c in plain_careers]), json.dumps([asdict(c) for c in plain_colleges])
+        return [PlainCareer(**c) for c in json.loads(raw[0])], [PlainCollege(**c) for c in json.loads(raw[1])]
+
+    cases = [
+        ('pickle, plain dataclasses', lambda: pickle.loads(pickle.dumps((plain_careers, plain_colleges), 5)),
+         len(pickle.dumps((plain_careers, plain_colleges), 5))),
+        ('asdict + json, plain dataclasses', legacy_json,
+         len(json.dumps([asdict(c) for c in plain_careers])) + len(json.dumps([asdict(c) for c in plain_colleges]))),
+        ('models.dumps/loads (binary)', lambda: (models.loads(models.dumps(careers)), models.loads(models.dumps(colleges))),
+         len(models.dumps(careers)) + len(models.dumps(colleges))),
+        ('models.to_json/from_json', lambda: (models.from_json(models.to_json(careers), CareerRecommendation),
+                                              models.from_json(models.to_json(colleges), CollegeRecommendation)),
+         len(models.to_json(careers)) + len(models.to_json(colleges))),
+    ]
+
+    print(f"{args.careers} careers + {args.colleges} colleges, round trip"
+          f" (JSON via {'orjson' if models.orjson else 'stdlib json'})\n")
+    print(f"{'format':<36} {'us/round trip':>14} {'bytes':>8}")
+    for label, fn, size in cases:
+        print(f"{label:<36} {timed(args.rounds, fn):14.1f} {size:8d}")
+
+    row = astuple(careers[0])
+    print(f"\nmemory per career object: plain dataclass {memory_per_object(lambda: PlainCareer(*row)):.0f} B,"
+          f" slotted model {memory_per_object(lambda: CareerRecommendation(*row)):.0f} B")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Micro-benchmark for the career/college response parsers.
+
+    python benchmarks/bench_parsers.py [recorded_response.txt ...]
+
+Without arguments it builds large synthetic responses in the format the
+prompts ask for (markdown-decorated, with wrapped continuation lines).
+Recorded responses can be passed as files to measure real archives.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.parsers import CareerResponseParser, CollegeResponseParser, parse_all  # noqa: E402
+
+
+def synthetic_careers(blocks):
+    parts = []
+    for i in range(1, blocks + 1):
+        parts.append(
+            f"**CAREER {i}:**\n"
+            f"**Career Title:** Data Scientist {i}\n"
+            "**Description:** Analyses large datasets to find patterns and build predictive models\n"
+            "that help organisations make decisions.\n"
+            "**Required Skills:** Python, Statistics, Machine Learning, SQL, Communication\n"
+            "**Education Path:** B.Sc. in Statistics or Computer Science, followed by an M.Sc.\n"
+            "**Job Prospects:** Very high demand across technology, finance and healthcare.\n"
+            "**Salary Range:** 8-25 LPA depending on experience\n"
+            "**Growth Potential:** Strong, with paths into ML engineering and research.\n\n"
+        )
+    return "".join(parts)
+
+
+def synthetic_colleges(blocks):
+    parts = []
+    for i in range(1, blocks + 1):
+        parts.append(
+            f"COLLEGE {i}:\n"
+            f"College Name: Institute of Technology {i}\n"
+            "Location: Pune, India\n"
+            "Programs: B.Tech Computer Science, B.Sc Data Science, BCA\n"
+            "Ranking: Top 50 (NIRF)\n"
+            "Admission Requirements: JEE Main score, 75% in 12th grade\n"
+            "Fees Range: 1.5-2.5 Lakhs per year\n"
+            "Notable Features: Strong placement record, active coding clubs,\n"
+            "industry partnerships.\n\n"
+        )
+    return "".join(parts)
+
+
+def bench(label, parser_class, text, repeat):
+    items = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        # Lift the item limit so the whole text is parsed, like bulk re-parsing does
+        items = len(parse_all(parser_class(limit=float('inf')), text))
+    elapsed = time.perf_counter() - start
+    mb = len(text.encode('utf-8')) * repeat / 1e6
+    print(f"{label:<28} {items:>7} items  {mb / elapsed:8.2f} MB/s  "
+          f"{items * repeat / elapsed:12.0f} items/s")
+
+
+def main(paths):
+    repeat = 5
+    if paths:
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            name = os.path.basename(path)
+            bench(f"{name} (career)", CareerResponseParser, text, repeat)
+            bench(f"{name} (college)", CollegeResponseParser, text, repeat)
+        return
+
+    bench("synthetic careers", CareerResponseParser, synthetic_careers(20000), repeat)
+    bench("synthetic colleges", CollegeResponseParser, synthetic_colleges(20000), repeat)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
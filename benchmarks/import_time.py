@@ -0,0 +1,91 @@
+"""
+Cold-start report: import time of the app factory and time to the first
+request, each measured in a fresh interpreter like a new worker.
+
+    python benchmarks/import_time.py [--top 25] [--runs 3]
+
+The top list comes from `python -X importtime` (cumulative microseconds
+per top-level import); re-run it after adding imports to catch modules
+that should be loaded lazily.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A throwaway database so probing never touches instance/site.db; no job
+# dispatcher, whose polling of the unmigrated database would print into the report
+ENV = dict(os.environ, JOBS_ENABLED='false',
+           DATABASE_URL='sqlite:///' + os.path.join(tempfile.gettempdir(), 'import_time_probe.db'))
+
+FIRST_REQUEST = """
+import time
+started = time.perf_counter()
+from app import create_app
+app = create_app()
+created = time.perf_counter()
+app.test_client().get('/login')
+done = time.perf_counter()
+import sys
+lazy = [m for m in ('requests', 'urllib3', 'pypdf', 'docx', 'alembic', 'multiprocessing') if m in sys.modules]
+print(f"TIMINGS {created - started:.4f} {done - started:.4f} {','.join(lazy) or '-'}")
+"""
+
+
+def import_profile(top: int):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'from app import create_app; create_app()'],
+        cwd=ROOT, env=ENV, capture_output=True, text=True,
+    )
+    rows = []
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        # Nesting is shown as two spaces of indentation per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            total += int(cumulative)
+        rows.append((int(cumulative), int(own), name.rstrip()))
+    return total, sorted(rows, reverse=True)[:top]
+
+
+def first_request(runs: int):
+    samples = []
+    for _ in range(runs):
+        lines = subprocess.run([sys.executable, '-c', FIRST_REQUEST], cwd=ROOT, env=ENV,
+                               capture_output=True, text=True).stdout.splitlines()
+        # Background threads may still print around (or into) the timings line
+        out = next((line[line.index('TIMINGS '):].split()[1:4] for line in lines if 'TIMINGS ' in line), [])
+        if len(out) != 3:
+            raise SystemExit('first-request probe failed; run it by hand to see the error')
+        samples.append((float(out[0]), float(out[1]), out[2]))
+    return samples
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Import-time and time-to-first-request report.')
+    parser.add_argument('--top', type=int, default=25, help='slowest imports to list')
+    parser.add_argument('--runs', type=int, default=3, help='fresh interpreters for the first-request timing')
+    args = parser.parse_args(argv)
+
+    total, rows = import_profile(args.top)
+    print(f"create_app import total: {total / 1000:.1f} ms\n")
+    print(f"{'cumulative':>12} {'self':>9}  module")
+    for cumulative, own, name in rows:
+        print(f"{cumulative / 1000:10.1f}ms {own / 1000:7.1f}ms  {name}")
+
+    samples = first_request(args.runs)
+    print(f"\ncreate_app():      median {statistics.median(s[0] for s in samples) * 1000:.0f} ms")
+    print(f"first request:     median {statistics.median(s[1] for s in samples) * 1000:.0f} ms")
+    print(f"heavy modules loaded by then: {samples[-1][2]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+Archive of raw AI responses for replay and analytics.
+
+Records are handed to a background thread through a bounded queue, so the
+request thread never touches the disk. The writer appends compact JSON
+lines to gzip segments that rotate by size, and keeps a small SQLite index
+(timestamp, prompt hash -> segment, line) next to them so a time range or
+one prompt can be pulled out without decompressing everything. Whenever a
+segment rotates, the oldest finished segments and their index rows are
+deleted to keep the archive under its size and age caps.
+
+    python -m core.archive instance/response_archive --since 2024-01-01 > dump.jsonl
+"""
+import argparse
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import queue
+import random
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Iterator, Optional
+
+ARCHIVE_DIR = os.environ.get('RESPONSE_ARCHIVE_DIR', os.path.join('instance', 'response_archive'))
+ARCHIVE_ENABLED = os.environ.get('RESPONSE_ARCHIVE_ENABLED', 'true').lower() == 'true'
+# Fraction of responses archived (0.0 - 1.0)
+ARCHIVE_SAMPLE_RATE = float(os.environ.get('RESPONSE_ARCHIVE_SAMPLE_RATE', '1.0'))
+ARCHIVE_SEGMENT_BYTES = int(float(os.environ.get('RESPONSE_ARCHIVE_SEGMENT_MB', '16')) * 1024 * 1024)
+# Retention caps for the whole directory (0 = unlimited)
+ARCHIVE_MAX_BYTES = int(float(os.environ.get('RESPONSE_ARCHIVE_MAX_MB', '512')) * 1024 * 1024)
+ARCHIVE_MAX_AGE = float(os.environ.get('RESPONSE_ARCHIVE_MAX_DAYS', '30')) * 86400
+
+INDEX_NAME = 'index.db'
+SEGMENT_PREFIX = 'responses-'
+SEGMENT_SUFFIX = '.jsonl.gz'
+_STOP = object()
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]
+
+
+def _connect_index(directory: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(os.path.join(directory, INDEX_NAME))
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS records ("
+        " ts REAL NOT NULL, prompt_hash TEXT NOT NULL, segment TEXT NOT NULL, line INTEGER NOT NULL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_records_ts ON records (ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_records_prompt_hash ON records (prompt_hash)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_records_segment ON records (segment)")
+    return conn
+
+
+class ResponseArchive:
+    """
+    Non-blocking writer for raw responses. record() samples, enqueues and
+    returns; when the queue is full the record is dropped and counted
+    rather than slowing the request down.
+
+    max_bytes and max_age (seconds) cap the finished segments in the
+    directory; 0 turns a cap off.
+    """
+
+    def __init__(self, directory: str = ARCHIVE_DIR, segment_bytes: int = ARCHIVE_SEGMENT_BYTES,
+                 sample_rate: float = ARCHIVE_SAMPLE_RATE, enabled: bool = ARCHIVE_ENABLED,
+                 queue_size: int = 1000, batch_size: int = 100,
+                 max_bytes: int = ARCHIVE_MAX_BYTES, max_age: float = ARCHIVE_MAX_AGE):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.sample_rate = sample_rate
+        self.enabled = enabled and sample_rate > 0
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def record(self, prompt: str, model: str, response, **extra):
+        if not self.enabled or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            return
+        entry = {"ts": time.time(), "model": model, "prompt_hash": prompt_hash(prompt),
+                 "prompt": prompt, "response": response}
+        entry.update(extra)
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._write_loop, name="response-archive", daemon=True)
+                    self._thread.start()
+                    atexit.register(self.close)
+
+    def close(self, timeout: float = 5.0):
+        """Flushes queued records and finishes the current segment."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _write_loop(self):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            index = _connect_index(self.directory)
+        except Exception as e:
+            print(f"Response archive disabled: {e}")
+            self.enabled = False
+            return
+        self._prune(index, None)
+
+        segment = None
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # Drain whatever else is waiting so each flush and index commit covers many records
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stopping = True
+                batch = [entry for entry in batch if entry is not _STOP]
+            try:
+                rows = []
+                for entry in batch:
+                    if segment is None or segment.full():
+                        if segment is not None:
+                            segment.close()
+                        segment = _Segment(self.directory, self.segment_bytes)
+                        self._prune(index, segment.name)
+                    rows.append((entry["ts"], entry["prompt_hash"], segment.name, segment.write(entry)))
+                if segment is not None:
+                    segment.flush()
+                index.executemany("INSERT INTO records (ts, prompt_hash, segment, line) VALUES (?, ?, ?, ?)", rows)
+                index.commit()
+            except Exception as e:
+                print(f"Response archive write failed: {e}")
+        if segment is not None:
+            segment.close()
+        index.close()
+
+    def _prune(self, index: sqlite3.Connection, current: Optional[str]):
+        """Deletes the oldest segments (never the one being written) and their index rows."""
+        if not self.max_bytes and not self.max_age:
+            return
+        try:
+            segments = []
+            for name in os.listdir(self.directory):
+                if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX) and name != current:
+                    try:
+                        stat = os.stat(os.path.join(self.directory, name))
+                    except FileNotFoundError:
+                        continue
+                    segments.append((stat.st_mtime, name, stat.st_size))
+            segments.sort()
+
+            now = time.time()
+            total = sum(size for _, _, size in segments)
+            removed = []
+            for mtime, name, size in segments:
+                expired = self.max_age and now - mtime > self.max_age
+                if not expired and not (self.max_bytes and total > self.max_bytes):
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed.append((name,))
+            if removed:
+                index.executemany("DELETE FROM records WHERE segment = ?", removed)
+                index.commit()
+        except Exception as e:
+            print(f"Response archive cleanup failed: {e}")
+
+
+class _Segment:
+    def __init__(self, directory: str, max_bytes: int):
+        self.name = (f"{SEGMENT_PREFIX}{datetime.utcnow():%Y%m%dT%H%M%S}-{os.getpid()}-"
+                     f"{random.getrandbits(24):06x}{SEGMENT_SUFFIX}")
+        self.max_bytes = max_bytes
+        self._raw = open(os.path.join(directory, self.name), 'ab')
+        self._gz = gzip.GzipFile(fileobj=self._raw, mode='ab')
+        self.lines = 0
+
+    def write(self, entry: dict) -> int:
+        self._gz.write(json.dumps(entry, separators=(',', ':'), default=str).encode('utf-8') + b'\n')
+        self.lines += 1
+        return self.lines - 1
+
+    def flush(self):
+        # Sync flush so the segment is readable up to here even if the process dies
+        self._gz.flush()
+        self._raw.flush()
+
+    def full(self) -> bool:
+        return self._raw.tell() >= self.max_bytes
+
+    def close(self):
+        self._gz.close()
+        self._raw.close()
+
+
+def iter_records(directory: str = ARCHIVE_DIR, since: Optional[float] = None, until: Optional[float] = None,
+                 prompt_hash: Optional[str] = None) -> Iterator[dict]:
+    """
+    Yields archived records, oldest segment first, optionally limited to a
+    time range and/or one prompt hash. The index picks the segments (and
+    lines) to read; segments cut short by a crash are read up to the break.
+    """
+    clauses, params = [], []
+    if since is not None:
+        clauses.append("ts >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("ts < ?")
+        params.append(until)
+    if prompt_hash:
+        clauses.append("prompt_hash = ?")
+        params.append(prompt_hash)
+    where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+
+    index = _connect_index(directory)
+    try:
+        wanted = {}
+        for segment, line in index.execute(f"SELECT segment, line FROM records{where} ORDER BY ts", params):
+            wanted.setdefault(segment, set()).add(line)
+    finally:
+        index.close()
+
+    # Segments in order of their first record; names from the same second don't sort by age
+    for segment in wanted:
+        lines = wanted[segment]
+        try:
+            with gzip.open(os.path.join(directory, segment), 'rb') as f:
+                for number, raw in enumerate(f):
+                    if number in lines:
+                        yield json.loads(raw)
+        except (EOFError, OSError) as e:
+            print(f"Segment {segment} ends early: {e}", file=sys.stderr)
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_response_archive() -> ResponseArchive:
+    """Process-wide archive configured from the RESPONSE_ARCHIVE_* environment variables."""
+    global _archive
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                _archive = ResponseArchive()
+    return _archive
+
+
+def _parse_time(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m core.archive', description='Export archived AI responses as JSONL.')
+    parser.add_argument('directory', nargs='?', default=ARCHIVE_DIR)
+    parser.add_argument('--since', type=_parse_time, help='ISO date/time or unix timestamp')
+    parser.add_argument('--until', type=_parse_time, help='ISO date/time or unix timestamp')
+    parser.add_argument('--prompt-hash')
+    args = parser.parse_args(argv)
+    for entry in iter_records(args.directory, args.since, args.until, args.prompt_hash):
+        sys.stdout.write(json.dumps(entry) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterable, Iterator, Tuple
+
+from core.user_input import create_user_profile
+from core.utils import results_to_dict
+
+
+def _to_form_value(value):
+    """JSONL rows may use real lists/dicts; flatten them to the form's comma-separated text."""
+    if isinstance(value, dict):
+        return ", ".join(f"{k}: {v}" for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    if isinstance(value, bool):
+        # Checkbox semantics: false must not read as a truthy "False"
+        return "y" if value else ""
+    if value is None:
+        return ""
+    return str(value)
+
+
+def iter_profile_rows(text_stream, fmt: str) -> Iterator[Tuple[int, object]]:
+    """
+    Lazily yields (row_number, form_dict) from a CSV or JSONL stream.
+    A row that cannot be decoded is yielded as (row_number, exception)
+    so the caller can report it without aborting the batch.
+    CSV columns (and JSONL keys) are the same names as the /submit form fields.
+    """
+    if fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(text_stream), 1):
+            yield number, {k.strip(): (v or '').strip() for k, v in row.items() if k}
+        return
+
+    number = 0
+    for line in text_stream:
+        line = line.strip()
+        if not line:
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError("each line must be a JSON object")
+        except ValueError as e:
+            yield number, e
+            continue
+        yield number, {k: _to_form_value(v) for k, v in row.items()}
+
+
+def detect_format(filename: str = '', content_type: str = '') -> str:
+    filename = (filename or '').lower()
+    content_type = (content_type or '').lower()
+    if filename.endswith('.csv') or 'csv' in content_type:
+        return 'csv'
+    return 'jsonl'
+
+
+def generate_row(system, number: int, form_data) -> dict:
+    """Generates one row's record; never raises, errors become error records."""
+    if isinstance(form_data, Exception):
+        return {"row": number, "status": "error", "error": f"Invalid row: {form_data}"}
+    try:
+        user_profile = create_user_profile(form_data)
+    except (ValueError, KeyError) as e:
+        return {"row": number, "status": "error", "error": f"Invalid profile: {e}"}
+    try:
+        results = system.generate_all(user_profile)
+    except Exception as e:
+        return {"row": number, "name": user_profile.name, "status": "error", "error": str(e)}
+    record = {"row": number, "name": user_profile.name, "status": "ok"}
+    record.update(results_to_dict(results))
+    return record
+
+
+def run_windowed(executor, fn, rows: Iterable[Tuple[int, object]], concurrency: int) -> Iterator:
+    """
+    Submits fn(number, form_data) for each row to the executor with at most
+    `concurrency` in flight, yielding results as they finish. Rows are
+    pulled from the iterator only when a slot frees up, so memory stays
+    flat however many rows there are.
+    """
+    rows = iter(rows)
+    in_flight = set()
+    exhausted = False
+    while in_flight or not exhausted:
+        while not exhausted and len(in_flight) < concurrency:
+            try:
+                number, form_data = next(rows)
+            except StopIteration:
+                exhausted = True
+                break
+            except Exception as e:
+                # A broken file (e.g. bad CSV quoting) ends the input, not the batch
+                exhausted = True
+                yield {"row": None, "status": "error", "error": f"Could not read input: {e}"}
+                break
+            in_flight.add(executor.submit(fn, number, form_data))
+        if not in_flight:
+            break
+        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+
+def run_batch(system, rows: Iterable[Tuple[int, object]], concurrency: int = 4) -> Iterator[dict]:
+    """
+    Runs the generation pipeline for every row on a thread pool with at
+    most `concurrency` profiles in flight, yielding one result dict per row
+    as it finishes. Row errors become error records.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch") as executor:
+        yield from run_windowed(executor, lambda number, form_data: generate_row(system, number, form_data),
+                                rows, concurrency)
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from core import models
+from core.models import CareerRecommendation, CollegeRecommendation
+
+# Bump whenever a prompt template changes so old generations stop matching
+PROMPT_VERSION = 2
+
+
+def _normalize(value):
+    """Canonical form of profile values: trimmed, case-folded, order-independent lists."""
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, dict):
+        return {_normalize(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return sorted(_normalize(v) for v in value)
+    return value
+
+
+def make_cache_key(kind: str, model: str, fields: dict) -> str:
+    """Hashes the prompt inputs of one generation together with model and prompt version."""
+    payload = {
+        "kind": kind,
+        "model": model,
+        "prompt_version": PROMPT_VERSION,
+        "fields": _normalize(fields),
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _encode(kind: str, value):
+    # Careers and colleges are stored in the compact binary model format
+    if kind in ("careers", "colleges"):
+        return models.dumps(value)
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _decode(kind: str, raw):
+    if isinstance(raw, bytes):
+        return models.loads(raw)
+    value = json.loads(raw)
+    # Rows written before the binary format hold JSON field dicts
+    if kind == "careers":
+        return [CareerRecommendation.from_dict(item) for item in value]
+    if kind == "colleges":
+        return [CollegeRecommendation.from_dict(item) for item in value]
+    return value
+
+
+class ResponseCache:
+    """
+    Two-tier cache for parsed LLM generations.
+    A bounded in-process LRU sits in front of a persistent SQLite table
+    with TTL and size-based eviction, so hits skip both the network call
+    and the response parsing.
+    """
+
+    def __init__(self, path: Optional[str] = None, memory_size: int = 256,
+                 max_entries: int = 10000, ttl: float = 7 * 24 * 3600):
+        self.path = path
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._connect().execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, kind TEXT NOT NULL, value TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._connect().execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at ON llm_cache (accessed_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared across threads, keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, kind: str, key: str, default: Any = None) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    return value
+                del self._memory[key]
+
+        if not self.path:
+            return default
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ? AND kind = ?", (key, kind)
+            ).fetchone()
+            if row is None:
+                return default
+            raw, created_at = row
+            if now - created_at > self.ttl:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return default
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            value = _decode(kind, raw)
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            print(f"Cache read error: {e}")
+            return default
+
+        self._remember(key, created_at, value)
+        return value
+
+    def set(self, kind: str, key: str, value: Any):
+        now = time.time()
+        self._remember(key, now, value)
+        if not self.path:
+            return
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, kind, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, kind, _encode(kind, value), now, now),
+            )
+            self._evict(conn, now)
+        except (sqlite3.Error, TypeError) as e:
+            print(f"Cache write error: {e}")
+
+    def _remember(self, key, created_at, value):
+        with self._lock:
+            self._memory[key] = (created_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+        (count,) = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                " SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.path:
+            self._connect().execute("DELETE FROM llm_cache")
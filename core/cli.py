@@ -0,0 +1,180 @@
+"""
+Offline bulk generation of recommendations.
+
+    python -m core.cli profiles.csv --output results.jsonl
+    python -m core.cli profiles.jsonl --output results.db --workers 8 --mode process
+
+Reads a CSV or JSONL file of profiles (same columns as the /submit form),
+fans generation out over a thread or process pool and writes one record
+per profile to a JSONL file or a SQLite database. Progress is checkpointed
+per row, so re-running the same command after an interruption skips every
+row that already completed and nothing is billed twice.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from core.batch import iter_profile_rows, detect_format, generate_row, run_windowed
+
+DEFAULT_API_KEY_ENV = 'OPENROUTER_API_KEY'
+
+
+def row_key(form_data: dict) -> str:
+    """Identifies a profile by its content, so reordered or appended input files still resume correctly."""
+    canonical = json.dumps(form_data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _is_complete(record: dict) -> bool:
+    # Invalid profiles are final; generation failures are retried on the next run
+    if record['status'] == 'error':
+        return record.get('error', '').startswith(('Invalid profile', 'Invalid row'))
+    # Generation errors come back as empty sections rather than exceptions
+    return not record.get('errors') and all(record.get(k) for k in ('careers', 'colleges', 'roadmap'))
+
+
+class JsonlSink:
+    """Appends records to a JSONL file; completed row keys go to a sidecar checkpoint file."""
+
+    def __init__(self, path: str):
+        self.checkpoint_path = path + '.checkpoint'
+        self.done = set()
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                self.done = {line.strip() for line in f if line.strip()}
+        self._out = open(path, 'a', encoding='utf-8')
+        self._checkpoint = open(self.checkpoint_path, 'a', encoding='utf-8')
+
+    def write(self, key: str, record: dict):
+        self._out.write(json.dumps(record) + '\n')
+        self._out.flush()
+        # Checkpoint only after the record is on disk
+        self._checkpoint.write(key + '\n')
+        self._checkpoint.flush()
+
+    def close(self):
+        self._out.close()
+        self._checkpoint.close()
+
+
+class SqliteSink:
+    """Stores records in a SQLite table; the table doubles as the checkpoint."""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS bulk_results ("
+            " row_key TEXT PRIMARY KEY, row INTEGER, name TEXT, status TEXT NOT NULL,"
+            " record TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self.done = {key for (key,) in self._conn.execute("SELECT row_key FROM bulk_results")}
+
+    def write(self, key: str, record: dict):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO bulk_results (row_key, row, name, status, record, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (key, record.get('row'), record.get('name'), record['status'], json.dumps(record), time.time()),
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+# Per-process recommendation system used by the pool workers
+_system = None
+
+
+def _init_worker(api_key: str, model: str, cache_path: str, combined: bool = False):
+    global _system
+    from core.recommendation_system import CareerRecommendationSystem
+    from core.cache import ResponseCache
+
+    cache = ResponseCache(cache_path) if cache_path else None
+    _system = CareerRecommendationSystem(api_key, model=model, cache=cache, combined=combined)
+
+
+def _run_row(number: int, form_data) -> dict:
+    return generate_row(_system, number, form_data)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m core.cli', description='Bulk-generate career recommendations.')
+    parser.add_argument('input', help='CSV or JSONL file of profiles')
+    parser.add_argument('--output', required=True, help='results file: .jsonl or .db/.sqlite')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='input format (default: from the file extension)')
+    parser.add_argument('--workers', type=int, default=4, help='profiles generated in parallel (default: 4)')
+    parser.add_argument('--mode', choices=['thread', 'process'], default='thread', help='worker pool type')
+    parser.add_argument('--api-key', default=os.environ.get(DEFAULT_API_KEY_ENV),
+                        help=f'OpenRouter API key (default: ${DEFAULT_API_KEY_ENV})')
+    parser.add_argument('--model', default='google/gemini-2.0-flash-001')
+    parser.add_argument('--cache', help='optional SQLite response cache path shared with the web app')
+    parser.add_argument('--combined', action='store_true',
+                        help='request careers, colleges and roadmap in one structured call per profile')
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        parser.error(f'an API key is required (--api-key or ${DEFAULT_API_KEY_ENV})')
+
+    if args.output.endswith(('.db', '.sqlite', '.sqlite3')):
+        sink = SqliteSink(args.output)
+    else:
+        sink = JsonlSink(args.output)
+
+    fmt = args.format or detect_format(args.input)
+    skipped = 0
+    pending_keys = {}
+
+    def rows():
+        nonlocal skipped
+        with open(args.input, encoding='utf-8-sig', newline='') as f:
+            for number, form_data in iter_profile_rows(f, fmt):
+                key = row_key(form_data) if isinstance(form_data, dict) else f'invalid-row-{number}'
+                if key in sink.done:
+                    skipped += 1
+                    continue
+                pending_keys[number] = key
+                yield number, form_data
+
+    init_args = (args.api_key, args.model, args.cache, args.combined)
+    if args.mode == 'process':
+        executor = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=init_args)
+    else:
+        _init_worker(*init_args)
+        executor = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix='bulk')
+
+    completed = failed = 0
+    started = time.monotonic()
+    try:
+        with executor:
+            for record in run_windowed(executor, _run_row, rows(), args.workers):
+                key = pending_keys.pop(record.get('row'), None)
+                if key is not None and _is_complete(record):
+                    sink.write(key, record)
+                    completed += 1
+                else:
+                    failed += 1
+                    print(f"Row {record.get('row')}: {record.get('error') or record.get('errors')} (will retry next run)",
+                          file=sys.stderr)
+                if (completed + failed) % 100 == 0:
+                    print(f"{completed} done, {failed} failed, {skipped} skipped "
+                          f"({time.monotonic() - started:.0f}s)", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("Interrupted; completed rows are checkpointed, re-run to resume.", file=sys.stderr)
+        return 130
+    finally:
+        sink.close()
+
+    print(f"Finished: {completed} done, {failed} failed, {skipped} already done earlier "
+          f"in {time.monotonic() - started:.0f}s", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import io
+import os
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+
+# Limits for resume text extraction, overridable from the environment
+MAX_PAGES = int(os.environ.get('RESUME_MAX_PAGES', 20))
+MAX_CHARS = int(os.environ.get('RESUME_MAX_CHARS', 100_000))
+TIMEOUT = float(os.environ.get('RESUME_TIMEOUT', 15))
+WORKERS = int(os.environ.get('RESUME_WORKERS', 2))
+
+
+def extract_pdf_text(file_stream, max_pages: int = MAX_PAGES, max_chars: int = MAX_CHARS) -> str:
+    """
+    Extracts text page by page, stopping at max_pages or once max_chars
+    have been collected, and joins the pages once at the end.
+    """
+    import pypdf
+
+    reader = pypdf.PdfReader(file_stream)
+    parts = []
+    total = 0
+    for index, page in enumerate(reader.pages):
+        if index >= max_pages or total >= max_chars:
+            break
+        page_text = page.extract_text() or ""
+        parts.append(page_text)
+        total += len(page_text) + 1
+    return "\n".join(parts)[:max_chars]
+
+
+def extract_docx_text(file_stream, max_chars: int = MAX_CHARS) -> str:
+    """Extracts paragraph text, stopping once max_chars have been collected."""
+    import docx
+
+    doc = docx.Document(file_stream)
+    parts = []
+    total = 0
+    for para in doc.paragraphs:
+        if total >= max_chars:
+            break
+        parts.append(para.text)
+        total += len(para.text) + 1
+    return "\n".join(parts)[:max_chars]
+
+
+def _extract_worker(data: bytes, kind: str, max_pages: int, max_chars: int) -> str:
+    # Runs inside a worker process, so it only receives plain bytes
+    stream = io.BytesIO(data)
+    if kind == 'pdf':
+        return extract_pdf_text(stream, max_pages, max_chars)
+    return extract_docx_text(stream, max_chars)
+
+
+class _Worker:
+    """
+    One extraction process (core.extraction_worker), checked out by a
+    single request at a time.
+    """
+
+    def __init__(self):
+        # Imported here so web workers that never see an upload skip multiprocessing
+        import subprocess
+        import sys
+        from multiprocessing.connection import Connection
+
+        # A fresh interpreter rather than fork: forking a multi-threaded web worker is not safe
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [_ROOT, os.environ.get('PYTHONPATH')])))
+        self.process = subprocess.Popen([sys.executable, '-m', 'core.extraction_worker'],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env)
+        self.requests = Connection(os.dup(self.process.stdin.fileno()), readable=False)
+        self.replies = Connection(os.dup(self.process.stdout.fileno()), writable=False)
+        self.process.stdin.close()
+        self.process.stdout.close()
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def kill(self):
+        self.process.kill()
+        self.process.wait(1)
+        self.requests.close()
+        self.replies.close()
+
+
+# Directory holding the core package, for the worker's import path
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_idle = []
+_workers_lock = threading.Lock()
+# At most WORKERS extractions (and processes) at once
+_slots = threading.BoundedSemaphore(WORKERS)
+
+
+def _checkout() -> _Worker:
+    with _workers_lock:
+        while _idle:
+            worker = _idle.pop()
+            if worker.alive():
+                return worker
+            worker.kill()
+    return _Worker()
+
+
+def _checkin(worker: _Worker):
+    with _workers_lock:
+        _idle.append(worker)
+
+
+def _run_isolated(func, args: tuple, timeout: float):
+    """
+    Runs func(*args) on a warm worker process that no other task shares
+    while it runs. On timeout or crash only that process is killed (the
+    next task starts a fresh one), so other extractions keep going.
+    Raises FutureTimeout, EOFError if the worker died, or RuntimeError for
+    an exception inside the worker.
+    """
+    deadline = time.monotonic() + timeout
+    if not _slots.acquire(timeout=timeout):
+        raise FutureTimeout()
+    try:
+        worker = _checkout()
+        try:
+            worker.requests.send((func, args))
+            if not worker.replies.poll(max(0.0, deadline - time.monotonic())):
+                raise FutureTimeout()
+            status, value = worker.replies.recv()
+        except BaseException:
+            worker.kill()
+            raise
+        _checkin(worker)
+    finally:
+        _slots.release()
+    if status == 'error':
+        raise RuntimeError(value)
+    return value
+
+
+def extract_text(file_stream, kind: str, max_pages: int = MAX_PAGES, max_chars: int = MAX_CHARS,
+                 timeout: float = TIMEOUT) -> str:
+    """
+    Extracts text from a 'pdf' or 'docx' upload on a worker process, so the
+    CPU-heavy parsing never runs in the request thread. Returns "" if the
+    document cannot be read within the timeout.
+    """
+    data = file_stream.read()
+    try:
+        return _run_isolated(_extract_worker, (data, kind, max_pages, max_chars), timeout)
+    except FutureTimeout:
+        print(f"Resume extraction timed out after {timeout}s")
+    except (EOFError, OSError):
+        print("Resume extraction worker crashed")
+    except Exception as e:
+        print(f"Error reading {kind.upper()}: {e}")
+    return ""
@@ -0,0 +1,39 @@
+"""
+Resume extraction worker process, started by core.extraction as
+
+    python -m core.extraction_worker
+
+It is a plain module rather than a multiprocessing child, so the worker
+never re-imports the parent's __main__ (app.py / run.py build the whole
+app at import time). Requests arrive as pickled (func, args) messages on
+stdin and replies go back on stdout, one task at a time.
+"""
+import os
+import sys
+from multiprocessing.connection import Connection
+
+
+def serve(requests: Connection, replies: Connection):
+    # Serves one task at a time until the parent closes the pipe
+    while True:
+        try:
+            func, args = requests.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            reply = ('ok', func(*args))
+        except Exception as e:
+            reply = ('error', f"{type(e).__name__}: {e}")
+        replies.send(reply)
+
+
+def main():
+    requests = Connection(os.dup(sys.stdin.fileno()), writable=False)
+    replies = Connection(os.dup(sys.stdout.fileno()), readable=False)
+    # Anything the task prints must not end up in the reply stream
+    sys.stdout = sys.stderr
+    serve(requests, replies)
+
+
+if __name__ == '__main__':
+    main()
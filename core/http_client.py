@@ -0,0 +1,156 @@
+import random
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.rate_limit import RateLimiter
+
+
+class AIClient:
+    """
+    Shared HTTP client for the OpenRouter API.
+    Keeps connections alive in a pool and retries transient failures
+    (429 and 5xx, timeouts, dropped connections) with jittered
+    exponential backoff that honors the Retry-After header.
+    Every attempt first goes through the client-side RateLimiter, so
+    throttling from the provider shrinks concurrency for all callers
+    sharing this client instead of each one retrying blindly. A streamed
+    response keeps its limiter slot until the caller closes it.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 16,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 20.0,
+                 connect_timeout: float = 5.0, read_timeout: float = 60.0,
+                 limiter: Optional[RateLimiter] = None, completion_tokens: int = 1500):
+        self.limiter = limiter or RateLimiter()
+        # Assumed completion size when reserving token budget before the response is known
+        self.completion_tokens = completion_tokens
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = (connect_timeout, read_timeout)
+
+        self.session = requests.Session()
+        # Retries are handled here so Retry-After and jitter apply uniformly
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              max_retries=0, pool_block=False)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def post(self, url: str, headers: dict = None, json: dict = None, **kwargs) -> requests.Response:
+        """
+        POST with retries. Returns the final response (raising for HTTP errors)
+        or re-raises the last connection/timeout error once retries run out.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        estimated_tokens = self._estimate_tokens(json)
+        attempt = 0
+        while True:
+            slot = self.limiter.acquire(estimated_tokens)
+            held = False
+            try:
+                try:
+                    response = self.session.post(url, headers=headers, json=json, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    slot.record(None)
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = self._backoff(attempt)
+                    response = None
+                else:
+                    slot.record(response.status_code, self._usage_tokens(response, kwargs.get("stream")))
+
+                if response is not None:
+                    if response.status_code not in self.RETRY_STATUSES or attempt >= self.max_retries:
+                        response.raise_for_status()
+                        if kwargs.get("stream"):
+                            # The generation is still running while the caller reads the body
+                            self._hold_until_closed(response, slot)
+                            held = True
+                        return response
+                    delay = self._backoff(attempt, response)
+                    print(f"OpenRouter returned {response.status_code}, retrying in {delay:.1f}s")
+                    response.close()
+            finally:
+                if not held:
+                    slot.release()
+
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _hold_until_closed(response: requests.Response, slot):
+        """Keeps the limiter slot until the streamed response is closed (or garbage collected)."""
+        close = response.close
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                slot.release()
+
+        response.close = close_and_release
+        weakref.finalize(response, slot.release)
+
+    def _estimate_tokens(self, body: Optional[dict]) -> int:
+        # Roughly four characters per token for the prompt, plus the expected completion
+        if not body:
+            return self.completion_tokens
+        chars = sum(len(str(m.get("content", ""))) for m in body.get("messages", []))
+        return chars // 4 + self.completion_tokens
+
+    @staticmethod
+    def _usage_tokens(response: requests.Response, stream) -> Optional[int]:
+        # Streamed bodies are consumed by the caller, so only plain responses are settled
+        if stream or response.status_code != 200:
+            return None
+        try:
+            return response.json().get("usage", {}).get("total_tokens")
+        except (ValueError, AttributeError):
+            return None
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        retry_after = self._retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        # Full jitter: uniform between 0 and the exponential ceiling
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> AIClient:
+    """Process-wide client used when a caller does not pass its own."""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = AIClient()
+    return _default_client
@@ -1,8 +1,84 @@
-from dataclasses import dataclass
+"""
+Result models shared by the web app, the CLI, caches and job queues.
+
+All models are slotted dataclasses. _model(..., frozen=True) makes one
+immutable, but frozen construction is about five times slower (every
+field goes through object.__setattr__), so the result models, which are
+rebuilt on every cache and queue load, stay mutable. Treat objects
+returned by the response cache as read-only; other requests share them.
+
+Two serialized forms, both versioned:
+
+* binary (dumps/loads): magic + version byte + a pickled (type, rows)
+  tuple of plain values. Rows are positional, so they carry no field
+  names, and unpickling only ever builds builtins, never classes.
+* JSON (to_json/from_json): the usual field dicts, via orjson when it
+  is installed. This is the form stored in readable columns and sent to
+  browsers.
+
+Positional rows decode as long as fields are only ever appended with a
+default. Renaming, removing or reordering a field needs FORMAT_VERSION
+bumped and a conversion in _upgrade().
+"""
+import io
+import json
+import pickle
+from dataclasses import dataclass, fields
+from operator import attrgetter
 from typing import Dict, List, Optional
 
-@dataclass
-class UserProfile:
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is the fallback
+    orjson = None
+
+FORMAT_VERSION = 1
+_MAGIC = b'RM'
+
+
+class Model:
+    __slots__ = ()
+    _type = None
+    _fields = ()
+    _getter = None
+
+    def to_dict(self) -> dict:
+        # Cheaper than dataclasses.asdict, which deep-copies every value
+        return {name: getattr(self, name) for name in self._fields}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        # Unknown keys (e.g. from a newer writer) are ignored
+        return cls(**{name: data[name] for name in cls._fields if name in data})
+
+    def to_row(self) -> tuple:
+        return self._getter(self)
+
+    @classmethod
+    def from_row(cls, row):
+        # Rows from before a field was appended get its default from __init__
+        return cls(*row)
+
+
+# Type name -> model class, for decoding
+MODELS = {}
+
+
+def _model(type_name: str, frozen: bool = False):
+    """Declares a slotted (optionally frozen) dataclass model under a stable type name."""
+    def wrap(cls):
+        cls = dataclass(slots=True, frozen=frozen)(cls)
+        cls._type = type_name
+        cls._fields = tuple(f.name for f in fields(cls))
+        getter = attrgetter(*cls._fields)
+        cls._getter = staticmethod(getter) if len(cls._fields) > 1 else staticmethod(lambda obj: (getter(obj),))
+        MODELS[type_name] = cls
+        return cls
+    return wrap
+
+
+@_model('profile')
+class UserProfile(Model):
     name: str
     age: int
     current_grade: str
@@ -15,8 +91,9 @@ class UserProfile:
     location_preference: str = "Any"
     budget_range: str = "Medium"
 
-@dataclass
-class CareerRecommendation:
+
+@_model('career')
+class CareerRecommendation(Model):
     career_title: str
     description: str
     required_skills: List[str]
@@ -25,12 +102,78 @@ class CareerRecommendation:
     salary_range: str
     growth_potential: str
 
-@dataclass
-class CollegeRecommendation:
+
+@_model('college')
+class CollegeRecommendation(Model):
     college_name: str
     location: str
     programs: List[str]
     ranking: str
     admission_requirements: str
     fees_range: str
-    notable_features: str
\ No newline at end of file
+    notable_features: str
+
+
+class _BuiltinsOnly(pickle.Unpickler):
+    # Rows hold only str/int/list/dict/None, which never reach find_class
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f'refusing to load {module}.{name}')
+
+
+def dumps(value) -> bytes:
+    """Binary form of one model or a list of models of the same type."""
+    many = isinstance(value, (list, tuple))
+    items = value if many else [value]
+    type_name = type(items[0])._type if items else ''
+    rows = [item.to_row() for item in items]
+    return _MAGIC + bytes([FORMAT_VERSION]) + pickle.dumps((type_name, many, rows), protocol=5)
+
+
+def loads(data: bytes):
+    """Inverse of dumps(); raises ValueError for data it cannot read."""
+    if data[:2] != _MAGIC or len(data) < 3:
+        raise ValueError('not a serialized model')
+    version = data[2]
+    if version > FORMAT_VERSION:
+        raise ValueError(f'model format version {version} is newer than {FORMAT_VERSION}')
+    try:
+        type_name, many, rows = _BuiltinsOnly(io.BytesIO(data[3:])).load()
+    except (pickle.UnpicklingError, EOFError, ValueError, TypeError) as e:
+        raise ValueError(f'corrupt model data: {e}') from e
+    if version < FORMAT_VERSION:
+        rows = _upgrade(type_name, version, rows)
+    if not rows:
+        return [] if many else None
+    if type_name not in MODELS:
+        raise ValueError(f'unknown model type {type_name!r}')
+    from_row = MODELS[type_name].from_row
+    items = [from_row(row) for row in rows]
+    return items if many else items[0]
+
+
+def _upgrade(type_name: str, version: int, rows: list) -> list:
+    # Convert rows written by older format versions here when FORMAT_VERSION is bumped
+    return rows
+
+
+def _default(value):
+    if isinstance(value, Model):
+        return value.to_dict()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def to_json(value) -> str:
+    """Compact JSON for models (and plain data holding them), as field dicts."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default).decode('utf-8')
+    return json.dumps(value, separators=(',', ':'), default=_default)
+
+
+def from_json(text, model=None):
+    """Parses JSON; with `model`, builds that model (or a list of them) from the field dicts."""
+    data = orjson.loads(text) if orjson is not None else json.loads(text)
+    if model is None:
+        return data
+    if isinstance(data, list):
+        return [model.from_dict(item) for item in data]
+    return model.from_dict(data)
@@ -0,0 +1,346 @@
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from core.models import CareerRecommendation, CollegeRecommendation
+
+# Compiled once at import; every parser shares them
+_KEY_CLEAN_RE = re.compile(r'[^a-z0-9\s]')
+_KEY_SPACE_RE = re.compile(r'\s+')
+_VALUE_STRIP = ' *_'
+
+# Unknown keys seen in responses are memoized up to this many per schema
+_MAX_MEMO_KEYS = 2048
+
+
+def normalize_key(key_raw: str) -> str:
+    """'**Required Skills**' -> 'required_skills'"""
+    return _KEY_SPACE_RE.sub('_', _KEY_CLEAN_RE.sub('', key_raw.lower()).strip())
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    One field of a section. `aliases` are extra keys matched exactly,
+    `keywords` are matched as substrings of unknown keys (defaults to the name).
+    """
+    name: str
+    aliases: Tuple[str, ...] = ()
+    keywords: Tuple[str, ...] = ()
+    is_list: bool = False
+    required: bool = False
+
+
+class SectionSchema:
+    """
+    Declares a numbered section type ("CAREER 1:", "COLLEGE 2:" ...) as a list
+    of fields. Keys are resolved with a dict lookup: names and aliases are
+    registered up front, and any other key is resolved once by substring
+    match against the keywords (in field order) and then memoized.
+    """
+
+    def __init__(self, header: str, model, fields: List[Field], limit: int):
+        self.header = header
+        self.model = model
+        self.fields = tuple(fields)
+        self.limit = limit
+        self.names = tuple(f.name for f in self.fields)
+        self.list_fields = frozenset(f.name for f in self.fields if f.is_list)
+        self.required = tuple(f.name for f in self.fields if f.required)
+        self.header_re = re.compile(
+            r'^[\s#*_>-]*' + header + r'\s*#?\s*\d+\s*[:.)\-]*[\s*_]*(.*)$',
+            re.IGNORECASE,
+        )
+        self._keywords = [(word, f.name) for f in self.fields for word in (f.keywords or (f.name,))]
+        self._lookup: Dict[str, Optional[str]] = {}
+        self._raw_lookup: Dict[str, Optional[str]] = {}
+        for f in self.fields:
+            for alias in (f.name,) + f.aliases:
+                self._lookup.setdefault(alias, f.name)
+
+    def field_for_raw(self, key_raw: str) -> Optional[str]:
+        """Resolves a key exactly as written in the response ('**Salary Range**')."""
+        try:
+            return self._raw_lookup[key_raw]
+        except KeyError:
+            pass
+        name = self.field_for(normalize_key(key_raw))
+        if len(self._raw_lookup) < _MAX_MEMO_KEYS:
+            self._raw_lookup[key_raw] = name
+        return name
+
+    def field_for(self, key: str) -> Optional[str]:
+        try:
+            return self._lookup[key]
+        except KeyError:
+            pass
+        name = next((name for word, name in self._keywords if word in key), None)
+        if len(self._lookup) < _MAX_MEMO_KEYS:
+            self._lookup[key] = name
+        return name
+
+    def empty(self) -> dict:
+        return {name: [] if name in self.list_fields else "" for name in self.names}
+
+    def from_mapping(self, raw: dict):
+        """
+        Builds an item from a JSON object, resolving its keys like response
+        labels. Returns None if the object is not usable (missing a required field).
+        """
+        if not isinstance(raw, dict):
+            return None
+        data = self.empty()
+        for key_raw, value in raw.items():
+            # JSON keys are snake_case ('career_title'), labels use spaces
+            field = self.field_for_raw(str(key_raw).replace('_', ' '))
+            if field is None or value is None:
+                continue
+            if field in self.list_fields:
+                items = value if isinstance(value, list) else str(value).split(',')
+                data[field] = [str(v).strip() for v in items if str(v).strip()]
+            else:
+                data[field] = (", ".join(map(str, value)) if isinstance(value, list) else str(value)).strip()
+        for name in self.required:
+            if not data[name]:
+                return None
+        return self.model(**data)
+
+    def json_schema(self) -> dict:
+        """JSON schema of a list of this section's items, for structured-output requests."""
+        properties = {
+            name: {"type": "array", "items": {"type": "string"}} if name in self.list_fields else {"type": "string"}
+            for name in self.names
+        }
+        return {
+            "type": "array",
+            "items": {"type": "object", "properties": properties,
+                      "required": list(self.names), "additionalProperties": False},
+        }
+
+
+CAREER_SCHEMA = SectionSchema(
+    header="CAREER",
+    model=CareerRecommendation,
+    limit=5,
+    fields=[
+        Field("career_title", aliases=("title",), required=True),
+        Field("description", required=True),
+        Field("required_skills", keywords=("skills",), is_list=True),
+        Field("education_path"),
+        Field("job_prospects"),
+        Field("salary_range"),
+        Field("growth_potential"),
+    ],
+)
+
+COLLEGE_SCHEMA = SectionSchema(
+    header="COLLEGE",
+    model=CollegeRecommendation,
+    limit=8,
+    fields=[
+        Field("college_name", aliases=("name",), required=True),
+        Field("location", required=True),
+        Field("programs", is_list=True),
+        Field("ranking"),
+        Field("admission_requirements"),
+        Field("fees_range"),
+        Field("notable_features"),
+    ],
+)
+
+
+class SectionParser:
+    """
+    Parses numbered sections out of a model response that arrives in chunks.
+    Each finished section is returned from feed() as soon as it closes, so
+    callers can show it before the rest of the response has arrived.
+    A section closes when the next header starts, when every field is
+    filled and a blank line follows, or on close(). Once `limit` items
+    (the schema's limit by default) are done the parser sets `done` and
+    ignores the rest.
+    """
+
+    schema: SectionSchema = None
+
+    def __init__(self, schema: SectionSchema = None, limit: Optional[int] = None):
+        if schema is not None:
+            self.schema = schema
+        self.limit = self.schema.limit if limit is None else limit
+        self._buffer = ""
+        self._data = None
+        self._current_field = None
+        self.items = []
+        self.done = False
+
+    def feed(self, chunk: str) -> list:
+        """Adds a chunk of text and returns the items completed by it."""
+        if self.done or not chunk:
+            return []
+        self._buffer += chunk
+        if '\n' not in chunk:
+            return []
+        *lines, self._buffer = self._buffer.split('\n')
+        finished = []
+        for line in lines:
+            item = self._handle_line(line)
+            if item is not None:
+                finished.append(item)
+                if self.done:
+                    break
+        return finished
+
+    def close(self) -> list:
+        """Flushes the last partial line and section; returns the items completed by it."""
+        finished = []
+        if not self.done:
+            if self._buffer:
+                item = self._handle_line(self._buffer)
+                if item is not None:
+                    finished.append(item)
+            self._buffer = ""
+            item = self._finish_section()
+            if item is not None:
+                finished.append(item)
+        return finished
+
+    def _handle_line(self, raw_line: str):
+        line = raw_line.strip()
+        if not line:
+            data = self._data
+            if data is not None and all(data.values()):
+                return self._finish_section()
+            return None
+
+        schema = self.schema
+        header = schema.header_re.match(line)
+        if header:
+            item = self._finish_section()
+            self._data = schema.empty()
+            # Some models put the title on the header line ("CAREER 1: Data Scientist")
+            rest = header.group(1).strip(_VALUE_STRIP)
+            if rest and ':' not in rest:
+                self._data[schema.names[0]] = rest
+            return item
+
+        data = self._data
+        if data is None:
+            return None
+
+        key_raw, sep, value = line.partition(':')
+        if sep:
+            field = schema.field_for_raw(key_raw)
+            if field is not None:
+                value = value.strip(_VALUE_STRIP)
+                if field in schema.list_fields:
+                    data[field] = [s.strip() for s in value.split(',')]
+                else:
+                    data[field] = value
+                self._current_field = field
+                return None
+
+        field = self._current_field
+        if field is not None and field not in schema.list_fields:
+            data[field] += ' ' + line
+        return None
+
+    def _finish_section(self):
+        data, self._data, self._current_field = self._data, None, None
+        if data is None:
+            return None
+        for name in self.schema.required:
+            if not data[name]:
+                return None
+        item = self.schema.model(**data)
+        self.items.append(item)
+        if len(self.items) >= self.limit:
+            self.done = True
+        return item
+
+
+class CareerResponseParser(SectionParser):
+    schema = CAREER_SCHEMA
+
+
+class CollegeResponseParser(SectionParser):
+    schema = COLLEGE_SCHEMA
+
+
+def parse_all(parser: SectionParser, text: str) -> List:
+    """Runs a whole response through an incremental parser."""
+    parser.feed(text)
+    parser.close()
+    return parser.items
+
+
+ROADMAP_PHASE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "period": {"type": "string"},
+        "objective": {"type": "string"},
+        "action_items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"category": {"type": "string"}, "task": {"type": "string"}},
+                "required": ["category", "task"],
+                "additionalProperties": False,
+            },
+        },
+        "milestones": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["title", "period", "objective", "action_items", "milestones"],
+    "additionalProperties": False,
+}
+
+# Structured-output request format for combined generation (careers, colleges and roadmap at once)
+COMBINED_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "career_guidance",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "careers": CAREER_SCHEMA.json_schema(),
+                "colleges": COLLEGE_SCHEMA.json_schema(),
+                "roadmap": {"type": "array", "items": ROADMAP_PHASE_SCHEMA},
+            },
+            "required": ["careers", "colleges", "roadmap"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def _valid_phase(phase) -> bool:
+    return (isinstance(phase, dict) and isinstance(phase.get("title"), str) and phase["title"].strip()
+            and isinstance(phase.get("action_items", []), list) and isinstance(phase.get("milestones", []), list))
+
+
+def parse_combined(text: str) -> Dict[str, Optional[list]]:
+    """
+    Parses and validates a combined JSON response section by section.
+    Each of 'careers', 'colleges' and 'roadmap' is the parsed list, or None
+    when that section is missing or invalid, so the caller can regenerate
+    just the sections that failed. Raises ValueError if the text is not a JSON object.
+    """
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("combined response is not a JSON object")
+
+    sections = {}
+    for name, schema in (("careers", CAREER_SCHEMA), ("colleges", COLLEGE_SCHEMA)):
+        raw = data.get(name)
+        items = [schema.from_mapping(obj) for obj in raw[:schema.limit]] if isinstance(raw, list) else []
+        # One malformed item invalidates the section rather than silently shortening it
+        sections[name] = items if items and all(items) else None
+
+    phases = data.get("roadmap")
+    sections["roadmap"] = phases if isinstance(phases, list) and phases and all(map(_valid_phase, phases)) else None
+    return sections
@@ -0,0 +1,107 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+import time
+
+
+@dataclass
+class Stage:
+    """A single step of the generation pipeline and the stages it waits for."""
+    name: str
+    func: Callable[..., Any]
+    depends_on: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    default: Any = None
+
+
+@dataclass
+class PipelineResult:
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def run_pipeline(stages, max_workers: int = 2) -> PipelineResult:
+    """
+    Runs a small dependency graph of stages on a bounded thread pool.
+    Each stage function receives the results of its dependencies as keyword
+    arguments. A stage that fails or exceeds its timeout gets its default
+    value, so the remaining stages still produce partial results.
+    """
+    stages = {stage.name: stage for stage in stages}
+    for stage in stages.values():
+        for dep in stage.depends_on:
+            if dep not in stages:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+    outcome = PipelineResult()
+    pending = dict(stages)
+    running = {}
+    deadlines = {}
+
+    def finish(name, value, error=None):
+        stage = stages[name]
+        outcome.results[name] = value if error is None else stage.default
+        if error is not None:
+            outcome.errors[name] = error
+            print(f"Pipeline stage '{name}' failed: {error}")
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline")
+    try:
+        while pending or running:
+            # Submit every stage whose dependencies have all completed
+            progressed = False
+            for name in list(pending):
+                stage = pending[name]
+                failed = [dep for dep in stage.depends_on if dep in outcome.errors]
+                if failed:
+                    del pending[name]
+                    finish(name, None, error=f"skipped because {', '.join(failed)} failed")
+                    progressed = True
+                    continue
+                if all(dep in outcome.results for dep in stage.depends_on):
+                    kwargs = {dep: outcome.results[dep] for dep in stage.depends_on}
+                    started = time.monotonic()
+                    future = executor.submit(stage.func, **kwargs)
+                    running[future] = (name, started)
+                    if stage.timeout is not None:
+                        deadlines[future] = started + stage.timeout
+                    del pending[name]
+                    progressed = True
+
+            if not running:
+                if progressed:
+                    continue
+                break
+
+            wait_for = None
+            if deadlines:
+                wait_for = max(0.0, min(deadlines.values()) - time.monotonic())
+            done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name, started = running.pop(future)
+                deadlines.pop(future, None)
+                outcome.timings[name] = time.monotonic() - started
+                try:
+                    finish(name, future.result())
+                except Exception as e:
+                    finish(name, None, error=str(e) or e.__class__.__name__)
+
+            now = time.monotonic()
+            for future, deadline in list(deadlines.items()):
+                if deadline <= now and future in running:
+                    name, started = running.pop(future)
+                    del deadlines[future]
+                    future.cancel()
+                    outcome.timings[name] = now - started
+                    finish(name, None, error=f"timed out after {stages[name].timeout}s")
+    finally:
+        # Do not block the caller on stages that already timed out
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return outcome
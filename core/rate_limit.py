@@ -0,0 +1,165 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import requests
+
+
+class RateLimitTimeout(requests.exceptions.Timeout):
+    """Raised when a request waited too long for the client-side rate limiter."""
+
+
+class TokenBucket:
+    """
+    Refills `rate_per_minute` units per minute up to `capacity` (one
+    minute's worth by default). acquire() blocks until enough units exist.
+    adjust() settles the difference once the real cost is known, which
+    may leave the bucket in debt for a while.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1, timeout: Optional[float] = None) -> bool:
+        # A request bigger than the whole bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return True
+                wait = (amount - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def adjust(self, delta: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= delta
+
+
+class AIMDConcurrency:
+    """
+    Adaptive concurrency limit: additive increase (about +1 per limit's
+    worth of successes) and multiplicative decrease on throttling or server
+    errors, at most once per `cooldown` seconds so one burst of 429s only
+    halves the limit once.
+    """
+
+    def __init__(self, initial: float = 4, minimum: float = 1, maximum: float = 32,
+                 decrease_factor: float = 0.5, cooldown: float = 2.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            ok = self._cond.wait_for(lambda: self.in_flight < int(self.limit), timeout=timeout)
+            if ok:
+                self.in_flight += 1
+            return ok
+
+    def release(self, throttled: bool = False, succeeded: bool = True):
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+            elif succeeded:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+class RateLimiter:
+    """
+    Client-side limiter shared by every AI request: request and token
+    budgets per minute, plus an AIMD concurrency limit that backs off when
+    the provider answers 429/5xx and ramps back up on success.
+    """
+
+    THROTTLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 concurrency: Optional[AIMDConcurrency] = None, acquire_timeout: float = 120.0):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = concurrency or AIMDConcurrency()
+        self.acquire_timeout = acquire_timeout
+
+    def acquire(self, estimated_tokens: float = 0) -> 'Slot':
+        """
+        Waits for budget and a concurrency slot and returns the Slot. The
+        caller reports the response on it and must release() it, which may
+        happen later than the request returns (e.g. after a streamed body).
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        if self.requests and not self.requests.acquire(1, timeout=self.acquire_timeout):
+            raise RateLimitTimeout("Timed out waiting for the request rate limit")
+        if self.tokens and estimated_tokens and not self.tokens.acquire(
+                estimated_tokens, timeout=max(0.0, deadline - time.monotonic())):
+            raise RateLimitTimeout("Timed out waiting for the token rate limit")
+        if not self.concurrency.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise RateLimitTimeout("Timed out waiting for a free request slot")
+
+        return Slot(self, estimated_tokens)
+
+    @contextmanager
+    def slot(self, estimated_tokens: float = 0):
+        """acquire() as a context manager that releases the slot on exit."""
+        slot = self.acquire(estimated_tokens)
+        try:
+            yield slot
+        finally:
+            slot.release()
+
+    def settle_tokens(self, estimated: float, actual: float):
+        if self.tokens and actual:
+            self.tokens.adjust(actual - estimated)
+
+
+class Slot:
+    def __init__(self, limiter: RateLimiter, estimated_tokens: float):
+        self._limiter = limiter
+        self._estimated = estimated_tokens
+        self.throttled = False
+        self.succeeded = False
+        self._released = False
+        self._lock = threading.Lock()
+
+    def record(self, status_code: Optional[int], tokens_used: Optional[float] = None):
+        """status_code None means the request failed without a response (timeout, reset)."""
+        self.throttled = status_code is None or status_code in RateLimiter.THROTTLE_STATUSES
+        self.succeeded = status_code is not None and status_code < 400
+        if tokens_used:
+            self._limiter.settle_tokens(self._estimated, tokens_used)
+
+    def release(self):
+        """Frees the concurrency slot; only the first call counts."""
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._limiter.concurrency.release(throttled=self.throttled, succeeded=self.succeeded)
@@ -1,22 +1,138 @@
-from flask import request, jsonify
-from app.models import UserProfile, CareerRecommendation, CollegeRecommendation
-from core.utils import make_ai_request, parse_career_response, parse_college_response
-from typing import List
+from core.models import UserProfile, CareerRecommendation, CollegeRecommendation
+from core.utils import make_ai_request, stream_ai_request, parse_career_response, parse_college_response, parse_roadmap_response, parse_combined_response
+from core.pipeline import Stage, run_pipeline
+from core.cache import ResponseCache, make_cache_key
+from core.parsers import CareerResponseParser, CollegeResponseParser, COMBINED_RESPONSE_FORMAT
+from core.singleflight import SingleFlight
+from typing import Callable, List, Optional, TYPE_CHECKING
+import queue
+import threading
+
+if TYPE_CHECKING:
+    from core.http_client import AIClient
 
 class CareerRecommendationSystem:
     
-    def __init__(self, api_key: str, model: str = "google/gemini-2.0-flash-001"):
+    def __init__(self, api_key: str, model: str = "google/gemini-2.0-flash-001",
+                 pipeline_workers: int = 2, stage_timeout: float = 90,
+                 client: 'AIClient' = None, cache: ResponseCache = None, combined: bool = False):
         self.api_key = api_key
         self.base_url = "https://openrouter.ai/api/v1/chat/completions"
         self.model = model
+        self.pipeline_workers = pipeline_workers
+        self.stage_timeout = stage_timeout
+        # Pooled keep-alive client; defaults to the one shared by the whole process
+        if client is None:
+            from core.http_client import get_default_client
+            client = get_default_client()
+        self.client = client
+        self.cache = cache
+        # Ask for all three sections in one structured response before falling back to separate calls
+        self.combined = combined
+        # Identical generations in flight at the same time share one upstream call
+        self._flights = SingleFlight()
+
+    def _generate(self, kind: str, fields: dict, prompt: str, parse, on_item: Optional[Callable] = None,
+                  parser_class=None):
+        """
+        Sends the prompt and parses the response, going through the cache
+        (when configured) keyed on the profile fields the prompt uses.
+        Empty results are never cached so failures are retried next time.
+        Concurrent identical requests share a single upstream call.
+        With on_item the response is streamed and each parsed item is
+        passed to the callback. If an incremental parser_class is given,
+        items are reported as soon as their block closes and the upstream
+        request is cancelled once the parser has all the items it needs.
+        """
+        key = make_cache_key(kind, self.model, fields)
+        if self.cache is not None:
+            cached = self.cache.get(kind, key)
+            if cached is not None:
+                if on_item:
+                    for item in cached:
+                        on_item(item)
+                return cached
+
+        def fetch(publish):
+            if on_item and parser_class is not None:
+                result = self._stream_parsed(prompt, parser_class(), publish)
+            else:
+                if on_item:
+                    response_text = "".join(stream_ai_request(self.api_key, self.base_url, prompt, self.model, client=self.client))
+                else:
+                    response_text = make_ai_request(self.api_key, self.base_url, prompt, self.model, client=self.client)
+                result = parse(response_text) if response_text else []
+                for item in result:
+                    publish(item)
+
+            if self.cache is not None and result:
+                self.cache.set(kind, key, result)
+            return result
+
+        return self._flights.do(key, fetch, on_item)
     
-    def generate_career_recommendations(self, user_profile: UserProfile) -> List[CareerRecommendation]:
+    def _stream_parsed(self, prompt: str, parser, on_item: Callable) -> list:
+        chunks = stream_ai_request(self.api_key, self.base_url, prompt, self.model, client=self.client)
+        try:
+            for chunk in chunks:
+                for item in parser.feed(chunk):
+                    on_item(item)
+                if parser.done:
+                    # Everything we need has arrived, stop paying for the rest
+                    break
+        finally:
+            chunks.close()
+        for item in parser.close():
+            on_item(item)
+        return parser.items
+
+    @staticmethod
+    def _career_fields(user_profile: UserProfile) -> dict:
+        # Every profile field the career and combined prompts show, and nothing
+        # else: neither prompt includes the name, so students share cached careers
+        return {
+            "age": user_profile.age,
+            "current_grade": user_profile.current_grade,
+            "academic_subjects": user_profile.academic_subjects,
+            "grades": user_profile.grades,
+            "interests": user_profile.interests,
+            "hobbies": user_profile.hobbies,
+            "preferred_work_environment": user_profile.preferred_work_environment,
+            "career_goals": user_profile.career_goals or "",
+            "location_preference": user_profile.location_preference,
+            "budget_range": user_profile.budget_range,
+        }
+
+    @staticmethod
+    def _college_fields(user_profile: UserProfile, career_recommendations: List[CareerRecommendation]) -> dict:
+        return {
+            "current_grade": user_profile.current_grade,
+            "academic_subjects": user_profile.academic_subjects,
+            "grades": user_profile.grades,
+            "location_preference": user_profile.location_preference,
+            "budget_range": user_profile.budget_range,
+            # Order matters here: the top careers drive the college choice
+            "career_titles": " | ".join(career.career_title for career in career_recommendations[:3]),
+        }
+
+    @staticmethod
+    def _roadmap_fields(user_profile: UserProfile, career_recommendations: List[CareerRecommendation]) -> dict:
+        # The roadmap is written for the student by name, so the name is part of the key
+        return {
+            "name": user_profile.name,
+            "current_grade": user_profile.current_grade,
+            "age": user_profile.age,
+            "grades": user_profile.grades,
+            "interests": user_profile.interests,
+            "career_titles": " | ".join(career.career_title for career in career_recommendations[:3]),
+        }
+
+    def generate_career_recommendations(self, user_profile: UserProfile, on_item: Optional[Callable] = None) -> List[CareerRecommendation]:
         
         prompt = f"""
         Based on the following student profile, provide 5 personalized career recommendations:
 
         Student Profile:
-        - Name: {user_profile.name}
         - Age: {user_profile.age}
         - Current Grade: {user_profile.current_grade}
         - Academic Subjects: {', '.join(user_profile.academic_subjects)}
@@ -44,12 +160,9 @@ class CareerRecommendationSystem:
         Continue for 5 careers total.
         """
         
-        response_text = make_ai_request(self.api_key, self.base_url, prompt, self.model)
-        if response_text:
-            return parse_career_response(response_text)
-        return []
+        return self._generate("careers", self._career_fields(user_profile), prompt, parse_career_response, on_item, CareerResponseParser)
     
-    def generate_college_recommendations(self, user_profile: UserProfile, career_recommendations: List[CareerRecommendation]) -> List[CollegeRecommendation]:
+    def generate_college_recommendations(self, user_profile: UserProfile, career_recommendations: List[CareerRecommendation], on_item: Optional[Callable] = None) -> List[CollegeRecommendation]:
         
         career_titles = [career.career_title for career in career_recommendations[:3]]
         
@@ -82,12 +195,10 @@ class CareerRecommendationSystem:
         Continue for 8 colleges total. Focus on institutions that are accessible based on current academic performance and aligned with location/budget preferences.
         """
         
-        response_text = make_ai_request(self.api_key, self.base_url, prompt, self.model)
-        if response_text:
-            return parse_college_response(response_text)
-        return []
+        fields = self._college_fields(user_profile, career_recommendations)
+        return self._generate("colleges", fields, prompt, parse_college_response, on_item, CollegeResponseParser)
     
-    def generate_roadmap(self, user_profile: UserProfile, career_recommendations: List[CareerRecommendation]) -> List[dict]:
+    def generate_roadmap(self, user_profile: UserProfile, career_recommendations: List[CareerRecommendation], on_item: Optional[Callable] = None) -> List[dict]:
         
         prompt = f"""
         Create a detailed 5-year roadmap for {user_profile.name} based on their profile and career recommendations.
@@ -131,24 +242,166 @@ class CareerRecommendationSystem:
         - Certification/course recommendations
         """
         
-        response_text = make_ai_request(self.api_key, self.base_url, prompt, self.model)
-        
-        if response_text:
+        fields = self._roadmap_fields(user_profile, career_recommendations)
+        return self._generate("roadmap", fields, prompt, parse_roadmap_response, on_item)
+    
+    def generate_combined(self, user_profile: UserProfile) -> dict:
+        """
+        Asks for careers, colleges and roadmap in a single structured JSON
+        response, sharing one copy of the profile across all three.
+        Returns a dict with each section's items, or None for a section
+        that was missing or failed validation (every section on request
+        failure, or when the careers failed, since the other two sections
+        depend on them). Valid sections are cached under the same keys the
+        separate calls use, so later submissions hit them either way.
+        """
+        empty = {"careers": None, "colleges": None, "roadmap": None}
+        career_key = make_cache_key("careers", self.model, self._career_fields(user_profile))
+        # Cached careers mean the separate calls are likely cached too; let them answer
+        if self.cache is not None and self.cache.get("careers", career_key) is not None:
+            return empty
+
+        prompt = f"""
+        Based on the following student profile, provide personalized career guidance.
+
+        Student Profile:
+        - Age: {user_profile.age}
+        - Current Grade: {user_profile.current_grade}
+        - Academic Subjects: {', '.join(user_profile.academic_subjects)}
+        - Grades: {', '.join([f"{subject}: {grade}" for subject, grade in user_profile.grades.items()])}
+        - Interests: {', '.join(user_profile.interests)}
+        - Hobbies: {', '.join(user_profile.hobbies)}
+        - Preferred Work Environment: {user_profile.preferred_work_environment}
+        - Career Goals: {user_profile.career_goals or 'Not specified'}
+        - Location Preference: {user_profile.location_preference}
+        - Budget Range: {user_profile.budget_range}
+
+        Return a single JSON object ONLY, with no preamble or markdown formatting, with three keys:
+
+        "careers": 5 career recommendations, each with career_title, description (2-3 sentences),
+        required_skills (5 skills), education_path (degrees and certifications), job_prospects
+        (current market demand), salary_range (approximate figures) and growth_potential.
+
+        "colleges": 8 colleges/universities for the top 3 careers above, each with college_name,
+        location (City, Country), programs, ranking (approximate ranking or tier),
+        admission_requirements, fees_range (approximate annual fees) and notable_features
+        (2-3 key highlights). Focus on institutions that are accessible based on current academic
+        performance and aligned with location/budget preferences.
+
+        "roadmap": a 5-year roadmap for the top 3 careers as 4 phases: IMMEDIATE STEPS (Next 6 months),
+        SHORT-TERM GOALS (6 months - 2 years), MEDIUM-TERM GOALS (2-4 years) and LONG-TERM VISION
+        (4-5 years). Each phase has title, period, objective, action_items (objects with category,
+        e.g. Academic/Skill/Extracurricular/Networking/Certification, and a specific task) and milestones.
+        """
+
+        # The combined prompt shows exactly the career fields, so its careers are safe to cache under career_key
+        key = make_cache_key("combined", self.model, self._career_fields(user_profile))
+
+        def fetch(publish):
+            response_text = make_ai_request(self.api_key, self.base_url, prompt, self.model,
+                                            client=self.client, response_format=COMBINED_RESPONSE_FORMAT)
+            return parse_combined_response(response_text) if response_text else empty
+
+        try:
+            sections = self._flights.do(key, fetch)
+        except Exception as e:
+            print(f"Combined generation failed: {e}")
+            return empty
+
+        if sections["careers"] is None:
+            # Its colleges and roadmap were written for those careers, not the ones generated instead
+            return empty
+
+        if self.cache is not None:
+            careers = sections["careers"]
+            if careers:
+                self.cache.set("careers", career_key, careers)
+                for kind, fields_for in (("colleges", self._college_fields), ("roadmap", self._roadmap_fields)):
+                    if sections[kind]:
+                        self.cache.set(kind, make_cache_key(kind, self.model, fields_for(user_profile, careers)),
+                                       sections[kind])
+        return sections
+
+    def generate_all(self, user_profile: UserProfile, on_event: Optional[Callable] = None) -> dict:
+        """
+        Pipeline mode: generates careers first, then colleges and roadmap
+        concurrently since both only depend on the career list.
+        Returns a dict with 'careers', 'colleges', 'roadmap' and 'errors'.
+        A failed or timed out stage yields an empty result instead of
+        failing the whole submission.
+        With on_event(event, item) the responses are streamed and every
+        career, college and roadmap phase is reported as soon as it is parsed.
+        In combined mode one structured call is tried first and only the
+        sections it got wrong are generated separately; its items are
+        reported once the whole response has been validated.
+        """
+        def callback(event):
+            return (lambda item: on_event(event, item)) if on_event else None
+
+        combined = self.generate_combined(user_profile) if self.combined else {}
+
+        def section(name, event, generate):
+            # Combined-mode sections that validated are used as is; the rest take the separate call
+            def run(*args):
+                items = combined.get(name)
+                if items is None:
+                    return generate(*args)
+                if on_event:
+                    for item in items:
+                        on_event(event, item)
+                return items
+            return run
+
+        careers = section("careers", "career",
+                          lambda: self.generate_career_recommendations(user_profile, callback("career")))
+        colleges = section("colleges", "college",
+                           lambda careers: self.generate_college_recommendations(user_profile, careers, callback("college")))
+        roadmap = section("roadmap", "phase",
+                          lambda careers: self.generate_roadmap(user_profile, careers, callback("phase")))
+        stages = [
+            Stage("careers", lambda: careers(), timeout=self.stage_timeout, default=[]),
+            Stage("colleges", lambda careers: colleges(careers),
+                  depends_on=("careers",), timeout=self.stage_timeout, default=[]),
+            Stage("roadmap", lambda careers: roadmap(careers),
+                  depends_on=("careers",), timeout=self.stage_timeout, default=[]),
+        ]
+        outcome = run_pipeline(stages, max_workers=self.pipeline_workers)
+        return {
+            "careers": outcome.results["careers"],
+            "colleges": outcome.results["colleges"],
+            "roadmap": outcome.results["roadmap"],
+            "errors": outcome.errors,
+        }
+
+    def stream_all(self, user_profile: UserProfile, on_done: Optional[Callable] = None):
+        """
+        Generator version of generate_all for streaming responses.
+        Yields (event, item) tuples: 'career', 'college' and 'phase' for each
+        parsed item, then a final ('done', results) with the full results.
+        on_done(results) runs on the generating thread once everything is
+        done, even if the consumer stopped reading (e.g. the tab was closed).
+        """
+        events = queue.Queue()
+
+        def run():
             try:
-                clean_json = response_text.strip()
-                if clean_json.startswith("```json"):
-                    clean_json = clean_json[7:-3].strip()
-                elif clean_json.startswith("```"):
-                    clean_json = clean_json[3:-3].strip()
-                
-                import json
-                return json.loads(clean_json)
+                results = self.generate_all(user_profile, on_event=lambda event, item: events.put((event, item)))
             except Exception as e:
-                print(f"Error parsing roadmap JSON: {e}")
-                print(f"Raw response: {response_text[:200]}...")
-        
-        return []
-    
+                results = {"careers": [], "colleges": [], "roadmap": [], "errors": {"pipeline": str(e)}}
+            if on_done:
+                try:
+                    on_done(results)
+                except Exception as e:
+                    print(f"Error finishing streamed generation: {e}")
+            events.put(("done", results))
+
+        threading.Thread(target=run, name="stream-pipeline", daemon=True).start()
+        while True:
+            event, item = events.get()
+            yield event, item
+            if event == "done":
+                return
+
     def display_career_recommendations(self, careers: List[CareerRecommendation]):
         print("\n" + "="*60)
         print("CAREER RECOMMENDATIONS")
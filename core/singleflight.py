@@ -0,0 +1,81 @@
+import threading
+from typing import Callable, Dict, Optional
+
+
+class _Call:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.items = []
+        self.done = False
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight call.
+    The first caller (the leader) runs the function; callers arriving while
+    it runs wait and receive the same result, or the same exception.
+    The function gets a `publish(item)` callback: items it publishes are
+    forwarded to the leader's and every follower's on_item as they arrive,
+    so streaming callers still see results progressively.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable, on_item: Optional[Callable] = None):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if leader:
+            return self._lead(key, call, fn, on_item)
+        return self._follow(call, on_item)
+
+    def _lead(self, key, call, fn, on_item):
+        def publish(item):
+            with call.cond:
+                call.items.append(item)
+                call.cond.notify_all()
+            if on_item:
+                on_item(item)
+
+        try:
+            call.result = fn(publish)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            with call.cond:
+                call.done = True
+                call.cond.notify_all()
+        return call.result
+
+    @staticmethod
+    def _follow(call, on_item):
+        sent = 0
+        while True:
+            with call.cond:
+                while sent == len(call.items) and not call.done:
+                    call.cond.wait()
+                pending = call.items[sent:]
+                finished = call.done
+            sent += len(pending)
+            if on_item:
+                for item in pending:
+                    on_item(item)
+            if finished:
+                break
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
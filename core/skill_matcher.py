@@ -0,0 +1,139 @@
+import json
+import os
+import re
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'taxonomy.json')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Lower-cases and collapses whitespace (PDF text often breaks phrases across lines)."""
+    return _WHITESPACE_RE.sub(' ', text.lower())
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a set of phrases, each mapped to a label.
+    A single pass over the text finds every phrase regardless of how many
+    there are, and matches only count on word boundaries, so "java" does
+    not match inside "javascript" and "git" does not match inside "digital".
+    """
+
+    def __init__(self, phrases: Dict[str, str]):
+        # Trie as parallel lists: goto[state][char] -> state, output[state] -> [(length, label)]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[tuple]] = [[]]
+        for phrase, label in phrases.items():
+            phrase = normalize_text(phrase).strip()
+            if phrase:
+                self._add(phrase, label)
+        self._build_failure_links()
+
+    def _add(self, phrase: str, label: str):
+        state = 0
+        for ch in phrase:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append((len(phrase), label))
+
+    def _build_failure_links(self):
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for ch, nxt in self._goto[state].items():
+                pending.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Inherit the outputs of the suffix state so no match is missed
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def find(self, text: str) -> List[str]:
+        """Returns the labels found in the text, in order of first appearance."""
+        text = normalize_text(text)
+        goto, fail, output = self._goto, self._fail, self._output
+        found = {}
+        state = 0
+        last = len(text) - 1
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            # The character after the match must not continue a word
+            if i < last and _is_word_char(ch) and _is_word_char(text[i + 1]):
+                continue
+            for length, label in output[state]:
+                start = i - length + 1
+                if label in found:
+                    continue
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                found[label] = start
+        return sorted(found, key=found.get)
+
+
+class ResumeMatcher:
+    """Skill and education matchers built from a taxonomy data file."""
+
+    def __init__(self, taxonomy: dict):
+        self.version = taxonomy.get('version')
+        self.skills = KeywordMatcher(self._phrases(taxonomy.get('skills', {})))
+        self.education = KeywordMatcher(self._phrases(taxonomy.get('education', {})))
+
+    @staticmethod
+    def _phrases(entries: Dict[str, List[str]]) -> Dict[str, str]:
+        phrases = {}
+        for canonical, aliases in entries.items():
+            for phrase in [canonical] + list(aliases):
+                phrases.setdefault(normalize_text(phrase).strip(), canonical)
+        return phrases
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ResumeMatcher':
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def match(self, text: str) -> dict:
+        return {
+            "skills": self.skills.find(text),
+            "education": self.education.find(text),
+        }
+
+
+_matchers: Dict[str, ResumeMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_resume_matcher(path: Optional[str] = None) -> ResumeMatcher:
+    """
+    Returns the matcher for a taxonomy file, building it once per process.
+    The path defaults to $SKILL_TAXONOMY_PATH, then the bundled taxonomy.
+    """
+    path = path or os.environ.get('SKILL_TAXONOMY_PATH') or DEFAULT_TAXONOMY_PATH
+    matcher = _matchers.get(path)
+    if matcher is None:
+        with _matchers_lock:
+            matcher = _matchers.get(path)
+            if matcher is None:
+                matcher = ResumeMatcher.from_file(path)
+                _matchers[path] = matcher
+    return matcher
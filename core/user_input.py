@@ -1,4 +1,4 @@
-from app.models import UserProfile
+from core.models import UserProfile
 
 def create_user_profile(form_data):
     grades_raw = form_data['grades']
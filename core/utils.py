@@ -1,41 +1,58 @@
-import requests
 import json
-import pypdf
-import docx
-import io
-from typing import List, Dict
-from app.models import CareerRecommendation, CollegeRecommendation, UserProfile
+from typing import List, Dict, Optional, TYPE_CHECKING
+from core.models import CareerRecommendation, CollegeRecommendation
+from core.archive import get_response_archive
+from core.parsers import CareerResponseParser, CollegeResponseParser, parse_all, parse_combined
+from core.skill_matcher import get_resume_matcher
+from core.extraction import extract_text, extract_pdf_text, extract_docx_text
+
+if TYPE_CHECKING:
+    from core.http_client import AIClient
+
+def _request_headers(api_key: str) -> dict:
+    return {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {api_key}",
+        "HTTP-Referer": "https://github.com/KushalZambare/SkillSphere", 
+        "X-Title": "SkillSphere Career Guidance", 
+    }
+
+def _request_body(prompt: str, model: str, stream: bool = False, response_format: dict = None) -> dict:
+    data = {
+        "model": model,
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    }
+    if stream:
+        data["stream"] = True
+    if response_format:
+        data["response_format"] = response_format
+    return data
+
+def make_ai_request(api_key: str, url: str, prompt: str, model: str = "google/gemini-2.0-flash-001",
+                    client: 'AIClient' = None, response_format: dict = None) -> str:
+    """
+    Sends a prompt to the chat completions API and returns the message text.
+    Uses the given pooled client (or the shared default one), which retries
+    transient failures before we give up and return an empty string.
+    response_format is passed through for structured (JSON schema) output.
+    """
+    # The HTTP stack is only imported once the first request is made
+    import requests
+    from core.http_client import get_default_client
 
-def make_ai_request(api_key: str, url: str, prompt: str, model: str = "google/gemini-2.0-flash-001") -> str:
-  
+    client = client or get_default_client()
     try:
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-            "HTTP-Referer": "https://github.com/KushalZambare/SkillSphere", 
-            "X-Title": "SkillSphere Career Guidance", 
-        }
-        
-        data = {
-            "model": model,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        }
-        
-        response = requests.post(url, headers=headers, json=data, timeout=60)
-        response.raise_for_status()
+        response = client.post(url, headers=_request_headers(api_key),
+                               json=_request_body(prompt, model, response_format=response_format))
         
         result = response.json()
-        
-        # DEBUG LOGGING
-        with open("raw_api_response.log", "a", encoding="utf-8") as f:
-            f.write("=== NEW REQUEST ===\n")
-            f.write(json.dumps(result, indent=2))
-            f.write("\n\n")
+        # Handed to a background writer; never blocks the request
+        get_response_archive().record(prompt, model, result)
             
         if "choices" in result and len(result["choices"]) > 0:
             return result["choices"][0]["message"]["content"]
@@ -45,7 +62,7 @@ def make_ai_request(api_key: str, url: str, prompt: str, model: str = "google/ge
         
     except requests.exceptions.HTTPError as e:
         print(f"HTTP Error: {e}")
-        if hasattr(e, 'response') and e.response:
+        if getattr(e, 'response', None) is not None:
             print(f"Response status: {e.response.status_code}")
             try:
                 error_data = e.response.json()
@@ -63,212 +80,118 @@ def make_ai_request(api_key: str, url: str, prompt: str, model: str = "google/ge
         print(f"Error making AI request: {e}")
         return ""
 
-def parse_career_response(response_text: str) -> List[CareerRecommendation]:
-    import re
-    careers = []
+def stream_ai_request(api_key: str, url: str, prompt: str, model: str = "google/gemini-2.0-flash-001",
+                      client: 'AIClient' = None):
+    """
+    Streaming variant of make_ai_request: yields the message text in chunks
+    as the API sends them (server-sent events with stream=True).
+    Errors are reported like make_ai_request and simply end the stream.
+    Closing the generator closes the upstream connection.
+    """
+    import requests
+    from core.http_client import get_default_client
+
+    client = client or get_default_client()
+    response = None
+    received = []
     try:
-        # Case-insensitive split on CAREER [digit]:
-        sections = re.split(r'(?i)CAREER\s*\d*[:\s-]*', response_text)
-        
-        for section in sections[1:]:
-            lines = section.strip().split('\n')
-            career_data = {
-                "career_title": "",
-                "description": "",
-                "required_skills": [],
-                "education_path": "",
-                "job_prospects": "",
-                "salary_range": "",
-                "growth_potential": ""
-            }
-            
-            current_field = None
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                if ':' in line:
-                    key_raw, value = line.split(':', 1)
-                    key = re.sub(r'[^a-z0-9\s]', '', key_raw.lower()).strip().replace(' ', '_')
-                    value = value.strip()
-                    
-                    if 'career_title' in key:
-                        career_data['career_title'] = value
-                    elif 'description' in key:
-                        career_data['description'] = value
-                    elif 'required_skills' in key or 'skills' in key:
-                        career_data['required_skills'] = [s.strip() for s in value.split(',')]
-                    elif 'education_path' in key:
-                        career_data['education_path'] = value
-                    elif 'job_prospects' in key:
-                        career_data['job_prospects'] = value
-                    elif 'salary_range' in key:
-                        career_data['salary_range'] = value
-                    elif 'growth_potential' in key:
-                        career_data['growth_potential'] = value
-                    current_field = key
-                elif current_field:
-                    lookup_field = None
-                    if 'career_title' in current_field: lookup_field = 'career_title'
-                    elif 'description' in current_field: lookup_field = 'description'
-                    elif 'education_path' in current_field: lookup_field = 'education_path'
-                    elif 'job_prospects' in current_field: lookup_field = 'job_prospects'
-                    elif 'salary_range' in current_field: lookup_field = 'salary_range'
-                    elif 'growth_potential' in current_field: lookup_field = 'growth_potential'
-                    
-                    if lookup_field and lookup_field != 'required_skills':
-                        career_data[lookup_field] += ' ' + line
-            
-            if career_data['career_title'] and career_data['description']:
-                careers.append(CareerRecommendation(**career_data))
-                
-            if len(careers) >= 5:
+        response = client.post(url, headers=_request_headers(api_key),
+                               json=_request_body(prompt, model, stream=True), stream=True)
+        # text/event-stream has no charset, and requests would otherwise assume latin-1
+        response.encoding = 'utf-8'
+        for line in response.iter_lines(decode_unicode=True):
+            # Blank lines separate events, lines starting with ':' are keep-alive comments
+            if not line or line.startswith(':') or not line.startswith('data:'):
+                continue
+            payload = line[5:].strip()
+            if payload == '[DONE]':
                 break
-    
+            try:
+                chunk = json.loads(payload)
+            except ValueError:
+                continue
+            if "error" in chunk:
+                print(f"Streaming error from API: {chunk['error']}")
+                break
+            choices = chunk.get("choices") or []
+            if choices:
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    received.append(delta)
+                    yield delta
+    except requests.exceptions.HTTPError as e:
+        print(f"HTTP Error: {e}")
+    except requests.exceptions.Timeout:
+        print("Request timed out. Please check your internet connection.")
+    except requests.exceptions.ConnectionError:
+        print("Connection error. Please check your internet connection.")
+    except Exception as e:
+        print(f"Error streaming AI request: {e}")
+    finally:
+        if response is not None:
+            response.close()
+        if received:
+            get_response_archive().record(prompt, model, {"content": "".join(received)}, streamed=True)
+
+def parse_career_response(response_text: str) -> List[CareerRecommendation]:
+    try:
+        return parse_all(CareerResponseParser(), response_text)
     except Exception as e:
         print(f"Error parsing career response: {e}")
-    
-    return careers
+        return []
 
 def parse_college_response(response_text: str) -> List[CollegeRecommendation]:
-    import re
-    colleges = []
     try:
-        sections = re.split(r'(?i)COLLEGE\s*\d*[:\s-]*', response_text)
-        
-        for section in sections[1:]:
-            lines = section.strip().split('\n')
-            college_data = {
-                "college_name": "",
-                "location": "",
-                "programs": [],
-                "ranking": "",
-                "admission_requirements": "",
-                "fees_range": "",
-                "notable_features": ""
-            }
-            
-            current_field = None
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                if ':' in line:
-                    key_raw, value = line.split(':', 1)
-                    key = re.sub(r'[^a-z0-9\s]', '', key_raw.lower()).strip().replace(' ', '_')
-                    value = value.strip()
-                    
-                    if 'college_name' in key:
-                        college_data['college_name'] = value
-                    elif 'location' in key:
-                        college_data['location'] = value
-                    elif 'programs' in key:
-                        college_data['programs'] = [s.strip() for s in value.split(',')]
-                    elif 'ranking' in key:
-                        college_data['ranking'] = value
-                    elif 'admission_requirements' in key:
-                        college_data['admission_requirements'] = value
-                    elif 'fees_range' in key:
-                        college_data['fees_range'] = value
-                    elif 'notable_features' in key:
-                        college_data['notable_features'] = value
-                    current_field = key
-                elif current_field:
-                    lookup_field = None
-                    if 'college_name' in current_field: lookup_field = 'college_name'
-                    elif 'location' in current_field: lookup_field = 'location'
-                    elif 'ranking' in current_field: lookup_field = 'ranking'
-                    elif 'admission_requirements' in current_field: lookup_field = 'admission_requirements'
-                    elif 'fees_range' in current_field: lookup_field = 'fees_range'
-                    elif 'notable_features' in current_field: lookup_field = 'notable_features'
-                    
-                    if lookup_field and lookup_field != 'programs':
-                        college_data[lookup_field] += ' ' + line
-            
-            if college_data['college_name'] and college_data['location']:
-                colleges.append(CollegeRecommendation(**college_data))
-                
-            if len(colleges) >= 8:
-                break
-    
+        return parse_all(CollegeResponseParser(), response_text)
     except Exception as e:
         print(f"Error parsing college response: {e}")
-    
-    return colleges
-
-def save_recommendations(user_profile: UserProfile, career_recommendations: List[CareerRecommendation], 
-                        college_recommendations: List[CollegeRecommendation], roadmap: str):
+        return []
 
+def parse_roadmap_response(response_text: str) -> List[dict]:
     try:
-        filename = f"{user_profile.name.replace(' ', '_')}_recommendations.txt"
-        
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("=== GYANSETU CAREER GUIDANCE REPORT ===\n\n")
-            f.write(f"Student: {user_profile.name}\n")
-            f.write(f"Age: {user_profile.age}\n")
-            f.write(f"Current Grade: {user_profile.current_grade}\n\n")
-            
-            f.write("=== CAREER RECOMMENDATIONS ===\n")
-            for i, career in enumerate(career_recommendations, 1):
-                f.write(f"\n{i}. {career.career_title}\n")
-                f.write(f"Description: {career.description}\n")
-                f.write(f"Required Skills: {', '.join(career.required_skills)}\n")
-                f.write(f"Education Path: {career.education_path}\n")
-                f.write(f"Job Prospects: {career.job_prospects}\n")
-                f.write(f"Salary Range: {career.salary_range}\n")
-                f.write(f"Growth Potential: {career.growth_potential}\n\n")
-            
-            f.write("\n=== COLLEGE RECOMMENDATIONS ===\n")
-            for i, college in enumerate(college_recommendations, 1):
-                f.write(f"\n{i}. {college.college_name}\n")
-                f.write(f"Location: {college.location}\n")
-                f.write(f"Programs: {', '.join(college.programs)}\n")
-                f.write(f"Ranking: {college.ranking}\n")
-                f.write(f"Admission Requirements: {college.admission_requirements}\n")
-                f.write(f"Fees Range: {college.fees_range}\n")
-                f.write(f"Notable Features: {college.notable_features}\n\n")
-            
-            f.write("\n=== PERSONALIZED ROADMAP ===\n")
-            if isinstance(roadmap, list):
-                for phase in roadmap:
-                    f.write(f"\n{phase.get('title', 'Phase')} ({phase.get('period', 'TBD')})\n")
-                    f.write(f"Objective: {phase.get('objective', '')}\n")
-                    f.write("Actions:\n")
-                    for item in phase.get('action_items', []):
-                        f.write(f"  - [{item.get('category', '')}] {item.get('task', '')}\n")
-                    if phase.get('milestones'):
-                        f.write("Milestones: " + ", ".join(phase['milestones']) + "\n")
-            else:
-                f.write(roadmap)
-        
-        print(f"\nRecommendations saved to: {filename}")
+        clean_json = response_text.strip()
+        if clean_json.startswith("```json"):
+            clean_json = clean_json[7:-3].strip()
+        elif clean_json.startswith("```"):
+            clean_json = clean_json[3:-3].strip()
         
+        return json.loads(clean_json)
     except Exception as e:
+        print(f"Error parsing roadmap JSON: {e}")
+        print(f"Raw response: {response_text[:200]}...")
+    
+    return []
 
-        print(f"Error saving recommendations: {e}")
+def parse_combined_response(response_text: str) -> Dict[str, Optional[list]]:
+    """Per-section results of a combined response; every section is None if it is not valid JSON."""
+    try:
+        return parse_combined(response_text)
+    except Exception as e:
+        print(f"Error parsing combined JSON: {e}")
+        print(f"Raw response: {response_text[:200]}...")
+    return {"careers": None, "colleges": None, "roadmap": None}
+
+def results_to_dict(results: dict) -> dict:
+    """JSON-ready form of the dict returned by CareerRecommendationSystem.generate_all."""
+    return {
+        "careers": [c.to_dict() for c in results["careers"]],
+        "colleges": [c.to_dict() for c in results["colleges"]],
+        "roadmap": results["roadmap"],
+        "errors": results.get("errors", {}),
+    }
 
 def extract_text_from_pdf(file_stream):
-    """Extracts text from a PDF file stream."""
+    """Extracts text from a PDF file stream (bounded by the page/char limits)."""
     try:
-        reader = pypdf.PdfReader(file_stream)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        return extract_pdf_text(file_stream)
     except Exception as e:
         print(f"Error reading PDF: {e}")
         return ""
 
 def extract_text_from_docx(file_stream):
-    """Extracts text from a DOCX file stream."""
+    """Extracts text from a DOCX file stream (bounded by the char limit)."""
     try:
-        doc = docx.Document(file_stream)
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return text
+        return extract_docx_text(file_stream)
     except Exception as e:
         print(f"Error reading DOCX: {e}")
         return ""
@@ -278,47 +201,15 @@ def parse_resume(file_stream, filename):
     Orchestrates the parsing of a resume file.
     Returns a dictionary with 'skills' (list) and 'education' (list).
     """
-    text = ""
     filename = filename.lower()
 
-    # 1. Extract Raw Text
+    # 1. Extract Raw Text (on the extraction process pool, with page/char/time limits)
     if filename.endswith('.pdf'):
-        text = extract_text_from_pdf(file_stream)
+        text = extract_text(file_stream, 'pdf')
     elif filename.endswith('.docx'):
-        text = extract_text_from_docx(file_stream)
+        text = extract_text(file_stream, 'docx')
     else:
         return None  # Unsupported file type
 
-    # Normalize text for searching
-    text_lower = text.lower()
-
-    # 2. Define Keywords
-    SKILL_KEYWORDS = [
-        "python", "java", "c++", "javascript", "html", "css", "sql", "flask", 
-        "django", "react", "node.js", "docker", "kubernetes", "aws", "git", 
-        "machine learning", "data analysis", "communication", "leadership", 
-        "problem-solving", "design", "writing"
-    ]
-
-    EDUCATION_KEYWORDS = [
-        "b.tech", "b.e.", "b.sc", "m.tech", "m.s.", "mba", "phd", 
-        "bachelor", "master", "diploma", "computer science", "10th", "12th"
-    ]
-
-    # 3. Parsing Logic
-    extracted_data = {
-        "skills": [],
-        "education": []
-    }
-
-    # Match Skills
-    for skill in SKILL_KEYWORDS:
-        if skill in text_lower:
-            extracted_data["skills"].append(skill.title())
-
-    # Match Education
-    for edu in EDUCATION_KEYWORDS:
-        if edu in text_lower:
-            extracted_data["education"].append(edu.upper())
-
-    return extracted_data
+    # 2. Match skills and education against the taxonomy in one pass each
+    return get_resume_matcher().match(text)
@@ -0,0 +1,44 @@
+"""Add generation_jobs table for the async job API
+
+Revision ID: 3f6b2c1d9a47
+Revises: 12e893b48d88
+Create Date: 2026-10-18 10:12:40.512331
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6b2c1d9a47'
+down_revision = '12e893b48d88'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('generation_jobs',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('form_data', sa.Text(), nullable=False),
+    sa.Column('result', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('generation_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_generation_jobs_status'), ['status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_generation_jobs_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('generation_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_generation_jobs_user_id'))
+        batch_op.drop_index(batch_op.f('ix_generation_jobs_status'))
+
+    op.drop_table('generation_jobs')
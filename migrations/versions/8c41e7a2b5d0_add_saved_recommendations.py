@@ -0,0 +1,40 @@
+"""Add saved_recommendations table for saved results
+
+Revision ID: 8c41e7a2b5d0
+Revises: 3f6b2c1d9a47
+Create Date: 2026-10-18 14:03:27.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41e7a2b5d0'
+down_revision = '3f6b2c1d9a47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('saved_recommendations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('roadmap_id', sa.Integer(), nullable=True),
+    sa.Column('student_name', sa.String(length=100), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['roadmap_id'], ['roadmaps.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('roadmap_id')
+    )
+    with op.batch_alter_table('saved_recommendations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_saved_recommendations_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('saved_recommendations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_saved_recommendations_user_id'))
+
+    op.drop_table('saved_recommendations')
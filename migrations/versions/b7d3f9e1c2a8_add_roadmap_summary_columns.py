@@ -0,0 +1,44 @@
+"""Add roadmap summary columns and a (user_id, created_at) index for history
+
+Revision ID: b7d3f9e1c2a8
+Revises: 8c41e7a2b5d0
+Create Date: 2026-10-18 15:21:09.604117
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3f9e1c2a8'
+down_revision = '8c41e7a2b5d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('roadmaps', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('career_titles', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('phase_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.create_index('ix_roadmaps_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+    # Backfill phase counts for existing roadmaps stored as a JSON list of phases
+    conn = op.get_bind()
+    roadmaps = sa.table('roadmaps', sa.column('id', sa.Integer), sa.column('content', sa.Text),
+                        sa.column('phase_count', sa.Integer))
+    for row in conn.execute(sa.select(roadmaps.c.id, roadmaps.c.content)):
+        try:
+            phases = json.loads(row.content)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(phases, list):
+            conn.execute(roadmaps.update().where(roadmaps.c.id == row.id).values(phase_count=len(phases)))
+
+
+def downgrade():
+    with op.batch_alter_table('roadmaps', schema=None) as batch_op:
+        batch_op.drop_index('ix_roadmaps_user_id_created_at')
+        batch_op.drop_column('phase_count')
+        batch_op.drop_column('career_titles')
@@ -0,0 +1,34 @@
+"""Add pending_streams table for forms waiting on their results stream
+
+Revision ID: d4a9c3e7f215
+Revises: b7d3f9e1c2a8
+Create Date: 2026-10-18 18:02:37.219845
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a9c3e7f215'
+down_revision = 'b7d3f9e1c2a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('pending_streams',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('form_data', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('pending_streams', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_pending_streams_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('pending_streams', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_pending_streams_created_at'))
+
+    op.drop_table('pending_streams')
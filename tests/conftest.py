@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from app import create_app, db
+
+CAREERS_TEXT = "\n".join(
+    f"CAREER {i}:\nCareer Title: Job {i}\nDescription: Does things\nRequired Skills: a, b\n"
+    f"Education Path: BSc\nJob Prospects: good\nSalary Range: 1-2\nGrowth Potential: high\n"
+    for i in range(1, 6)
+)
+COLLEGES_TEXT = "\n".join(
+    f"COLLEGE {i}:\nCollege Name: Uni {i}\nLocation: Pune, India\nPrograms: CS, EE\nRanking: top\n"
+    f"Admission Requirements: JEE\nFees Range: 1L\nNotable Features: nice\n"
+    for i in range(1, 9)
+)
+ROADMAP_TEXT = json.dumps([{"title": "P1", "period": "6 months", "objective": "Start",
+                            "action_items": [{"category": "Study", "task": "Read"}], "milestones": ["Done"]}])
+
+FORM = {
+    'name': 'Asha K', 'age': '16', 'current_grade': '11',
+    'academic_subjects': 'Math, Physics', 'grades': 'Math: A, Physics: B',
+    'interests': 'robots', 'hobbies': 'chess', 'preferred_work_environment': 'Office',
+}
+
+
+def fake_response(prompt: str) -> str:
+    if "5 personalized career" in prompt:
+        return CAREERS_TEXT
+    if "recommend 8 colleges" in prompt:
+        return COLLEGES_TEXT
+    return ROADMAP_TEXT
+
+
+def make_config(tmp_path, **overrides):
+    """Test settings with every file the app writes kept under tmp_path."""
+    settings = dict(
+        TESTING=True,
+        SECRET_KEY='test',
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'test.db'}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        STREAM_RESULTS=False,
+        LLM_CACHE_PATH=str(tmp_path / 'llm_cache.db'),
+        JINJA_BYTECODE_CACHE_DIR=str(tmp_path / 'jinja_cache'),
+        ASSETS_OUTPUT_DIR=str(tmp_path / 'assets'),
+        # Cheap hashes keep the auth tests fast
+        PASSWORD_HASH_METHOD='pbkdf2:sha256:1000',
+    )
+    settings.update(overrides)
+    return type('TestConfig', (), settings)
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(make_config(tmp_path))
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def ai_calls(monkeypatch):
+    """Replaces the OpenRouter calls with canned responses; records the prompts sent."""
+    import core.recommendation_system as rs
+
+    prompts = []
+
+    def make_ai_request(api_key, url, prompt, *args, **kwargs):
+        prompts.append(prompt)
+        return fake_response(prompt)
+
+    def stream_ai_request(api_key, url, prompt, *args, **kwargs):
+        prompts.append(prompt)
+        text = fake_response(prompt)
+        for start in range(0, len(text), 40):
+            yield text[start:start + 40]
+
+    monkeypatch.setattr(rs, 'make_ai_request', make_ai_request)
+    monkeypatch.setattr(rs, 'stream_ai_request', stream_ai_request)
+    return prompts
+
+
+@pytest.fixture
+def user_client(client):
+    """A client logged in as a freshly registered user."""
+    client.post('/register', data={'name': 'Test User', 'username': 'tester',
+                                   'password': 'password123', 'confirm_password': 'password123'})
+    client.post('/login', data={'username': 'tester', 'password': 'password123'})
+    return client
@@ -0,0 +1,74 @@
+import os
+
+from core.archive import ResponseArchive, iter_records, prompt_hash
+
+
+def write(directory, entries, **kwargs):
+    archive = ResponseArchive(directory=str(directory), enabled=True, sample_rate=1.0, **kwargs)
+    for prompt, response in entries:
+        archive.record(prompt, 'model', response)
+    archive.close()
+    return archive
+
+
+def test_records_are_written_and_read_back_in_order(tmp_path):
+    write(tmp_path, [(f'prompt {i}', {'n': i}) for i in range(5)])
+    records = list(iter_records(str(tmp_path)))
+    assert [r['response'] for r in records] == [{'n': i} for i in range(5)]
+    assert records[0]['prompt_hash'] == prompt_hash('prompt 0')
+
+
+def test_segments_rotate_by_size_and_the_index_finds_one_prompt(tmp_path):
+    write(tmp_path, [(f'prompt {i}', 'x' * 2000) for i in range(20)], segment_bytes=1, batch_size=1)
+    segments = [name for name in os.listdir(tmp_path) if name.endswith('.jsonl.gz')]
+    assert len(segments) > 1
+    (record,) = iter_records(str(tmp_path), prompt_hash=prompt_hash('prompt 7'))
+    assert record['prompt'] == 'prompt 7'
+
+
+def test_time_range_filters_records(tmp_path):
+    write(tmp_path, [('early', 1)])
+    records = list(iter_records(str(tmp_path)))
+    ts = records[0]['ts']
+    assert list(iter_records(str(tmp_path), since=ts + 1)) == []
+    assert len(list(iter_records(str(tmp_path), since=ts, until=ts + 1))) == 1
+
+
+def test_disabled_or_zero_sample_rate_writes_nothing(tmp_path):
+    archive = ResponseArchive(directory=str(tmp_path / 'off'), enabled=True, sample_rate=0.0)
+    archive.record('p', 'model', {})
+    archive.close()
+    assert not (tmp_path / 'off').exists()
+
+
+def segments(directory):
+    names = [name for name in os.listdir(directory) if name.endswith('.jsonl.gz')]
+    return sorted(names, key=lambda name: os.path.getmtime(os.path.join(directory, name)))
+
+
+def test_size_cap_deletes_the_oldest_segments_and_their_index_rows(tmp_path):
+    # Random hex barely compresses, so each one-record segment is ~1KB on disk
+    entries = [(f'prompt {i}', os.urandom(1000).hex()) for i in range(20)]
+    write(tmp_path, entries, segment_bytes=1, batch_size=1, max_bytes=5000, max_age=0)
+    kept = segments(tmp_path)
+    assert 1 < len(kept) < 20
+    assert sum(os.path.getsize(tmp_path / name) for name in kept[:-1]) <= 5000
+    prompts = [r['prompt'] for r in iter_records(str(tmp_path))]
+    assert prompts == [f'prompt {i}' for i in range(20 - len(prompts), 20)]
+    assert list(iter_records(str(tmp_path), prompt_hash=prompt_hash('prompt 0'))) == []
+
+
+def test_age_cap_deletes_expired_segments_on_start(tmp_path):
+    write(tmp_path, [('old', 1)], max_age=0)
+    (old,) = segments(tmp_path)
+    expired = os.path.getmtime(tmp_path / old) - 31 * 86400
+    os.utime(tmp_path / old, (expired, expired))
+    write(tmp_path, [('new', 2)], max_age=30 * 86400)
+    assert old not in segments(tmp_path)
+    assert [r['prompt'] for r in iter_records(str(tmp_path))] == ['new']
+
+
+def test_caps_of_zero_keep_everything(tmp_path):
+    write(tmp_path, [(f'prompt {i}', 'x') for i in range(5)], segment_bytes=1, batch_size=1, max_bytes=0, max_age=0)
+    assert len(segments(tmp_path)) == 5
+    assert len(list(iter_records(str(tmp_path)))) == 5
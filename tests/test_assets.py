@@ -0,0 +1,53 @@
+import gzip
+import os
+import re
+
+from app.assets import AssetManifest
+
+
+def asset_path(client):
+    page = client.get('/').get_data(as_text=True)
+    return re.search(r'href="(/assets/style\.[0-9a-f]{12}\.css)"', page).group(1)
+
+
+def test_pages_link_fingerprinted_assets_served_immutable(client):
+    response = client.get(asset_path(client))
+    assert response.status_code == 200
+    assert response.mimetype == 'text/css'
+    assert 'immutable' in response.headers['Cache-Control']
+    assert 'max-age=31536000' in response.headers['Cache-Control']
+    assert 'Content-Disposition' not in response.headers
+
+
+def test_precompressed_variant_is_negotiated(app, client):
+    path = asset_path(client)
+    plain = client.get(path)
+    zipped = client.get(path, headers={'Accept-Encoding': 'gzip'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in zipped.headers['Vary']
+    assert gzip.decompress(zipped.data) == plain.data
+    with open(os.path.join(app.static_folder, 'style.css'), 'rb') as f:
+        assert plain.data == f.read()
+
+
+def test_unknown_and_stale_names_are_not_found(client):
+    assert client.get('/assets/style.000000000000.css').status_code == 404
+
+
+def test_fingerprint_follows_content(tmp_path):
+    static = tmp_path / 'static'
+    static.mkdir()
+    (static / 'app.js').write_text('console.log(1);' * 100)
+    (static / 'tiny.js').write_text('1')
+    first = AssetManifest(str(static), str(tmp_path / 'out')).build()
+    (static / 'app.js').write_text('console.log(2);' * 100)
+    second = AssetManifest(str(static), str(tmp_path / 'out')).build()
+    assert first.urls['app.js'] != second.urls['app.js']
+    assert 'gzip' in second.files[second.urls['app.js']][1]
+    # Too small to be worth compressing
+    assert second.files[second.urls['tiny.js']][1] == {}
+
+
+def test_debug_mode_links_plain_static_files(app, client):
+    app.debug = True
+    assert 'href="/static/style.css"' in client.get('/').get_data(as_text=True)
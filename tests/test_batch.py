@@ -0,0 +1,62 @@
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.batch import iter_profile_rows, run_windowed
+from tests.conftest import FORM
+
+
+def test_jsonl_batch_streams_one_record_per_row(client, ai_calls):
+    rows = [dict(FORM, interests=['robots', 'space']), 'not json', dict(FORM, age='abc')]
+    body = "\n".join(r if isinstance(r, str) else json.dumps(r) for r in rows)
+    response = client.post('/batch', data=body, content_type='application/x-ndjson')
+    assert response.mimetype == 'application/x-ndjson'
+    records = sorted((json.loads(line) for line in response.get_data(as_text=True).splitlines()),
+                     key=lambda r: r['row'])
+    assert [r['status'] for r in records] == ['ok', 'error', 'error']
+    assert len(records[0]['careers']) == 5 and records[0]['name'] == 'Asha K'
+    assert records[1]['error'].startswith('Invalid row')
+    assert records[2]['error'].startswith('Invalid profile')
+
+
+def test_csv_upload_is_accepted(client, ai_calls):
+    header = ",".join(FORM)
+    values = ",".join(f'"{v}"' for v in FORM.values())
+    upload = (io.BytesIO(f"{header}\n{values}\n".encode()), 'cohort.csv')
+    response = client.post('/batch', data={'file': upload}, content_type='multipart/form-data')
+    (record,) = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert record['status'] == 'ok' and record['row'] == 1
+
+
+def test_rows_are_pulled_only_as_slots_free_up():
+    pulled = []
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def rows():
+        for number in range(1, 21):
+            pulled.append(number)
+            yield number, {}
+
+    def work(number, form_data):
+        with lock:
+            in_flight.append(number)
+            peak.append(len(in_flight))
+        with lock:
+            in_flight.remove(number)
+        return number
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = run_windowed(executor, work, rows(), concurrency=3)
+        first = next(results)
+        assert len(pulled) <= 4
+        assert sorted([first, *results]) == list(range(1, 21))
+    assert max(peak) <= 3
+
+
+def test_jsonl_values_are_flattened_to_form_text():
+    text = io.StringIO('{"grades": {"Math": "A"}, "interests": ["a", "b"], "career_goals": null}\n')
+    ((number, row),) = list(iter_profile_rows(text, 'jsonl'))
+    assert row == {'grades': 'Math: A', 'interests': 'a, b', 'career_goals': ''}
@@ -0,0 +1,84 @@
+import dataclasses
+
+from core.cache import ResponseCache, make_cache_key
+from core.models import CareerRecommendation, UserProfile
+from core.recommendation_system import CareerRecommendationSystem
+
+PROFILE = UserProfile(name='Asha K', age=16, current_grade='11', academic_subjects=['Math', 'Physics'],
+                      grades={'Math': 'A', 'Physics': 'B'}, interests=['robots'], hobbies=['chess'],
+                      preferred_work_environment='Office')
+
+
+def career(title):
+    return CareerRecommendation(title, 'd', ['a'], 'e', 'j', 's', 'g')
+
+
+def test_cache_key_ignores_case_whitespace_and_list_order():
+    a = make_cache_key('careers', 'm', {'interests': ['Robots', ' chess'], 'grade': '11 '})
+    b = make_cache_key('careers', 'm', {'interests': ['chess', 'robots'], 'grade': '11'})
+    assert a == b
+    assert a != make_cache_key('careers', 'other-model', {'interests': ['chess', 'robots'], 'grade': '11'})
+    assert a != make_cache_key('colleges', 'm', {'interests': ['chess', 'robots'], 'grade': '11'})
+
+
+def test_memory_and_sqlite_tiers_round_trip(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    ResponseCache(path=path).set('careers', 'k', [career('Pilot')])
+    # A fresh instance has an empty memory tier and reads the SQLite row
+    assert ResponseCache(path=path).get('careers', 'k') == [career('Pilot')]
+    assert ResponseCache(path=path).get('careers', 'missing') is None
+
+
+def test_expired_entries_are_not_returned(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / 'cache.db'), ttl=-1)
+    cache.set('roadmap', 'k', [{'title': 'P1'}])
+    assert cache.get('roadmap', 'k') is None
+
+
+def test_career_prompt_and_key_leave_out_the_name(ai_calls):
+    system = CareerRecommendationSystem('key', client=object(), cache=ResponseCache())
+    first = system.generate_career_recommendations(PROFILE)
+    other = system.generate_career_recommendations(dataclasses.replace(PROFILE, name='Ravi M'))
+    assert other == first
+    assert len(ai_calls) == 1
+    assert 'Asha' not in ai_calls[0]
+
+
+def test_profiles_differing_in_prompt_fields_do_not_share_careers(ai_calls):
+    system = CareerRecommendationSystem('key', client=object(), cache=ResponseCache())
+    system.generate_career_recommendations(PROFILE)
+    system.generate_career_recommendations(dataclasses.replace(PROFILE, budget_range='Low'))
+    assert len(ai_calls) == 2
+
+
+def test_empty_results_are_not_cached(monkeypatch):
+    import core.recommendation_system as rs
+    calls = []
+    monkeypatch.setattr(rs, 'make_ai_request', lambda *a, **k: calls.append(1) or '')
+    system = CareerRecommendationSystem('key', client=object(), cache=ResponseCache())
+    assert system.generate_career_recommendations(PROFILE) == []
+    assert system.generate_career_recommendations(PROFILE) == []
+    assert len(calls) == 2
+
+
+COMBINED_TEXT = """{
+  "careers": [{"career_title": "Pilot", "description": "d", "required_skills": ["a"], "education_path": "e",
+               "job_prospects": "j", "salary_range": "s", "growth_potential": "g"}],
+  "colleges": [{"college_name": "Uni", "location": "Pune", "programs": ["CS"], "ranking": "r",
+                "admission_requirements": "a", "fees_range": "f", "notable_features": "n"}],
+  "roadmap": [{"title": "P1", "period": "6 months", "objective": "o",
+               "action_items": [{"category": "Study", "task": "t"}], "milestones": ["m"]}]
+}"""
+
+
+def test_combined_mode_caches_careers_under_the_separate_call_key(monkeypatch):
+    import core.recommendation_system as rs
+    prompts = []
+    monkeypatch.setattr(rs, 'make_ai_request', lambda api_key, url, prompt, *a, **k: prompts.append(prompt) or COMBINED_TEXT)
+    system = CareerRecommendationSystem('key', client=object(), cache=ResponseCache(), combined=True)
+    sections = system.generate_combined(PROFILE)
+    assert [c.career_title for c in sections['careers']] == ['Pilot']
+    assert 'Asha' not in prompts[0]
+    # Another student with the same prompt fields gets the combined careers from the cache
+    assert system.generate_career_recommendations(dataclasses.replace(PROFILE, name='Ravi M')) == sections['careers']
+    assert len(prompts) == 1
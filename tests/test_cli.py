@@ -0,0 +1,61 @@
+import json
+import sqlite3
+
+import pytest
+
+from core import cli
+from tests.conftest import FORM, fake_response
+
+
+@pytest.fixture
+def profiles(tmp_path):
+    path = tmp_path / 'profiles.jsonl'
+    rows = [dict(FORM, name=f'Student {i}', interests=f'topic {i}') for i in range(3)]
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n{bad json\n")
+    return path
+
+
+def run(profiles, output):
+    return cli.main([str(profiles), '--output', str(output), '--api-key', 'key', '--workers', '2'])
+
+
+def test_jsonl_output_is_checkpointed_and_resumed(profiles, tmp_path, ai_calls):
+    output = tmp_path / 'results.jsonl'
+    assert run(profiles, output) == 0
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(r['status'] for r in records) == ['error', 'ok', 'ok', 'ok']
+    first_run_calls = len(ai_calls)
+
+    assert run(profiles, output) == 0
+    assert len(ai_calls) == first_run_calls
+    assert len(output.read_text().splitlines()) == 4
+
+
+def test_failed_generations_are_retried_next_run(profiles, tmp_path, ai_calls, monkeypatch):
+    import core.recommendation_system as rs
+
+    failing = {'topic 1'}
+
+    def flaky(api_key, url, prompt, *args, **kwargs):
+        ai_calls.append(prompt)
+        return "" if any(topic in prompt for topic in failing) else fake_response(prompt)
+
+    monkeypatch.setattr(rs, 'make_ai_request', flaky)
+    output = tmp_path / 'results.db'
+    assert run(profiles, output) == 1
+    with sqlite3.connect(output) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM bulk_results").fetchone()[0] == 3
+
+    failing.clear()
+    calls_before = len(ai_calls)
+    assert run(profiles, output) == 0
+    with sqlite3.connect(output) as conn:
+        names = {name for (name,) in conn.execute("SELECT name FROM bulk_results WHERE status = 'ok'")}
+    assert names == {'Student 0', 'Student 1', 'Student 2'}
+    # Only the failed profile was generated again
+    career_prompts = [p for p in ai_calls[calls_before:] if "5 personalized career" in p]
+    assert len(career_prompts) == 1 and 'topic 1' in career_prompts[0]
+
+
+def test_row_keys_ignore_column_order():
+    assert cli.row_key({'a': '1', 'b': '2'}) == cli.row_key({'b': '2', 'a': '1'})
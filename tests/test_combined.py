@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from core.models import UserProfile
+from core.recommendation_system import CareerRecommendationSystem
+from tests.conftest import fake_response
+
+PROFILE = UserProfile('A', 16, '11', ['Math'], {'Math': 'A'}, ['robots'], ['chess'], 'Office')
+CAREERS = [{"career_title": f"Job {i}", "description": "d", "required_skills": ["a"], "education_path": "e",
+            "job_prospects": "j", "salary_range": "s", "growth_potential": "g"} for i in range(1, 6)]
+ROADMAP = [{"title": "P1", "period": "now", "objective": "o", "action_items": [], "milestones": []}]
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    import core.recommendation_system as rs
+
+    sent = []
+    combined = {}
+
+    def make_ai_request(api_key, url, prompt, *args, response_format=None, **kwargs):
+        sent.append('combined' if response_format else 'separate')
+        return json.dumps(combined) if response_format else fake_response(prompt)
+
+    monkeypatch.setattr(rs, 'make_ai_request', make_ai_request)
+    return sent, combined
+
+
+def test_one_call_when_every_section_validates(calls):
+    sent, combined = calls
+    combined.update(careers=CAREERS, colleges=[{"college_name": "IIT", "location": "Mumbai"}], roadmap=ROADMAP)
+    results = CareerRecommendationSystem('key', client=object(), combined=True).generate_all(PROFILE)
+    assert sent == ['combined']
+    assert [c.career_title for c in results["careers"]] == [f"Job {i}" for i in range(1, 6)]
+    assert results["colleges"][0].college_name == "IIT"
+    assert results["roadmap"] == ROADMAP
+
+
+def test_only_invalid_sections_are_generated_separately(calls):
+    sent, combined = calls
+    combined.update(careers=CAREERS, colleges=[{"college_name": "No location"}], roadmap=ROADMAP)
+    results = CareerRecommendationSystem('key', client=object(), combined=True).generate_all(PROFILE)
+    assert sent == ['combined', 'separate']
+    assert len(results["colleges"]) == 8
+    assert results["roadmap"] == ROADMAP
+
+
+def test_empty_combined_response_falls_back_to_separate_calls(calls):
+    sent, combined = calls
+    results = CareerRecommendationSystem('key', client=object(), combined=True).generate_all(PROFILE)
+    assert sent == ['combined', 'separate', 'separate', 'separate']
+    assert len(results["careers"]) == 5 and len(results["colleges"]) == 8
+
+
+def test_invalid_careers_invalidate_the_sections_written_for_them(calls):
+    sent, combined = calls
+    combined.update(careers=[{"career_title": "Astronaut"}],
+                    colleges=[{"college_name": "Space U", "location": "Orbit"}],
+                    roadmap=[dict(ROADMAP[0], title="Astronaut phase")])
+    results = CareerRecommendationSystem('key', client=object(), combined=True).generate_all(PROFILE)
+    assert sent == ['combined', 'separate', 'separate', 'separate']
+    assert [c.career_title for c in results["careers"]] == [f"Job {i}" for i in range(1, 6)]
+    assert "Space U" not in [c.college_name for c in results["colleges"]]
+    assert [phase["title"] for phase in results["roadmap"]] == ["P1"]
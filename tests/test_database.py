@@ -0,0 +1,23 @@
+from sqlalchemy import text
+
+from app import db
+from app.database import database_url, engine_options
+
+
+def test_legacy_postgres_scheme_is_fixed(monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', 'postgres://u:p@host/db')
+    assert database_url() == 'postgresql://u:p@host/db'
+    assert database_url('sqlite:///x.db') == 'sqlite:///x.db'
+
+
+def test_engine_options_per_backend():
+    assert engine_options('sqlite:///x.db', {'DB_BUSY_TIMEOUT': 3}) == {'connect_args': {'timeout': 3}}
+    options = engine_options('postgresql://u@host/db', {'DB_POOL_SIZE': 5})
+    assert options['pool_size'] == 5 and options['pool_pre_ping'] is True
+
+
+def test_sqlite_connections_use_wal_and_the_busy_timeout(app):
+    with app.app_context():
+        assert db.session.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert db.session.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+        assert db.session.execute(text('PRAGMA busy_timeout')).scalar() == 15000
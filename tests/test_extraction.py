@@ -0,0 +1,104 @@
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import docx
+import pytest
+
+from core import extraction
+
+
+def docx_bytes(*paragraphs) -> io.BytesIO:
+    document = docx.Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    stream = io.BytesIO()
+    document.save(stream)
+    stream.seek(0)
+    return stream
+
+
+def test_docx_text_is_extracted_on_a_worker_and_capped():
+    stream = docx_bytes('Python developer', 'SQL and statistics')
+    assert extraction.extract_text(stream, 'docx', timeout=30) == 'Python developer\nSQL and statistics'
+    assert extraction.extract_text(docx_bytes('x' * 50), 'docx', max_chars=10, timeout=30) == 'x' * 10
+
+
+def test_unreadable_upload_returns_empty_text():
+    assert extraction.extract_text(io.BytesIO(b'not a pdf'), 'pdf', timeout=30) == ''
+
+
+def test_a_timed_out_task_does_not_break_other_extractions():
+    # Warm one worker so the slow and the fast task run side by side
+    assert extraction._run_isolated(len, (b'warm',), timeout=30) == 4
+    results = {}
+
+    def slow():
+        try:
+            extraction._run_isolated(time.sleep, (30,), timeout=0.5)
+        except FutureTimeout:
+            results['slow'] = 'timeout'
+
+    thread = threading.Thread(target=slow)
+    thread.start()
+    thread.join()
+    assert results == {'slow': 'timeout'}
+    # The killed worker is gone, but the next task still runs
+    assert extraction._run_isolated(len, (b'abc',), timeout=30) == 3
+    assert all(worker.alive() for worker in extraction._idle)
+
+
+def test_concurrent_task_survives_a_neighbour_timing_out():
+    results = {}
+
+    def fast():
+        results['fast'] = extraction._run_isolated(sum, ([1, 2, 3],), timeout=30)
+
+    def slow():
+        with pytest.raises(FutureTimeout):
+            extraction._run_isolated(time.sleep, (30,), timeout=2)
+        results['slow'] = 'timeout'
+
+    threads = [threading.Thread(target=slow), threading.Thread(target=fast)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {'fast': 6, 'slow': 'timeout'}
+
+
+def test_worker_exceptions_are_reported():
+    with pytest.raises(RuntimeError, match='ZeroDivisionError'):
+        extraction._run_isolated(divmod, (1, 0), timeout=30)
+
+
+APP_SCRIPT = '''
+import os, sys
+sys.path.insert(0, {root!r})
+print("module ran as", __name__, os.getpid(), flush=True)
+from app import create_app
+app = create_app()
+
+if __name__ == "__main__":
+    import io
+    from core.extraction import extract_text
+    print("RESULT", extract_text(io.BytesIO(sys.stdin.buffer.read()), "docx", timeout=60), flush=True)
+'''
+
+
+def test_workers_do_not_rerun_an_app_script(tmp_path):
+    # app.py and run.py build the app at import time; a worker must not do it again
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = tmp_path / 'serve.py'
+    script.write_text(APP_SCRIPT.format(root=root))
+    env = dict(os.environ, JOBS_ENABLED='true', RESPONSE_ARCHIVE_ENABLED='false',
+               DATABASE_URL=f"sqlite:///{tmp_path / 'app.db'}")
+    result = subprocess.run([sys.executable, str(script)], input=docx_bytes('Python developer').read(),
+                            capture_output=True, env=env, cwd=str(tmp_path), timeout=120)
+    lines = result.stdout.decode().splitlines()
+    assert [line.split()[3] for line in lines if line.startswith('module ran')] == ['__main__']
+    assert 'RESULT Python developer' in lines
@@ -0,0 +1,54 @@
+import json
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import Roadmap, User
+
+
+def add_roadmaps(app, username, created):
+    with app.app_context():
+        user_id = User.query.filter_by(username=username).first().id
+        rows = [Roadmap(user_id=user_id, content=json.dumps([{'title': f'P{i}'}]), created_at=at,
+                        career_titles=json.dumps([f'Job {i}']), phase_count=1)
+                for i, at in enumerate(created)]
+        db.session.add_all(rows)
+        db.session.commit()
+        return [row.id for row in rows]
+
+
+def collect_pages(client, limit):
+    ids, cursor = [], None
+    while True:
+        url = f'/history?limit={limit}' + (f'&cursor={cursor}' if cursor else '')
+        page = client.get(url).get_json()
+        ids.extend(item['id'] for item in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return ids
+
+
+def test_pages_walk_every_roadmap_newest_first_including_ties(app, user_client):
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    # Several roadmaps share a timestamp, so the id has to break ties
+    created = [now - timedelta(minutes=i // 3) for i in range(10)]
+    ids = add_roadmaps(app, 'tester', created)
+    expected = [i for _, i in sorted(zip(created, ids), key=lambda pair: (pair[0], pair[1]), reverse=True)]
+    for limit in (1, 3, 4, 10, 50):
+        assert collect_pages(user_client, limit) == expected
+
+
+def test_summaries_skip_the_content_and_only_show_own_roadmaps(app, user_client):
+    add_roadmaps(app, 'tester', [datetime(2026, 1, 1)])
+    with app.app_context():
+        other = User(username='other', name='Other')
+        other.set_password('password123')
+        db.session.add(other)
+        db.session.commit()
+    add_roadmaps(app, 'other', [datetime(2026, 1, 2)])
+    (item,) = user_client.get('/history').get_json()['items']
+    assert item['career_titles'] == ['Job 0'] and item['phase_count'] == 1
+    assert 'roadmap' not in item
+
+
+def test_bad_cursors_are_rejected(user_client):
+    assert user_client.get('/history?cursor=garbage').status_code == 400
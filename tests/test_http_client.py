@@ -0,0 +1,94 @@
+import io
+import json
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+import core.utils
+from core.archive import ResponseArchive
+from core.http_client import AIClient
+from core.utils import make_ai_request, stream_ai_request
+
+
+class FakeSession:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def post(self, *args, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def make_response(status, body=b'{}', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(body)
+    return response
+
+
+@pytest.fixture(autouse=True)
+def no_archive(monkeypatch, tmp_path):
+    archive = ResponseArchive(directory=str(tmp_path / 'archive'), enabled=False)
+    monkeypatch.setattr(core.utils, 'get_response_archive', lambda: archive)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr('core.http_client.time.sleep', slept.append)
+    return slept
+
+
+def client_with(*outcomes, **kwargs):
+    client = AIClient(**kwargs)
+    client.session = FakeSession(*outcomes)
+    return client
+
+
+def test_connection_errors_are_retried_then_raised(sleeps):
+    client = client_with(*[requests.exceptions.ConnectionError()] * 3, max_retries=2, backoff_base=1)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post('https://example.invalid')
+    assert client.session.calls == 3
+    # Full jitter stays under the exponential ceiling
+    assert len(sleeps) == 2 and sleeps[0] <= 1 and sleeps[1] <= 2
+
+
+def test_retry_after_is_honoured_in_seconds_and_dates(sleeps):
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    client = client_with(make_response(503, headers={'Retry-After': '7'}),
+                         make_response(429, headers={'Retry-After': later}),
+                         make_response(200), backoff_max=60)
+    assert client.post('https://example.invalid').status_code == 200
+    assert sleeps[0] == 7
+    assert 25 < sleeps[1] <= 30
+
+
+def test_backoff_is_capped(sleeps):
+    client = client_with(make_response(503, headers={'Retry-After': '3600'}), make_response(200), backoff_max=20)
+    client.post('https://example.invalid')
+    assert sleeps == [20]
+
+
+def test_make_ai_request_returns_the_message_or_empty_text(sleeps):
+    body = json.dumps({'choices': [{'message': {'content': 'hello'}}]}).encode()
+    client = client_with(make_response(200, body))
+    assert make_ai_request('key', 'https://example.invalid', 'hi', client=client) == 'hello'
+    assert make_ai_request('key', 'https://example.invalid', 'hi', client=client_with(make_response(400))) == ''
+    assert make_ai_request('key', 'https://example.invalid', 'hi',
+                           client=client_with(make_response(200, b'{"unexpected": 1}'))) == ''
+
+
+def test_stream_ai_request_yields_deltas_and_releases_the_connection(sleeps):
+    events = [': keep-alive', 'data: {"choices":[{"delta":{"content":"Hel"}}]}', '',
+              'data: {"choices":[{"delta":{"content":"lo ✓"}}]}', 'data: [DONE]', 'data: ignored']
+    client = client_with(make_response(200, "\n".join(events).encode('utf-8')))
+    assert ''.join(stream_ai_request('key', 'https://example.invalid', 'hi', client=client)) == 'Hello ✓'
+    assert client.limiter.concurrency.in_flight == 0
@@ -0,0 +1,58 @@
+from sqlalchemy import inspect
+
+from app import create_app, db
+from app.identity import SESSION_FIELDS_KEY
+from app.models import User
+from tests.conftest import make_config
+
+
+def listener_count():
+    dispatch = inspect(User).dispatch
+    return len(dispatch.after_update) + len(dispatch.after_delete)
+
+
+def login(client, username='tester'):
+    client.post('/register', data={'name': 'Test User', 'username': username,
+                                   'password': 'password123', 'confirm_password': 'password123'})
+    client.post('/login', data={'username': username, 'password': 'password123'})
+
+
+def test_listeners_are_registered_once_per_process(app, tmp_path):
+    for _ in range(3):
+        create_app(make_config(tmp_path))
+    assert listener_count() == 2
+
+
+def test_updates_invalidate_the_cached_user(app, user_client):
+    cache = app.extensions['user_cache']
+    user_client.get('/history')
+    with app.app_context():
+        user = User.query.filter_by(username='tester').first()
+        assert cache.get(user.id) is not None
+        user.name = 'Renamed'
+        db.session.commit()
+        assert cache.get(user.id) is None
+
+
+def test_deleted_user_is_logged_out_without_session_fields(app, user_client):
+    with app.app_context():
+        db.session.delete(User.query.filter_by(username='tester').first())
+        db.session.commit()
+    assert user_client.get('/history').status_code == 302
+
+
+def test_deleted_user_stays_logged_in_with_session_fields(tmp_path):
+    app = create_app(make_config(tmp_path, USER_SESSION_FIELDS=True))
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    login(client)
+    with client.session_transaction() as session:
+        assert session[SESSION_FIELDS_KEY]['username'] == 'tester'
+    with app.app_context():
+        db.session.delete(User.query.filter_by(username='tester').first())
+        db.session.commit()
+    # Documented trade-off: the signed fields are trusted until logout
+    assert client.get('/history').status_code == 200
+    client.get('/logout')
+    assert client.get('/history').status_code == 302
@@ -0,0 +1,127 @@
+import json
+from datetime import datetime, timedelta
+
+from app import db
+from app.jobs import JobRunner, QUEUED, RUNNING, FAILED
+from app.models import GenerationJob
+
+
+def add_job(job_id, status=QUEUED, attempts=0, lease_expires_at=None):
+    db.session.add(GenerationJob(id=job_id, status=status, attempts=attempts, form_data='{}',
+                                 lease_expires_at=lease_expires_at))
+    db.session.commit()
+
+
+def test_claim_takes_queued_jobs_and_starts_a_lease(app):
+    runner = JobRunner(app, workers=2, lease_seconds=60)
+    with app.app_context():
+        add_job('a')
+        assert runner._claim(2) == ['a']
+        job = db.session.get(GenerationJob, 'a')
+        assert job.status == RUNNING
+        assert job.attempts == 1
+        assert job.lease_expires_at > datetime.utcnow()
+        # A job with a live lease is not claimed twice
+        assert runner._claim(2) == []
+
+
+def test_expired_lease_is_reclaimed_while_attempts_remain(app):
+    runner = JobRunner(app, max_attempts=3)
+    expired = datetime.utcnow() - timedelta(seconds=1)
+    with app.app_context():
+        add_job('retry', status=RUNNING, attempts=2, lease_expires_at=expired)
+        assert runner._claim(1) == ['retry']
+        assert db.session.get(GenerationJob, 'retry').attempts == 3
+
+
+def test_expired_lease_with_attempts_exhausted_fails_the_job(app):
+    runner = JobRunner(app, max_attempts=3)
+    expired = datetime.utcnow() - timedelta(seconds=1)
+    with app.app_context():
+        add_job('poison', status=RUNNING, attempts=3, lease_expires_at=expired)
+        assert runner._claim(1) == []
+        job = db.session.get(GenerationJob, 'poison')
+        db.session.refresh(job)
+        assert job.status == FAILED
+        assert job.lease_expires_at is None
+        assert job.error
+
+
+def events_of(body: bytes) -> list:
+    events = []
+    for block in body.decode().strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines())
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+def test_job_events_reports_a_job_deleted_mid_stream(app, client):
+    app.config['JOB_EVENTS_POLL_INTERVAL'] = 0
+    with app.app_context():
+        add_job('gone')
+    response = client.get('/jobs/gone/events', buffered=False)
+    with app.app_context():
+        db.session.delete(db.session.get(GenerationJob, 'gone'))
+        db.session.commit()
+    events = events_of(response.get_data())
+    assert [name for name, _ in events] == ['status', 'error']
+    assert events[-1][1] == {'error': 'Job not found'}
+
+
+def test_job_events_stream_ends_after_its_time_limit(app, client):
+    app.config.update(JOB_EVENTS_MAX_SECONDS=0, JOB_EVENTS_POLL_INTERVAL=0)
+    with app.app_context():
+        add_job('slow')
+    events = events_of(client.get('/jobs/slow/events').get_data())
+    assert [name for name, _ in events] == ['status', 'timeout']
+    assert events[0][1]['status'] == QUEUED
+    assert events[1][1]['status_url'] == '/jobs/slow'
+
+
+def test_unknown_job_is_404(client):
+    assert client.get('/jobs/missing').status_code == 404
+    assert client.get('/jobs/missing/events').status_code == 404
+
+
+def test_running_jobs_keep_their_lease_and_are_not_reclaimed(app):
+    runner = JobRunner(app, lease_seconds=60)
+    expired = datetime.utcnow() - timedelta(seconds=1)
+    with app.app_context():
+        add_job('long', status=RUNNING, attempts=1, lease_expires_at=expired)
+        runner._active.add('long')
+        # Even with the lease lapsed, this process does not claim its own job again
+        assert runner._claim(2) == []
+        runner._renew_leases()
+        job = db.session.get(GenerationJob, 'long')
+        db.session.refresh(job)
+        assert job.lease_expires_at > datetime.utcnow() + timedelta(seconds=30)
+        assert job.attempts == 1
+
+
+def test_lease_renewal_leaves_finished_jobs_alone(app):
+    runner = JobRunner(app, lease_seconds=60)
+    with app.app_context():
+        add_job('finished', status=FAILED)
+        runner._active.add('finished')
+        runner._renew_leases()
+        assert db.session.get(GenerationJob, 'finished').lease_expires_at is None
+
+
+def test_create_job_accepts_a_json_body_with_natural_types(app, client):
+    app.extensions['job_runner'] = JobRunner(app)
+    body = {'name': 'Asha K', 'age': 16, 'current_grade': 11, 'academic_subjects': ['Math', 'Physics'],
+            'grades': {'Math': 'A', 'Physics': 'B'}, 'interests': ['robots', 'space'], 'hobbies': ['chess'],
+            'preferred_work_environment': 'Office', 'save': False}
+    response = client.post('/jobs', json=body)
+    assert response.status_code == 202
+    with app.app_context():
+        form_data = json.loads(db.session.get(GenerationJob, response.get_json()['id']).form_data)
+    assert form_data['grades'] == 'Math: A, Physics: B'
+    assert form_data['interests'] == 'robots, space'
+    assert not form_data['save']
+
+
+def test_create_job_rejects_a_json_body_that_is_not_an_object(app, client):
+    app.extensions['job_runner'] = JobRunner(app)
+    response = client.post('/jobs', json=['not', 'a', 'profile'])
+    assert response.status_code == 400
@@ -0,0 +1,58 @@
+import pickle
+
+import pytest
+
+from core import models
+from core.models import CareerRecommendation, CollegeRecommendation, UserProfile, dumps, from_json, loads, to_json
+
+CAREER = CareerRecommendation('Nurse', 'Cares', ['Empathy', 'Biology'], 'BSc', 'good', '1-2', 'high')
+COLLEGE = CollegeRecommendation('IIT', 'Mumbai', ['CS'], 'top', 'JEE', '2L', 'labs')
+PROFILE = UserProfile('A', 16, '11', ['Math'], {'Math': 'A'}, ['robots'], ['chess'], 'Office')
+
+
+@pytest.mark.parametrize('value', [CAREER, [CAREER, CAREER], [COLLEGE], PROFILE, []])
+def test_binary_round_trip(value):
+    assert loads(dumps(value)) == value
+
+
+@pytest.mark.parametrize('value', [CAREER, COLLEGE, PROFILE])
+def test_json_round_trip(value):
+    assert from_json(to_json(value), type(value)) == value
+    assert from_json(to_json([value, value]), type(value)) == [value, value]
+
+
+def test_json_ignores_unknown_keys_and_fills_defaults():
+    profile = from_json('{"name":"A","age":16,"current_grade":"11","academic_subjects":[],"grades":{},'
+                        '"interests":[],"hobbies":[],"preferred_work_environment":"Office","extra":1}',
+                        UserProfile)
+    assert profile.location_preference == 'Any' and profile.budget_range == 'Medium'
+
+
+def test_rows_written_before_a_field_was_appended_still_load():
+    short_row = PROFILE.to_row()[:-2]
+    data = models._MAGIC + bytes([models.FORMAT_VERSION]) + pickle.dumps(('profile', False, [short_row]))
+    assert loads(data) == PROFILE
+
+
+def test_models_are_slotted():
+    assert not hasattr(CAREER, '__dict__')
+
+
+@pytest.mark.parametrize('data', [
+    b'', b'XX\x01', models._MAGIC + bytes([models.FORMAT_VERSION + 1]),
+    models._MAGIC + bytes([models.FORMAT_VERSION]) + b'garbage',
+    models._MAGIC + bytes([models.FORMAT_VERSION]) + pickle.dumps(('nope', False, [(1,)])),
+])
+def test_unreadable_data_raises_value_error(data):
+    with pytest.raises(ValueError):
+        loads(data)
+
+
+def test_binary_data_cannot_build_arbitrary_objects():
+    class Evil:
+        def __reduce__(self):
+            return (print, ('pwned',))
+
+    data = models._MAGIC + bytes([models.FORMAT_VERSION]) + pickle.dumps(('career', False, [Evil()]))
+    with pytest.raises(ValueError):
+        loads(data)
@@ -0,0 +1,86 @@
+import json
+
+from core.parsers import CareerResponseParser, CollegeResponseParser, normalize_key, parse_all, parse_combined
+from tests.conftest import CAREERS_TEXT, COLLEGES_TEXT
+
+
+def feed_in_chunks(parser, text, size):
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(parser.feed(text[start:start + size]))
+    items.extend(parser.close())
+    return items
+
+
+def test_chunked_parsing_matches_whole_text_for_any_chunk_size():
+    expected = parse_all(CareerResponseParser(), CAREERS_TEXT)
+    assert [c.career_title for c in expected] == [f"Job {i}" for i in range(1, 6)]
+    for size in (1, 7, 40, len(CAREERS_TEXT)):
+        assert feed_in_chunks(CareerResponseParser(), CAREERS_TEXT, size) == expected
+
+
+def test_a_section_is_reported_as_soon_as_it_closes():
+    parser = CareerResponseParser()
+    # Every field filled and a blank line: done before the next header arrives
+    first = CAREERS_TEXT.split("CAREER 2:")[0]
+    assert [c.career_title for c in parser.feed(first)] == ["Job 1"]
+    # A partial section is closed by the next header
+    assert parser.feed("CAREER 2:\nCareer Title: Nurse\nDescription: Cares\n\n") == []
+    assert [c.career_title for c in parser.feed("CAREER 3:\n")] == ["Nurse"]
+
+
+def test_parser_stops_at_the_limit():
+    parser = CollegeResponseParser(limit=3)
+    items = feed_in_chunks(parser, COLLEGES_TEXT, 50)
+    assert len(items) == 3
+    assert parser.done
+    assert parser.feed("COLLEGE 9:\nCollege Name: Late\nLocation: X\n\n") == []
+
+
+def test_sections_missing_required_fields_are_dropped():
+    text = "CAREER 1:\nDescription: no title\n\nCAREER 2:\nCareer Title: Nurse\nDescription: Cares\n"
+    assert [c.career_title for c in parse_all(CareerResponseParser(), text)] == ["Nurse"]
+
+
+def test_keys_resolve_through_names_aliases_and_keywords():
+    schema = CareerResponseParser.schema
+    assert normalize_key("**Required Skills**") == "required_skills"
+    assert schema.field_for_raw("**Career Title**") == "career_title"
+    assert schema.field_for_raw("Title") == "career_title"
+    assert schema.field_for_raw("Key Skills Needed") == "required_skills"
+    assert schema.field_for_raw("Favourite colour") is None
+
+
+def test_markdown_labels_and_titles_on_the_header_line():
+    text = ("### CAREER 1: Data Scientist\n**Description:** Finds patterns\n"
+            "**Required Skills:** Python, SQL\n")
+    (career,) = parse_all(CareerResponseParser(), text)
+    assert career.career_title == "Data Scientist"
+    assert career.description == "Finds patterns"
+    assert career.required_skills == ["Python", "SQL"]
+
+
+def test_values_continue_on_following_lines():
+    text = "COLLEGE 1:\nCollege Name: IIT\nLocation: Mumbai\nNotable Features: Big campus\nand labs\n"
+    (college,) = parse_all(CollegeResponseParser(), text)
+    assert college.notable_features == "Big campus and labs"
+
+
+def test_json_objects_use_the_same_schema():
+    schema = CollegeResponseParser.schema
+    college = schema.from_mapping({"college_name": "IIT", "location": "Mumbai", "programs": "CS, EE"})
+    assert college.programs == ["CS", "EE"]
+    assert schema.from_mapping({"college_name": "IIT"}) is None
+
+
+
+def test_combined_response_sections_are_validated_independently():
+    text = json.dumps({
+        "careers": [{"career_title": "Nurse", "description": "Cares"}],
+        "colleges": [{"college_name": "No location"}],
+        "roadmap": [{"title": "P1", "action_items": [], "milestones": []}],
+    })
+    sections = parse_combined("```json\n" + text + "\n```")
+    assert [c.career_title for c in sections["careers"]] == ["Nurse"]
+    assert sections["colleges"] is None
+    assert sections["roadmap"][0]["title"] == "P1"
@@ -0,0 +1,36 @@
+import time
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app.passwords import PasswordHasher, method_id
+
+
+@pytest.mark.parametrize('method', [
+    'scrypt', 'scrypt:16384:8:1', 'pbkdf2', 'pbkdf2:sha512', 'pbkdf2:sha256:1000',
+])
+def test_method_id_matches_the_prefix_werkzeug_stores(method):
+    assert method_id(method) == generate_password_hash('x', method=method).split('$', 1)[0]
+
+
+@pytest.mark.parametrize('method', ['bcrypt', 'scrypt:1:2', 'pbkdf2:a:1:2', 'scrypt:a:b:c'])
+def test_invalid_methods_are_rejected(method):
+    with pytest.raises(ValueError):
+        method_id(method)
+
+
+def test_creating_a_hasher_does_not_run_the_kdf():
+    started = time.perf_counter()
+    PasswordHasher(method='scrypt:1048576:8:1')
+    # A real hash with these parameters takes seconds and a gigabyte of memory
+    assert time.perf_counter() - started < 0.5
+
+
+def test_hashes_with_other_parameters_need_a_rehash():
+    hasher = PasswordHasher(method='pbkdf2:sha256:1000')
+    current = hasher.hash('secret')
+    assert hasher.verify(current, 'secret')
+    assert not hasher.needs_rehash(current)
+    old = generate_password_hash('secret', method='pbkdf2:sha256:2000')
+    assert hasher.verify(old, 'secret')
+    assert hasher.needs_rehash(old)
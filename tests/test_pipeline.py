@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+
+from core.pipeline import Stage, run_pipeline
+from core.recommendation_system import CareerRecommendationSystem
+from core.models import UserProfile
+
+
+def test_dependents_receive_results_and_run_concurrently():
+    both_running = threading.Barrier(2, timeout=5)
+
+    def branch(base):
+        both_running.wait()
+        return base + 1
+
+    outcome = run_pipeline([
+        Stage("base", lambda: 1),
+        Stage("left", branch, depends_on=("base",)),
+        Stage("right", branch, depends_on=("base",)),
+    ], max_workers=2)
+    assert outcome.ok
+    assert outcome.results == {"base": 1, "left": 2, "right": 2}
+
+
+def test_a_timed_out_stage_gets_its_default_without_blocking():
+    release = threading.Event()
+    started = time.monotonic()
+    outcome = run_pipeline([
+        Stage("slow", lambda: release.wait(10), timeout=0.2, default=[]),
+        Stage("fast", lambda: "ok"),
+    ])
+    release.set()
+    assert time.monotonic() - started < 2
+    assert outcome.results == {"slow": [], "fast": "ok"}
+    assert "timed out" in outcome.errors["slow"]
+
+
+def test_failures_skip_dependent_stages():
+    def boom():
+        raise RuntimeError("upstream down")
+
+    outcome = run_pipeline([
+        Stage("careers", boom, default=[]),
+        Stage("colleges", lambda careers: careers, depends_on=("careers",), default=[]),
+    ])
+    assert outcome.results == {"careers": [], "colleges": []}
+    assert outcome.errors["careers"] == "upstream down"
+    assert "skipped because careers failed" in outcome.errors["colleges"]
+
+
+def test_unknown_dependencies_are_rejected():
+    with pytest.raises(ValueError):
+        run_pipeline([Stage("colleges", lambda careers: careers, depends_on=("careers",))])
+
+
+def test_generate_all_returns_partial_results_when_a_stage_times_out(ai_calls, monkeypatch):
+    import core.recommendation_system as rs
+    from tests.conftest import fake_response
+
+    release = threading.Event()
+
+    def make_ai_request(api_key, url, prompt, *args, **kwargs):
+        if "recommend 8 colleges" in prompt:
+            release.wait(10)
+        return fake_response(prompt)
+
+    monkeypatch.setattr(rs, 'make_ai_request', make_ai_request)
+    system = CareerRecommendationSystem('key', stage_timeout=0.5, client=object())
+    profile = UserProfile('A', 16, '11', ['Math'], {'Math': 'A'}, ['robots'], ['chess'], 'Office')
+    results = system.generate_all(profile)
+    release.set()
+    assert len(results["careers"]) == 5
+    assert results["colleges"] == []
+    assert results["roadmap"][0]["title"] == "P1"
+    assert "timed out" in results["errors"]["colleges"]
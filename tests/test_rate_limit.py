@@ -0,0 +1,107 @@
+import io
+
+import pytest
+import requests
+
+from core.http_client import AIClient
+from core.rate_limit import AIMDConcurrency, RateLimiter, RateLimitTimeout, TokenBucket
+
+
+def make_response(status: int, headers: dict = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(b'{}')
+    return response
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def post(self, *args, **kwargs):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def client_with(session, concurrency) -> AIClient:
+    client = AIClient(limiter=RateLimiter(concurrency=concurrency), backoff_base=0)
+    client.session = session
+    return client
+
+
+def test_aimd_grows_on_success_and_halves_once_per_cooldown():
+    limit = AIMDConcurrency(initial=4, minimum=1, maximum=8, cooldown=60)
+    for _ in range(4):
+        assert limit.acquire(timeout=0)
+        limit.release(succeeded=True)
+    assert 4.9 < limit.limit < 5.0
+    limit.acquire(timeout=0)
+    limit.release(throttled=True)
+    limit.acquire(timeout=0)
+    limit.release(throttled=True)
+    # The second 429 falls inside the cooldown and does not halve again
+    assert 2.4 < limit.limit < 2.5
+
+
+def test_aimd_blocks_past_the_limit():
+    limit = AIMDConcurrency(initial=1)
+    assert limit.acquire(timeout=0)
+    assert not limit.acquire(timeout=0.01)
+    limit.release()
+    assert limit.acquire(timeout=0)
+
+
+def test_token_bucket_times_out_when_empty():
+    bucket = TokenBucket(rate_per_minute=60, capacity=1)
+    assert bucket.acquire(1, timeout=0)
+    assert not bucket.acquire(1, timeout=0.01)
+
+
+def test_limiter_raises_a_timeout_when_no_slot_frees_up():
+    limiter = RateLimiter(concurrency=AIMDConcurrency(initial=1), acquire_timeout=0.01)
+    held = limiter.acquire()
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire()
+    held.release()
+    held.release()  # idempotent
+    assert limiter.concurrency.in_flight == 0
+
+
+def test_streamed_response_holds_its_slot_until_closed():
+    concurrency = AIMDConcurrency(initial=2)
+    client = client_with(FakeSession(make_response(200)), concurrency)
+    response = client.post('https://example.invalid', json={}, stream=True)
+    assert concurrency.in_flight == 1
+    response.close()
+    assert concurrency.in_flight == 0
+    response.close()
+    assert concurrency.in_flight == 0
+
+
+def test_plain_response_releases_its_slot_immediately():
+    concurrency = AIMDConcurrency(initial=2)
+    client = client_with(FakeSession(make_response(200)), concurrency)
+    client.post('https://example.invalid', json={})
+    assert concurrency.in_flight == 0
+
+
+def test_throttled_attempts_release_their_slots_and_are_retried():
+    concurrency = AIMDConcurrency(initial=4, cooldown=0)
+    session = FakeSession(make_response(429, {'Retry-After': '0'}), make_response(200))
+    client = client_with(session, concurrency)
+    response = client.post('https://example.invalid', json={}, stream=True)
+    assert session.calls == 2
+    assert concurrency.limit < 4
+    assert concurrency.in_flight == 1
+    response.close()
+    assert concurrency.in_flight == 0
+
+
+def test_http_errors_release_the_slot():
+    concurrency = AIMDConcurrency(initial=2)
+    client = client_with(FakeSession(make_response(400)), concurrency)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.post('https://example.invalid', json={}, stream=True)
+    assert concurrency.in_flight == 0
@@ -0,0 +1,58 @@
+import json
+import os
+import re
+
+from core.models import CareerRecommendation
+from tests.conftest import FORM
+
+
+def stream_events(client, page: bytes) -> list:
+    stream_url = re.search(r'new EventSource\("([^"]+)"\)', page.decode('utf-8')).group(1)
+    body = client.get(stream_url).get_data(as_text=True)
+    events = []
+    for block in body.strip().split('\n\n'):
+        event, data = block.split('\n', 1)
+        events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+def test_streamed_cards_are_server_rendered(app, client, ai_calls):
+    app.config['STREAM_RESULTS'] = True
+    page = client.post('/submit', data=FORM)
+    assert b'Generating career recommendations' in page.data
+
+    events = stream_events(client, page.data)
+    kinds = [event for event, _ in events]
+    assert kinds.count('career') == 5 and kinds.count('college') == 8 and kinds.count('phase') == 1
+    assert kinds[-1] == 'done'
+    career = dict(events)['career']['html']
+    assert '<li class="results-item">' in career and '<h3>Job' in career
+    assert '<span class="timeline-period">6 months</span>' in dict(events)['phase']['html']
+
+
+def test_streamed_and_full_pages_share_the_fragment_cache(app, client, ai_calls):
+    app.config['STREAM_RESULTS'] = True
+    stream_events(client, client.post('/submit', data=FORM).data)
+    cache = app.extensions['fragment_cache']
+    cached = len(cache._entries)
+    assert cached == 14
+
+    app.config['STREAM_RESULTS'] = False
+    page = client.post('/submit', data=FORM).get_data(as_text=True)
+    assert len(cache._entries) == cached
+    assert '<h3>Uni 8</h3>' in page
+
+
+def test_cards_are_escaped_and_cached_by_content(app):
+    career = CareerRecommendation('<b>Chef</b>', 'd', ['a'], 'e', 'j', 's', 'g')
+    with app.app_context():
+        render_card = app.extensions['render_card']
+        html = render_card('career', career)
+        assert '&lt;b&gt;Chef&lt;/b&gt;' in html
+        same = CareerRecommendation(*career.to_row())
+        assert render_card('career', same) is html
+
+
+def test_compiled_templates_are_kept_on_disk(app, client):
+    client.get('/')
+    assert os.listdir(app.config['JINJA_BYTECODE_CACHE_DIR'])
@@ -0,0 +1,53 @@
+import gzip
+import json
+
+from tests.conftest import FORM
+
+
+def saved_roadmap_id(client):
+    client.post('/submit', data=dict(FORM, save='1'))
+    (item,) = client.get('/history').get_json()['items']
+    return item['id']
+
+
+def test_json_is_gzipped_for_clients_that_accept_it(user_client, ai_calls):
+    roadmap_id = saved_roadmap_id(user_client)
+    plain = user_client.get(f'/history/{roadmap_id}')
+    zipped = user_client.get(f'/history/{roadmap_id}', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in plain.headers
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in zipped.headers['Vary']
+    assert json.loads(gzip.decompress(zipped.data)) == plain.get_json()
+    # The compressed body is a different representation, so it gets its own ETag
+    assert zipped.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+
+
+def test_small_and_streamed_responses_are_not_compressed(app, user_client, ai_calls):
+    assert 'Content-Encoding' not in user_client.get('/history', headers={'Accept-Encoding': 'gzip'}).headers
+    app.config['STREAM_RESULTS'] = True
+    page = user_client.post('/submit', data=FORM, headers={'Accept-Encoding': 'gzip'})
+    assert page.headers['Content-Encoding'] == 'gzip'
+    stream_url = gzip.decompress(page.data).decode().split('new EventSource("')[1].split('"')[0]
+    stream = user_client.get(stream_url, headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in stream.headers
+
+
+def test_conditional_get_answers_304_in_any_encoding(user_client, ai_calls):
+    roadmap_id = saved_roadmap_id(user_client)
+    for path in (f'/history/{roadmap_id}', f'/history/{roadmap_id}/view'):
+        for encoding in ('identity', 'gzip'):
+            first = user_client.get(path, headers={'Accept-Encoding': encoding})
+            assert first.status_code == 200
+            assert first.headers['Cache-Control'] in ('private, no-cache', 'no-cache, private')
+            again = user_client.get(path, headers={'Accept-Encoding': encoding,
+                                                   'If-None-Match': first.headers['ETag']})
+            assert again.status_code == 304
+            assert again.data == b''
+
+
+def test_json_and_html_views_have_different_etags(user_client, ai_calls):
+    roadmap_id = saved_roadmap_id(user_client)
+    detail = user_client.get(f'/history/{roadmap_id}').headers['ETag']
+    view = user_client.get(f'/history/{roadmap_id}/view').headers['ETag']
+    assert detail != view
+    assert user_client.get(f'/history/{roadmap_id}/view', headers={'If-None-Match': detail}).status_code == 200
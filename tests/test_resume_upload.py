@@ -0,0 +1,57 @@
+import io
+
+import docx
+
+from app import create_app
+from core import skill_matcher
+from tests.conftest import make_config
+
+
+def docx_upload(*paragraphs):
+    document = docx.Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    stream = io.BytesIO()
+    document.save(stream)
+    stream.seek(0)
+    return stream, 'resume.docx'
+
+
+def test_create_app_builds_the_skill_matcher(tmp_path, monkeypatch):
+    monkeypatch.setattr(skill_matcher, '_matchers', {})
+    create_app(make_config(tmp_path))
+    assert skill_matcher.DEFAULT_TAXONOMY_PATH in skill_matcher._matchers
+
+
+def test_matcher_is_not_built_when_uploads_are_disabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(skill_matcher, '_matchers', {})
+    create_app(make_config(tmp_path, RESUME_UPLOADS_ENABLED=False))
+    assert skill_matcher._matchers == {}
+
+
+def test_upload_returns_matched_skills(client):
+    response = client.post('/upload_resume', data={'resume': docx_upload('Python and SQL', 'B.Tech')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 200
+    assert 'Python' in response.get_json()['skills']
+
+
+def test_upload_is_rejected_when_disabled(app, client):
+    app.config['RESUME_UPLOADS_ENABLED'] = False
+    response = client.post('/upload_resume', data={'resume': docx_upload('Python')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 404
+
+
+def test_matcher_respects_word_boundaries_and_overlaps():
+    matcher = skill_matcher.KeywordMatcher({
+        'java': 'Java', 'javascript': 'JavaScript', 'git': 'Git',
+        'machine learning': 'Machine Learning', 'learning': 'Learning',
+    })
+    assert matcher.find('JavaScript and digital marketing') == ['JavaScript']
+    assert matcher.find('Java,  Git\nand machine\nlearning') == ['Java', 'Git', 'Machine Learning', 'Learning']
+
+
+def test_aliases_map_to_their_canonical_label():
+    matcher = skill_matcher.ResumeMatcher({'skills': {'Golang': ['go lang']}, 'education': {'B.Tech': ['btech']}})
+    assert matcher.match('Wrote Go Lang services, BTech 2024') == {'skills': ['Golang'], 'education': ['B.Tech']}
@@ -0,0 +1,72 @@
+import dataclasses
+
+from app import db
+from app.models import Roadmap, SavedRecommendation
+from app.saved import SaveWriter, decode_payload, encode_payload, write_saved
+from core.models import CareerRecommendation
+from core.user_input import create_user_profile
+
+from tests.conftest import FORM
+
+PROFILE = create_user_profile(FORM)
+RESULTS = {
+    'careers': [CareerRecommendation(f'Job {i}', 'd', ['a'], 'e', 'j', 's', 'g') for i in range(5)],
+    'colleges': [],
+    'roadmap': [{'title': 'P1', 'milestones': []}, {'title': 'P2', 'milestones': []}],
+    'errors': {},
+}
+
+
+def test_payload_round_trip():
+    data = decode_payload(encode_payload(PROFILE, RESULTS))
+    assert data['v'] == 1
+    assert data['profile']['name'] == 'Asha K'
+    assert [c['career_title'] for c in data['careers']] == [f'Job {i}' for i in range(5)]
+    assert data['roadmap'] == RESULTS['roadmap']
+
+
+def test_write_saved_links_a_roadmap_with_summary_columns(app, user_client):
+    with app.app_context():
+        write_saved([(PROFILE, RESULTS, 1, None)])
+        saved = SavedRecommendation.query.one()
+        assert saved.roadmap.user_id == 1
+        assert saved.roadmap.phase_count == 2
+        assert saved.roadmap.career_titles == '["Job 0", "Job 1", "Job 2"]'
+
+
+def test_anonymous_saves_have_no_roadmap(app):
+    with app.app_context():
+        write_saved([(PROFILE, RESULTS, None, None)])
+        assert SavedRecommendation.query.one().roadmap is None
+        assert Roadmap.query.count() == 0
+
+
+def test_a_bad_entry_does_not_lose_the_rest_of_the_batch(app):
+    bad = dataclasses.replace(PROFILE, name=None)
+    with app.app_context():
+        write_saved([(PROFILE, RESULTS, None, None), (bad, RESULTS, None, None), (PROFILE, RESULTS, None, None)])
+        assert SavedRecommendation.query.count() == 2
+
+
+def test_close_writes_everything_still_queued(app):
+    writer = SaveWriter(app, batch_size=3)
+    for _ in range(10):
+        writer.submit(PROFILE, RESULTS)
+    # Started after queueing, so nothing can have been written before close()
+    writer.start()
+    writer.close()
+    with app.app_context():
+        assert SavedRecommendation.query.count() == 10
+    # Saves after close are written straight away instead of being queued
+    with app.app_context():
+        writer.submit(PROFILE, RESULTS)
+        assert SavedRecommendation.query.count() == 11
+
+
+def test_submit_with_save_stores_the_results(app, user_client, ai_calls):
+    response = user_client.post('/submit', data=dict(FORM, save='1'))
+    assert response.status_code == 200
+    with app.app_context():
+        saved = SavedRecommendation.query.one()
+        assert saved.student_name == 'Asha K'
+        assert saved.roadmap is not None
@@ -0,0 +1,105 @@
+import threading
+
+from core.models import UserProfile
+from core.recommendation_system import CareerRecommendationSystem
+from core.singleflight import SingleFlight
+from tests.conftest import fake_response
+
+
+def test_concurrent_callers_share_one_call_and_its_items():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+    seen = {'leader': [], 'follower': []}
+
+    def fn(publish):
+        calls.append(1)
+        publish('a')
+        release.wait(5)
+        publish('b')
+        return 'result'
+
+    results = {}
+    leader = threading.Thread(target=lambda: results.setdefault(
+        'leader', flights.do('k', fn, seen['leader'].append)))
+    leader.start()
+    while flights.in_flight() == 0:
+        pass
+    follower = threading.Thread(target=lambda: results.setdefault(
+        'follower', flights.do('k', fn, seen['follower'].append)))
+    follower.start()
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert len(calls) == 1
+    assert results == {'leader': 'result', 'follower': 'result'}
+    # A follower that joins late still gets the items published before it arrived
+    assert seen == {'leader': ['a', 'b'], 'follower': ['a', 'b']}
+    assert flights.in_flight() == 0
+
+
+def test_followers_get_the_leaders_exception_and_the_key_is_freed():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail(publish):
+        started.set()
+        release.wait(5)
+        raise RuntimeError('upstream down')
+
+    errors = []
+
+    def call():
+        try:
+            flights.do('k', fail)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call)]
+    threads[0].start()
+    started.wait(5)
+    threads.append(threading.Thread(target=call))
+    threads[1].start()
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert errors == ['upstream down', 'upstream down']
+    assert flights.do('k', lambda publish: 'fresh') == 'fresh'
+
+
+def test_identical_generations_make_one_upstream_request(monkeypatch):
+    import core.recommendation_system as rs
+
+    prompts = []
+    release = threading.Event()
+
+    def make_ai_request(api_key, url, prompt, *args, **kwargs):
+        prompts.append(prompt)
+        release.wait(5)
+        return fake_response(prompt)
+
+    monkeypatch.setattr(rs, 'make_ai_request', make_ai_request)
+    system = CareerRecommendationSystem('key', client=object())
+    entered = []
+    do = system._flights.do
+
+    def counting_do(*args, **kwargs):
+        entered.append(1)
+        return do(*args, **kwargs)
+
+    system._flights.do = counting_do
+    profile = UserProfile('A', 16, '11', ['Math'], {'Math': 'A'}, ['robots'], ['chess'], 'Office')
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(system.generate_career_recommendations(profile)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while len(entered) < 4:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(prompts) == 1
+    assert len(results) == 4 and all(r == results[0] for r in results)
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys
+from app import create_app
+app = create_app()
+app.test_client().get('/login')
+heavy = ('requests', 'urllib3', 'pypdf', 'docx', 'alembic', 'multiprocessing', 'flask_migrate')
+print(','.join(m for m in heavy if m in sys.modules))
+print(','.join(t.name for t in __import__('threading').enumerate() if t.name == 'job-dispatcher'))
+"""
+
+
+def run_probe(tmp_path, **env):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'probe.db'}",
+               RESPONSE_ARCHIVE_ENABLED='false', **env)
+    result = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=120, check=True)
+    return result.stdout.splitlines()[-2:]
+
+
+def test_heavy_dependencies_stay_unloaded_until_needed(tmp_path):
+    loaded, dispatcher = run_probe(tmp_path, JOBS_ENABLED='false')
+    assert loaded == ''
+    assert dispatcher == ''
+
+
+def test_job_dispatcher_starts_when_enabled(tmp_path):
+    _, dispatcher = run_probe(tmp_path, JOBS_ENABLED='true')
+    assert dispatcher == 'job-dispatcher'
@@ -0,0 +1,79 @@
+import os
+import re
+import shutil
+import time
+from datetime import datetime, timedelta
+
+from app import create_app, db
+from app.models import PendingStream, SavedRecommendation
+from tests.conftest import FORM, make_config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def stream_url(page) -> str:
+    return re.search(r'new EventSource\("([^"]+)"\)', page.get_data(as_text=True)).group(1)
+
+
+def test_stream_url_carries_no_profile_data(app, client, ai_calls):
+    app.config['STREAM_RESULTS'] = True
+    url = stream_url(client.post('/submit', data=FORM))
+    assert re.fullmatch(r'/stream\?id=[0-9a-f]{32}', url)
+    with app.app_context():
+        assert PendingStream.query.count() == 1
+
+
+def test_a_stream_id_is_consumed_once(app, client, ai_calls):
+    app.config['STREAM_RESULTS'] = True
+    url = stream_url(client.post('/submit', data=FORM))
+    body = client.get(url).get_data(as_text=True)
+    assert 'event: done' in body
+    with app.app_context():
+        assert PendingStream.query.count() == 0
+    assert client.get(url).status_code == 400
+
+
+def test_expired_and_unknown_streams_are_rejected(app, client, ai_calls):
+    app.config['STREAM_RESULTS'] = True
+    url = stream_url(client.post('/submit', data=FORM))
+    with app.app_context():
+        PendingStream.query.update({PendingStream.created_at: datetime.utcnow() - timedelta(hours=1)})
+        db.session.commit()
+    assert client.get(url).status_code == 400
+    assert client.get('/stream?id=nope').status_code == 400
+    # The next submission clears forms that were never picked up
+    client.post('/submit', data=FORM)
+    with app.app_context():
+        assert PendingStream.query.count() == 1
+
+
+def test_streaming_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'default.db'}")
+    monkeypatch.setenv('JOBS_ENABLED', 'false')
+    monkeypatch.delenv('STREAM_RESULTS', raising=False)
+    assert create_app().config['STREAM_RESULTS'] is False
+
+
+def test_default_submit_works_on_the_bundled_unmigrated_database(tmp_path, ai_calls):
+    database = tmp_path / 'site.db'
+    shutil.copy(os.path.join(ROOT, 'instance', 'site.db'), database)
+    app = create_app(make_config(tmp_path, SQLALCHEMY_DATABASE_URI=f"sqlite:///{database}"))
+    response = app.test_client().post('/submit', data=FORM)
+    assert response.status_code == 200
+    assert '<h3>Job 1</h3>' in response.get_data(as_text=True)
+
+
+def test_requested_save_survives_a_closed_stream(app, client, ai_calls):
+    app.config['STREAM_RESULTS'] = True
+    url = stream_url(client.post('/submit', data=dict(FORM, save='1')))
+    response = client.get(url, buffered=False)
+    next(iter(response.response))
+    # The reader goes away after the first event
+    response.close()
+    deadline = time.monotonic() + 10
+    with app.app_context():
+        while SavedRecommendation.query.count() == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+            db.session.remove()
+        (saved,) = SavedRecommendation.query.all()
+        assert saved.student_name == FORM['name']